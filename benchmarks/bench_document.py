@@ -0,0 +1,86 @@
+"""Per-request preprocessing: the pre-`Document` string pipeline vs shared `Document`s.
+
+The legacy path is reproduced inline (clean_text for TF-IDF, tokens + unique_preserve_order for
+keywords, regex normalization and an n-gram set for the matcher, unique_preserve_order again
+on matched/missing).
+
+Usage:
+    python -m benchmarks.bench_document --resume-kb 16 --jd-kb 4 --repeat 50
+"""
+from __future__ import annotations
+import argparse
+import re
+import time
+import tracemalloc
+import numpy as np
+from rapidfuzz import fuzz, process
+from rich import print
+
+from src.features.keyword_extractor import STOPWORDS, KeywordMatcher
+from src.preprocessing.clean_text import clean_text
+from src.preprocessing.document import Document
+from src.utils.text import normalize_token, tokens, unique_preserve_order
+from .synthetic import make_jd, make_resume
+
+def _legacy_normalize(t: str) -> str:
+    return re.sub(r"\s+", " ", t.strip().lower())
+
+def legacy(resume: str, jd: str) -> tuple:
+    clean_text(resume), clean_text(jd)
+    job_kw = unique_preserve_order(t for t in tokens(jd) if len(t) >= 3 and t not in STOPWORDS)[:40]
+    h = _legacy_normalize(resume)
+    words = h.split(" ")
+    grams = set(words)
+    grams.update(map(" ".join, zip(words, words[1:])))
+    grams.update(map(" ".join, zip(words, words[1:], words[2:])))
+    norm = [_legacy_normalize(k) for k in job_kw]
+    hits = [n in grams or n in h for n in norm]
+    pending = [i for i, hit in enumerate(hits) if not hit]
+    if pending:
+        scores = process.cdist([norm[i] for i in pending], [h], scorer=fuzz.partial_ratio, score_cutoff=90, dtype=np.uint8)
+        for i, score in zip(pending, scores[:, 0]):
+            hits[i] = bool(score >= 90)
+    matched = [k for k, hit in zip(job_kw, hits) if hit]
+    missing = [k for k, hit in zip(job_kw, hits) if not hit]
+    return unique_preserve_order(matched), unique_preserve_order(missing)
+
+def shared(resume: str, jd: str) -> tuple:
+    r, j = Document(resume), Document(jd)
+    r.clean, j.clean
+    job_kw = j.keywords(3, STOPWORDS)[:40]
+    matcher = KeywordMatcher(r)
+    hits = matcher.contains_many(job_kw)
+    matched = [k for k, hit in zip(job_kw, hits) if hit]
+    missing = [k for k, hit in zip(job_kw, hits) if not hit]
+    return matched, missing
+
+def measure(fn, resume: str, jd: str, repeat: int) -> tuple[float, int]:
+    fn(resume, jd)
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn(resume, jd)
+    elapsed = (time.perf_counter() - t0) / repeat
+    tracemalloc.start()
+    fn(resume, jd)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--resume-kb", type=int, default=16)
+    ap.add_argument("--jd-kb", type=int, default=4)
+    ap.add_argument("--repeat", type=int, default=50)
+    args = ap.parse_args()
+
+    resume, jd = make_resume(args.resume_kb * 1024, seed=1), make_jd(args.jd_kb * 1024, seed=2)
+    assert legacy(resume, jd) == shared(resume, jd), "Document pipeline diverged from the string pipeline"
+
+    t_old, m_old = measure(legacy, resume, jd, args.repeat)
+    t_new, m_new = measure(shared, resume, jd, args.repeat)
+    print(f"string pipeline   : {t_old * 1000:.2f} ms, peak {m_old / 1024:.0f} KiB")
+    print(f"Document pipeline : {t_new * 1000:.2f} ms, peak {m_new / 1024:.0f} KiB")
+    print(f"speedup           : {t_old / t_new:.2f}x, {100 * (1 - m_new / m_old):.0f}% less peak memory")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Job page text: `html_to_text` (whole-page get_text) vs `extract_job_text` (streamed, boilerplate-free).
+
+Runs both on the saved career-page fixtures in `benchmarks/fixtures/job_pages` (ATS pages with
+JSON-LD, a plain career page, a heavy single-page app, a tiny page) and optionally on synthetic
+pages. Reports time per page, output size (characters and ~tokens sent to the LLM), and per
+fixture how many expected posting phrases were kept and boilerplate phrases leaked
+(`expected.json`).
+
+Usage:
+    python -m benchmarks.bench_html_extract
+    python -m benchmarks.bench_html_extract --synthetic 100KB,1MB --json runs/html.json
+"""
+from __future__ import annotations
+import argparse
+import json
+from pathlib import Path
+
+from rich import print
+
+from src.ingestion.html_extract import extract_job_text
+from src.ingestion.job_fetcher import html_to_text
+from .run import SIZES, Case, time_case
+from .synthetic import make_job_html
+
+FIXTURES = Path(__file__).parent / "fixtures" / "job_pages"
+EXTRACTORS = {"html_to_text": html_to_text, "extract_job_text": extract_job_text}
+
+def load_fixtures(path: Path = FIXTURES) -> tuple[dict[str, str], dict[str, dict[str, list[str]]]]:
+    """({name: html}, {name: {"must": [...], "must_not": [...]}})"""
+    expected = json.loads((path / "expected.json").read_text(encoding="utf-8"))
+    pages = {p.name: p.read_text(encoding="utf-8") for p in sorted(path.glob("*.html"))}
+    return pages, expected
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--synthetic", default="", help="Also run synthetic pages of these sizes, e.g. 100KB,1MB.")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--json", default=None, help="Write the results to this file.")
+    args = ap.parse_args()
+
+    pages, expected = load_fixtures()
+    for size in filter(None, args.synthetic.split(",")):
+        pages[f"synthetic_{size}"] = make_job_html(SIZES[size])
+    for fn in EXTRACTORS.values():
+        fn("<html><body><p>warm up</p></body></html>")  # pay the lazy bs4/lxml imports
+
+    results = {}
+    totals = {name: {"ms": 0.0, "chars": 0} for name in EXTRACTORS}
+    for page, html in pages.items():
+        row = {"bytes": len(html.encode("utf-8"))}
+        for name, fn in EXTRACTORS.items():
+            text = fn(html)
+            ms = time_case(Case(name, page, lambda f=fn, h=html: f(h)), repeat=args.repeat)["per_call_s"] * 1000
+            exp = expected.get(page)
+            row[name] = {
+                "ms": round(ms, 3), "chars": len(text), "tokens": len(text) // 4,
+                "kept": f"{sum(p in text for p in exp['must'])}/{len(exp['must'])}" if exp else None,
+                "leaked": f"{sum(p in text for p in exp['must_not'])}/{len(exp['must_not'])}" if exp else None,
+            }
+            if exp:  # totals over the fixtures; synthetic pages are nearly all posting text
+                totals[name]["ms"] += ms
+                totals[name]["chars"] += len(text)
+        results[page] = row
+        old, new = row["html_to_text"], row["extract_job_text"]
+        print(
+            f"{page:22} {row['bytes'] / 1000:7.1f} KB | time {old['ms']:7.2f} -> {new['ms']:7.2f} ms"
+            f" | chars {old['chars']:7} -> {new['chars']:7}"
+            + (f" | kept {old['kept']} -> {new['kept']}, leaked {old['leaked']} -> {new['leaked']}" if old["kept"] else "")
+        )
+    old, new = totals["html_to_text"], totals["extract_job_text"]
+    print(
+        f"[bold]fixtures[/bold]: time x{old['ms'] / new['ms']:.1f} faster, "
+        f"output {new['chars'] / old['chars']:.0%} of the old size (~{(old['chars'] - new['chars']) // 4} fewer tokens)"
+    )
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+if __name__ == "__main__":
+    main()
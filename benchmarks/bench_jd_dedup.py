@@ -0,0 +1,92 @@
+"""Near-duplicate JD lookup (MinHash/LSH) as the index grows.
+
+The index is padded with random signatures (what unrelated JDs look like to MinHash) up to
+each size, plus real synthetic JDs; reposts of those (date/location header, tracking footer,
+one edited sentence) are then looked up. Reports lookup latency, recall on reposts, false
+matches on unseen JDs and the resident size of the band buckets.
+
+Usage:
+    python -m benchmarks.bench_jd_dedup --sizes 1000,10000,100000,300000
+"""
+from __future__ import annotations
+import argparse
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+from rich import print
+
+from src.modeling.jd_dedup import JdDedupIndex
+from .synthetic import make_jd
+
+def repost(jd: str, rng: random.Random) -> str:
+    lines = jd.splitlines()
+    i = rng.randrange(len(lines))
+    lines[i] = lines[i] + " (updated)"
+    header = f"Posted 2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} - {rng.choice(['Berlin', 'Remote', 'NYC'])}"
+    return header + "\n" + "\n".join(lines) + f"\nref=board{rng.randint(0, 999)}&utm_source=feed"
+
+def _pad(index: JdDedupIndex, n: int, rng: np.random.Generator, start: int) -> None:
+    sigs = rng.integers(0, 2 ** 32, size=(n, index.hasher.num_perm), dtype=np.uint32)
+    with index._lock:
+        cur = index._db.execute("SELECT COALESCE(MAX(rid), 0) FROM jd_signatures").fetchone()[0]
+        index._db.execute("BEGIN")
+        index._db.executemany(
+            "INSERT INTO jd_signatures (rid, id, signature, data, created_at) VALUES (?, ?, ?, ?, 0)",
+            ((cur + 1 + i, f"pad{start + i}", sig.tobytes(), '{"keywords": [], "skills": null, "skill_source": "none"}')
+             for i, sig in enumerate(sigs)),
+        )
+        index._db.execute("COMMIT")
+        for i, sig in enumerate(sigs):
+            index.lsh.insert(cur + 1 + i, sig)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="1000,10000,100000")
+    ap.add_argument("--jds", type=int, default=100, help="Real JDs stored (and reposted) at each size.")
+    ap.add_argument("--jd-kb", type=float, default=3.0)
+    ap.add_argument("--threshold", type=float, default=0.85)
+    args = ap.parse_args()
+
+    rng, np_rng = random.Random(0), np.random.default_rng(0)
+    size_bytes = int(args.jd_kb * 1000)
+    jds = [make_jd(size_bytes, seed=i) for i in range(args.jds)]
+    reposts = [repost(jd, rng) for jd in jds]
+    unseen = [make_jd(size_bytes, seed=10_000 + i) for i in range(args.jds)]
+    with tempfile.TemporaryDirectory() as tmp:
+        index = JdDedupIndex(str(Path(tmp) / "jd.sqlite"), threshold=args.threshold)
+        print(f"LSH: {index.lsh.bands} bands x {index.lsh.rows} rows, threshold {args.threshold}")
+        t0 = time.perf_counter()
+        ids = [index.add(jd, None, "none") for jd in jds]
+        add_ms = (time.perf_counter() - t0) / len(jds) * 1000
+        print(f"add (signature + SQLite insert): {add_ms:.2f} ms per JD")
+
+        mb = 0.0
+        for n in sorted(int(s) for s in args.sizes.split(",")):
+            tracemalloc.start()  # only while padding: tracing would slow the lookups down
+            _pad(index, max(0, n - len(index)), np_rng, len(index))
+            mb += tracemalloc.get_traced_memory()[0] / 1e6
+            tracemalloc.stop()
+            lat, hits, false = [], 0, 0
+            for jd_id, text in zip(ids, reposts):
+                t0 = time.perf_counter()
+                match = index.lookup(text)
+                lat.append((time.perf_counter() - t0) * 1000)
+                hits += match is not None and match.id == jd_id
+            for text in unseen:
+                t0 = time.perf_counter()
+                false += index.lookup(text) is not None
+                lat.append((time.perf_counter() - t0) * 1000)
+            lat.sort()
+            print(
+                f"n={len(index):>7}: lookup p50={statistics.median(lat):.2f} ms p99={lat[int(0.99 * (len(lat) - 1))]:.2f} ms"
+                f"  recall={hits / len(jds):.2f}  false matches={false}/{len(unseen)}  buckets ~{mb:.0f} MB"
+            )
+        index.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Many resumes against one posting: raw JD text per request vs a precomputed job profile.
+
+Fits a small corpus TF-IDF artifact in a temp dir (the production setup) and reports
+per-request wall and CPU time of `ranker.analyze`, with skills from the taxonomy (no LLM).
+
+Usage:
+    python -m benchmarks.bench_job_profiles --resumes 200 --jd-kb 6
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import dataclasses
+import tempfile
+import time
+from rich import print
+
+from src.features import tfidf_features
+from src.modeling import job_profiles, ranker
+from .synthetic import make_jd, make_resume
+
+def _per_request(fn, resumes: list[str]) -> tuple[float, float]:
+    w0, c0 = time.perf_counter(), time.process_time()
+    for r in resumes:
+        fn(r)
+    n = len(resumes)
+    return (time.perf_counter() - w0) / n, (time.process_time() - c0) / n
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--resumes", type=int, default=200)
+    ap.add_argument("--resume-kb", type=float, default=3.0)
+    ap.add_argument("--jd-kb", type=float, default=6.0)
+    args = ap.parse_args()
+
+    corpus = [make_resume(3000, seed=i) for i in range(200)] + [make_jd(3000, seed=i) for i in range(200)]
+    resumes = [make_resume(int(args.resume_kb * 1000), seed=1000 + i) for i in range(args.resumes)]
+    jd = make_jd(int(args.jd_kb * 1000), seed=7)
+    with tempfile.TemporaryDirectory() as tmp:
+        vec = tfidf_features._new_vectorizer().fit(corpus)
+        tfidf_features.save_tfidf_artifact(vec, tmp, "bench", len(corpus))
+        tfidf_features.settings = dataclasses.replace(tfidf_features.settings, tfidf_engine="sklearn", tfidf_artifact_dir=tmp)
+        tfidf_features.load_default_tfidf.cache_clear()
+        ranker.analyze(resumes[0], jd)  # warm up imports and the artifact
+
+        profile = asyncio.run(job_profiles.build_profile(jd))
+        profile = job_profiles.JobProfile.from_json(profile.to_json())  # as loaded from the store
+        job_skills = profile.skill_extraction()
+        assert ranker.analyze(resumes[0], profile.document(), job_skills).match_score == ranker.analyze(resumes[0], jd).match_score
+
+        raw_wall, raw_cpu = _per_request(lambda r: ranker.analyze(r, jd), resumes)
+        prof_wall, prof_cpu = _per_request(lambda r: ranker.analyze(r, profile.document(), job_skills), resumes)
+    print(f"raw JD text : wall={raw_wall * 1000:6.2f} ms  cpu={raw_cpu * 1000:6.2f} ms per request")
+    print(f"job profile : wall={prof_wall * 1000:6.2f} ms  cpu={prof_cpu * 1000:6.2f} ms per request")
+    print(f"speedup     : wall x{raw_wall / prof_wall:.2f}  cpu x{raw_cpu / prof_cpu:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""LLM micro-batching vs one call per text, against a local mock provider.
+
+The mock behaves like a single local Ollama instance: calls are served one at a time, and
+each costs a fixed per-call overhead (request + shared prompt prefill) plus a per-document
+cost. Requests arrive as a Poisson stream at `--rate` per second.
+
+Usage:
+    python -m benchmarks.bench_llm_batch --requests 200 --rate 40 --overhead-ms 60 --per-doc-ms 15
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import dataclasses
+import json
+import random
+import re
+import statistics
+import time
+import httpx
+from rich import print
+
+from src.modeling import llm_batcher, llm_extract
+from src.modeling.llm_batcher import LlmBatcher
+
+def mock_provider(overhead_s: float, per_doc_s: float) -> httpx.MockTransport:
+    lock = asyncio.Lock()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        prompt = json.loads(request.content)["messages"][1]["content"]
+        docs = re.findall(r"DOCUMENT id=(\d+):", prompt)
+        async with lock:  # one generation at a time, like a single local model
+            await asyncio.sleep(overhead_s + per_doc_s * max(1, len(docs)))
+        item = {"skills": ["python"], "tools": ["docker"], "requirements": []}
+        content = json.dumps({"results": {i: item for i in docs}} if docs else item)
+        return httpx.Response(200, json={"message": {"content": content}})
+    return httpx.MockTransport(handler)
+
+async def run(n: int, rate: float, args: argparse.Namespace, batcher_kwargs: dict | None) -> tuple[float, list[float]]:
+    rng = random.Random(args.seed)
+    transport = mock_provider(args.overhead_ms / 1000, args.per_doc_ms / 1000)
+    latencies: list[float] = []
+    async with httpx.AsyncClient(transport=transport) as client:
+        batcher = LlmBatcher(client=client, **batcher_kwargs) if batcher_kwargs is not None else None
+
+        async def one(i: int) -> None:
+            t0 = time.perf_counter()
+            text = f"resume {i}: python docker"
+            if batcher:
+                await batcher.submit(text)
+            else:
+                await llm_extract.extract_with_usage_async(text, client=client, use_cache=False)
+            latencies.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        tasks = []
+        for i in range(n):
+            tasks.append(asyncio.create_task(one(i)))
+            await asyncio.sleep(rng.expovariate(rate))
+        await asyncio.gather(*tasks)
+        return time.perf_counter() - t0, latencies
+
+def _report(name: str, wall: float, lat: list[float]) -> None:
+    lat = sorted(lat)
+    p95 = lat[int(0.95 * (len(lat) - 1))]
+    print(f"{name:<10} {len(lat) / wall:7.1f} req/s   p50 {statistics.median(lat) * 1000:7.0f} ms   p95 {p95 * 1000:7.0f} ms")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=200)
+    ap.add_argument("--rate", type=float, default=40.0, help="Arrivals per second.")
+    ap.add_argument("--overhead-ms", type=float, default=60.0)
+    ap.add_argument("--per-doc-ms", type=float, default=15.0)
+    ap.add_argument("--window-ms", type=float, default=20.0)
+    ap.add_argument("--max-items", type=int, default=8)
+    ap.add_argument("--max-concurrency", type=int, default=1, help="Batches in flight; 1 suits a single local model.")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    s = dataclasses.replace(llm_extract.settings, llm_provider="ollama", llm_cache_enabled=False)
+    llm_extract.settings = llm_batcher.settings = s
+
+    wall, lat = asyncio.run(run(args.requests, args.rate, args, None))
+    _report("unbatched", wall, lat)
+    kwargs = {"window_s": args.window_ms / 1000, "max_items": args.max_items, "max_concurrency": args.max_concurrency}
+    wall, lat = asyncio.run(run(args.requests, args.rate, args, kwargs))
+    _report("batched", wall, lat)
+
+if __name__ == "__main__":
+    main()
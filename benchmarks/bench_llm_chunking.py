@@ -0,0 +1,65 @@
+"""Long-document LLM extraction: one truncated prompt vs map-reduce chunks, on a mock provider.
+
+The mock answers with the taxonomy skills/tools present in the text it was sent, so recall
+against the whole document shows what truncation drops; each document ends with a
+Certifications section naming skills that appear nowhere else, as real resumes often do.
+Latency grows with the prompt (`--overhead-ms` + `--per-kchar-ms` per 1000 characters) and
+calls run concurrently, like a hosted API.
+
+Usage:
+    python -m benchmarks.bench_llm_chunking --sizes 8 24 48 --chunk-tokens 1500
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import dataclasses
+import json
+import time
+import httpx
+from rich import print
+
+from src.features.skill_taxonomy import SkillTaxonomy
+from src.modeling import llm_extract
+from .synthetic import make_resume
+
+def mock_provider(taxonomy: SkillTaxonomy, overhead_s: float, per_kchar_s: float) -> httpx.MockTransport:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        prompt = json.loads(request.content)["messages"][1]["content"]
+        text = prompt.split('TEXT:\n"""', 1)[-1]
+        await asyncio.sleep(overhead_s + per_kchar_s * len(text) / 1000)
+        content = json.dumps({**taxonomy.extract(text), "requirements": []})
+        return httpx.Response(200, json={"message": {"content": content}})
+    return httpx.MockTransport(handler)
+
+async def run(text: str, transport: httpx.MockTransport) -> tuple[float, set[str]]:
+    async with httpx.AsyncClient(transport=transport) as client:
+        t0 = time.perf_counter()
+        result, _ = await llm_extract.extract_with_usage_async(text, client=client, use_cache=False)
+        return time.perf_counter() - t0, set(result.skills + result.tools)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[8, 24, 48], help="Document sizes in KB.")
+    ap.add_argument("--chunk-tokens", type=int, default=1500)
+    ap.add_argument("--overhead-ms", type=float, default=300.0)
+    ap.add_argument("--per-kchar-ms", type=float, default=150.0)
+    args = ap.parse_args()
+
+    taxonomy = SkillTaxonomy.load("data/taxonomy/skills.json")
+    transport = mock_provider(taxonomy, args.overhead_ms / 1000, args.per_kchar_ms / 1000)
+    base = dataclasses.replace(llm_extract.settings, llm_provider="ollama", llm_cache_enabled=False)
+    for kb in args.sizes:
+        text = make_resume(kb * 1000, seed=kb)
+        present = {n for d in taxonomy.extract(text).values() for n in d}
+        tail = [s.name for s in taxonomy.skills if s.name not in present][:8]
+        text += "\nCertifications\n" + ", ".join(tail)
+        truth = {n for d in taxonomy.extract(text).values() for n in d}
+        for name, chunk_tokens in (("truncate", 0), ("chunked", args.chunk_tokens)):
+            llm_extract.settings = dataclasses.replace(base, llm_chunk_tokens=chunk_tokens)
+            n_calls = len(llm_extract.llm_chunks(text))
+            elapsed, found = asyncio.run(run(text, transport))
+            recall = len(found & truth) / len(truth) if truth else 1.0
+            print(f"{kb:>4} KB  {name:<9} calls={n_calls:<3} latency={elapsed * 1000:7.0f} ms  recall={recall:.2f}")
+
+if __name__ == "__main__":
+    main()
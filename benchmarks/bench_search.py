@@ -0,0 +1,58 @@
+"""Query latency of the resume inverted index as the store grows.
+
+Usage:
+    python -m benchmarks.bench_search --sizes 1000 10000 100000
+"""
+from __future__ import annotations
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+from rich import print
+
+from src.modeling.resume_index import ResumeIndex
+
+def _vocab(n: int, rng: random.Random) -> list[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(n)]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    ap.add_argument("--queries", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    vocab = _vocab(20000, rng)
+    cum, total = [], 0.0
+    for i in range(len(vocab)):
+        total += 1.0 / (i + 1)  # Zipf-like term frequencies
+        cum.append(total)
+
+    def doc(n_words: int) -> str:
+        return " ".join(rng.choices(vocab, cum_weights=cum, k=n_words))
+
+    queries = [doc(80) for _ in range(args.queries)]
+    with tempfile.TemporaryDirectory() as tmp:
+        index = ResumeIndex(str(Path(tmp) / "bench.sqlite"))
+        for size in sorted(args.sizes):
+            t0 = time.perf_counter()
+            n = size - len(index)
+            index.add_many((None, doc(400)) for _ in range(n))
+            t_build = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            for q in queries:
+                index.shortlist(q, k=200)
+            t_short = (time.perf_counter() - t0) / len(queries)
+
+            t0 = time.perf_counter()
+            for q in queries[:5]:
+                index.search(q, top_n=10, shortlist=200)
+            t_search = (time.perf_counter() - t0) / 5
+            print(f"n={size:>7}: build(+{t_build:.1f}s) shortlist={t_short * 1000:.1f} ms  search(+rescore)={t_search * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
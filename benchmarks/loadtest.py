@@ -0,0 +1,249 @@
+"""End-to-end load test of the API: open-loop arrivals at a target RPS, latency percentiles per stage.
+
+Requests arrive as a seeded Poisson stream with a realistic mix: resumes of 2-16 KB (some
+re-submitted, which the caches should catch) against a pool of postings where a few popular
+ones get most of the traffic. Per-stage durations come from each response's `Server-Timing`
+header (`/analyze`) or `explanations.timings` (`/jobs`, submit then poll), next to the
+client-side end-to-end latency.
+
+Without `--url`, the mock LLM (`benchmarks.mock_llm`) and the API (uvicorn, `--workers`
+processes, SKILL_EXTRACTOR=llm) are started with their stores in a fresh temp dir, so caches
+start cold and runs are comparable; `--env KEY=VALUE` sets any API setting for the run.
+
+Usage:
+    python -m benchmarks.loadtest --rps 20 --duration 30 --workers 2 --llm-latency-ms 400
+    python -m benchmarks.loadtest --rps 20 --env LLM_CACHE_ENABLED=0 --json runs/no-cache.json
+    python -m benchmarks.loadtest --rps 20 --endpoint jobs --env JOBS_WORKERS=8
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --rps 5   # an already running API
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator
+import httpx
+from rich import print
+
+from .synthetic import make_jd, make_resume
+
+RESUME_KB = ((2, 0.3), (4, 0.4), (8, 0.2), (16, 0.1))
+JD_KB = (2, 3, 4, 6)
+
+@dataclass
+class Sample:
+    status: int
+    latency_s: float
+    stages: Dict[str, float] = field(default_factory=dict)  # ms
+
+def make_workload(n: int, seed: int = 0, n_jobs: int = 20, repeat: float = 0.1) -> list[Dict[str, Any]]:
+    """`n` /analyze bodies: Zipf-popular postings, mixed resume sizes, a `repeat` share of re-submissions."""
+    rng = random.Random(seed)
+    jobs = [make_jd(rng.choice(JD_KB) * 1000, seed=i) for i in range(n_jobs)]
+    job_weights = [1.0 / (i + 1) for i in range(n_jobs)]
+    sizes, size_weights = zip(*RESUME_KB)
+    bodies, resumes = [], []
+    for i in range(n):
+        if resumes and rng.random() < repeat:
+            resume = rng.choice(resumes)
+        else:
+            resume = make_resume(rng.choices(sizes, size_weights)[0] * 1000, seed=seed * 1_000_000 + i)
+            resumes.append(resume)
+        bodies.append({"resume_text": resume, "job_text": rng.choices(jobs, job_weights)[0]})
+    return bodies
+
+def parse_server_timing(header: str) -> Dict[str, float]:
+    out = {}
+    for part in header.split(","):
+        name, _, rest = part.strip().partition(";")
+        if name and rest.startswith("dur="):
+            out[name] = float(rest[4:])
+    return out
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of a non-empty list."""
+    s = sorted(values)
+    return s[min(len(s) - 1, max(0, math.ceil(q / 100 * len(s)) - 1))]
+
+async def _one(client: httpx.AsyncClient, body: Dict[str, Any], endpoint: str, poll_s: float) -> Sample:
+    t0 = time.perf_counter()
+    try:
+        if endpoint == "analyze":
+            r = await client.post("/analyze", json=body)
+            return Sample(r.status_code, time.perf_counter() - t0, parse_server_timing(r.headers.get("server-timing", "")))
+        r = await client.post("/jobs", json={**body, "include_timings": True})
+        if r.status_code != 202:
+            return Sample(r.status_code, time.perf_counter() - t0)
+        job_id = r.json()["id"]
+        while True:
+            await asyncio.sleep(poll_s)
+            job = (await client.get(f"/jobs/{job_id}")).json()
+            if job["status"] in ("done", "failed"):
+                break
+        latency = time.perf_counter() - t0
+        if job["status"] == "failed":
+            return Sample(500, latency)
+        return Sample(200, latency, dict(job["result"]["explanations"].get("timings", {})))
+    except httpx.HTTPError:
+        return Sample(0, time.perf_counter() - t0)  # timeout / connection error
+
+async def drive(
+    url: str, bodies: list[Dict[str, Any]], rps: float, endpoint: str = "analyze", seed: int = 0,
+    timeout_s: float = 120.0, poll_s: float = 0.05,
+) -> tuple[float, list[Sample]]:
+    """Send `bodies` at Poisson arrivals of rate `rps` (open loop); returns (wall seconds, samples)."""
+    rng = random.Random(seed)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=200)
+    async with httpx.AsyncClient(base_url=url, timeout=timeout_s, limits=limits) as client:
+        t0 = time.perf_counter()
+        tasks = []
+        for body in bodies:
+            tasks.append(asyncio.create_task(_one(client, body, endpoint, poll_s)))
+            await asyncio.sleep(rng.expovariate(rps))
+        samples = await asyncio.gather(*tasks)
+        return time.perf_counter() - t0, list(samples)
+
+def summarize(wall_s: float, samples: list[Sample]) -> Dict[str, Any]:
+    ok = [s for s in samples if s.status == 200]
+    status: Dict[str, int] = {}
+    for s in samples:
+        status[str(s.status)] = status.get(str(s.status), 0) + 1
+    stages: Dict[str, list[float]] = {"client": [s.latency_s * 1000 for s in ok]}
+    for s in ok:
+        for name, ms in s.stages.items():
+            stages.setdefault(name, []).append(ms)
+    return {
+        "requests": len(samples),
+        "ok": len(ok),
+        "status": status,
+        "wall_s": round(wall_s, 3),
+        "throughput_rps": round(len(ok) / wall_s, 2) if wall_s else 0.0,
+        "stages_ms": {
+            name: {"n": len(v), **{f"p{q}": round(percentile(v, q), 1) for q in (50, 95, 99)}}
+            for name, v in stages.items() if v
+        },
+    }
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(
+        f"{report['requests']} requests in {report['wall_s']:.1f}s: {report['throughput_rps']:.1f} ok/s, "
+        f"status {report['status']}"
+    )
+    print(f"{'stage':<18}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, st in report["stages_ms"].items():
+        print(f"{name:<18}{st['n']:>6}{st['p50']:>10.1f}{st['p95']:>10.1f}{st['p99']:>10.1f}")
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _wait_ready(url: str, proc: subprocess.Popen, timeout_s: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"{' '.join(proc.args)} exited with {proc.returncode}")
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} not ready after {timeout_s}s")
+
+@contextmanager
+def spawned_stack(args: argparse.Namespace) -> Iterator[str]:
+    """Start the mock LLM and the API in a temp dir; yields the API base URL."""
+    with tempfile.TemporaryDirectory() as tmp:
+        mock_port, api_port = _free_port(), _free_port()
+        mock_url = f"http://127.0.0.1:{mock_port}"
+        env = {
+            **os.environ,
+            "LLM_PROVIDER": args.provider,
+            "OLLAMA_BASE_URL": mock_url,
+            "OPENAI_BASE_URL": mock_url + "/v1",
+            "OPENAI_API_KEY": "mock",
+            "LLM_CACHE_PATH": str(Path(tmp) / "llm.sqlite"),
+            "JOBS_DB_PATH": str(Path(tmp) / "jobs.sqlite"),
+            "JOB_PROFILES_PATH": str(Path(tmp) / "job_profiles.sqlite"),
+            "RESUME_CACHE_PATH": str(Path(tmp) / "resume_text.sqlite"),
+            "SKILL_EXTRACTOR": "llm",  # every request reaches the mock; override with --env
+            "APP_LOG_LEVEL": "WARNING",
+        }
+        env.update(kv.split("=", 1) for kv in args.env)
+        mock_cmd = [
+            sys.executable, "-m", "benchmarks.mock_llm", "--port", str(mock_port),
+            "--latency-ms", str(args.llm_latency_ms), "--error-rate", str(args.llm_error_rate),
+            "--max-concurrency", str(args.llm_concurrency), "--seed", str(args.seed),
+        ]
+        api_cmd = [
+            sys.executable, "-m", "uvicorn", "src.api.main:app", "--port", str(api_port),
+            "--workers", str(args.workers), "--log-level", "warning",
+        ]
+        procs = []
+        try:
+            procs.append(subprocess.Popen(mock_cmd, env=env))
+            _wait_ready(mock_url + "/stats", procs[0])
+            procs.append(subprocess.Popen(api_cmd, env=env))
+            api_url = f"http://127.0.0.1:{api_port}"
+            _wait_ready(api_url + "/health", procs[1])
+            yield api_url
+            print(f"mock LLM: {httpx.get(mock_url + '/stats').json()}")
+        finally:
+            for p in reversed(procs):
+                p.terminate()
+                try:
+                    p.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    p.kill()
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--url", default=None, help="Target a running API instead of spawning one.")
+    ap.add_argument("--endpoint", choices=("analyze", "jobs"), default="analyze",
+                    help="analyze: blocking /analyze; jobs: queued /jobs, submit then poll.")
+    ap.add_argument("--rps", type=float, default=10.0)
+    ap.add_argument("--duration", type=float, default=20.0, help="Seconds of arrivals (requests = rps * duration).")
+    ap.add_argument("--jobs", type=int, default=20, help="Distinct postings in the mix.")
+    ap.add_argument("--repeat", type=float, default=0.1, help="Share of re-submitted resumes.")
+    ap.add_argument("--timeout-s", type=float, default=120.0)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", default=None, help="Write the report to this file.")
+    # spawned stack
+    ap.add_argument("--workers", type=int, default=1, help="uvicorn worker processes.")
+    ap.add_argument("--provider", choices=("ollama", "openai"), default="ollama")
+    ap.add_argument("--llm-latency-ms", type=float, default=300.0)
+    ap.add_argument("--llm-error-rate", type=float, default=0.0)
+    ap.add_argument("--llm-concurrency", type=int, default=8)
+    ap.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="Extra API setting (repeatable).")
+    args = ap.parse_args()
+
+    bodies = make_workload(max(1, int(args.rps * args.duration)), seed=args.seed, n_jobs=args.jobs, repeat=args.repeat)
+
+    def run(url: str) -> Dict[str, Any]:
+        wall, samples = asyncio.run(drive(url, bodies, args.rps, args.endpoint, args.seed, args.timeout_s))
+        return summarize(wall, samples)
+
+    if args.url:
+        report = run(args.url)
+    else:
+        with spawned_stack(args) as url:
+            report = run(url)
+    report["config"] = {k: v for k, v in vars(args).items() if k != "json"}
+    print_report(report)
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json).write_text(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Local mock LLM provider speaking the OpenAI (`/v1/chat/completions`) and Ollama (`/api/chat`) shapes.
+
+Answers are deterministic: the taxonomy skills/tools found in the prompt's text (per
+document for batched prompts), so extraction results are stable across runs. Latency is
+lognormal around `latency_ms` plus `per_kchar_ms` per 1000 prompt characters; a share
+`error_rate` of calls fail with `error_status`. At most `max_concurrency` calls are served at
+once; the rest wait (like one local model) or, with `reject=True`, get 429 (like a rate-limited
+API). Per-call randomness is seeded from the prompt, so runs repeat regardless of arrival order.
+For fault-injection tests, the first `fail_first` calls fail and the first `slow_first` calls
+take `slow_ms`; the config is read per call, so tests can change it while the server runs.
+
+Usage:
+    python -m benchmarks.mock_llm --port 11435 --latency-ms 400 --error-rate 0.01 --max-concurrency 8
+    LLM_PROVIDER=ollama OLLAMA_BASE_URL=http://127.0.0.1:11435 uvicorn src.api.main:app
+    LLM_PROVIDER=openai OPENAI_API_KEY=mock OPENAI_BASE_URL=http://127.0.0.1:11435/v1 uvicorn src.api.main:app
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from src.features.skill_taxonomy import SkillTaxonomy
+from src.utils.config import settings
+
+_TEXT_RE = re.compile(r'TEXT:\n"""(.*)"""', re.S)
+_DOC_RE = re.compile(r'DOCUMENT id=(\d+):\n"""(.*?)"""', re.S)
+
+@dataclass
+class MockConfig:
+    latency_ms: float = 300.0
+    jitter: float = 0.3  # sigma of the lognormal latency factor; 0 = fixed latency
+    per_kchar_ms: float = 20.0
+    error_rate: float = 0.0
+    error_status: int = 500
+    fail_first: int = 0
+    slow_first: int = 0
+    slow_ms: float = 5000.0
+    max_concurrency: int = 8
+    reject: bool = False
+    seed: int = 0
+
+def extraction_for(prompt: str, taxonomy: SkillTaxonomy) -> Dict[str, Any]:
+    """The mock's answer to a single- or multi-document extraction prompt."""
+    docs = _DOC_RE.findall(prompt)
+    if docs:
+        return {"results": {i: {**taxonomy.extract(t), "requirements": []} for i, t in docs}}
+    m = _TEXT_RE.search(prompt)
+    return {**taxonomy.extract(m.group(1) if m else prompt), "requirements": []}
+
+def create_app(config: Optional[MockConfig] = None, taxonomy: Optional[SkillTaxonomy] = None) -> FastAPI:
+    config = config or MockConfig()
+    taxonomy = taxonomy or SkillTaxonomy.load(settings.skill_taxonomy_path)
+    app = FastAPI(title="Mock LLM provider")
+    sem = asyncio.Semaphore(max(1, config.max_concurrency))
+    seen: Counter = Counter()
+    stats = {"calls": 0, "errors": 0, "rejected": 0, "in_flight": 0, "max_in_flight": 0}
+
+    async def complete(prompt: str) -> tuple[Optional[str], Optional[JSONResponse]]:
+        stats["calls"] += 1
+        n = stats["calls"]
+        if config.reject and sem.locked():
+            stats["rejected"] += 1
+            return None, JSONResponse({"error": {"message": "mock rate limit"}}, status_code=429, headers={"Retry-After": "1"})
+        key = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:16]
+        seen[key] += 1
+        rng = random.Random(f"{config.seed}:{key}:{seen[key]}")
+        delay = config.latency_ms * math.exp(rng.gauss(0.0, config.jitter)) + config.per_kchar_ms * len(prompt) / 1000
+        if n <= config.slow_first:
+            delay = config.slow_ms
+        async with sem:
+            stats["in_flight"] += 1
+            stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+            try:
+                await asyncio.sleep(delay / 1000)
+            finally:
+                stats["in_flight"] -= 1
+        if rng.random() < config.error_rate or n <= config.fail_first:
+            stats["errors"] += 1
+            return None, JSONResponse({"error": {"message": "mock failure"}}, status_code=config.error_status)
+        return json.dumps(extraction_for(prompt, taxonomy)), None
+
+    @app.post("/v1/chat/completions")
+    @app.post("/chat/completions")
+    async def openai_chat(request: Request):
+        body = await request.json()
+        prompt = body["messages"][-1]["content"]
+        content, error = await complete(prompt)
+        if error is not None:
+            return error
+        return {
+            "object": "chat.completion", "model": body.get("model", "mock"),
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4},
+        }
+
+    @app.post("/api/chat")
+    async def ollama_chat(request: Request):
+        body = await request.json()
+        prompt = body["messages"][-1]["content"]
+        content, error = await complete(prompt)
+        if error is not None:
+            return error
+        return {
+            "model": body.get("model", "mock"), "done": True,
+            "message": {"role": "assistant", "content": content},
+            "prompt_eval_count": len(prompt) // 4, "eval_count": len(content) // 4,
+        }
+
+    @app.get("/stats")
+    def get_stats() -> Dict[str, int]:
+        return dict(stats)
+
+    return app
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=11435)
+    ap.add_argument("--latency-ms", type=float, default=300.0, help="Median latency per call.")
+    ap.add_argument("--jitter", type=float, default=0.3, help="Lognormal sigma; 0 for fixed latency.")
+    ap.add_argument("--per-kchar-ms", type=float, default=20.0, help="Extra latency per 1000 prompt characters.")
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--error-status", type=int, default=500)
+    ap.add_argument("--max-concurrency", type=int, default=8)
+    ap.add_argument("--reject", action="store_true", help="429 instead of queueing calls beyond --max-concurrency.")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    import uvicorn
+    config = MockConfig(
+        latency_ms=args.latency_ms, jitter=args.jitter, per_kchar_ms=args.per_kchar_ms,
+        error_rate=args.error_rate, error_status=args.error_status,
+        max_concurrency=args.max_concurrency, reject=args.reject, seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
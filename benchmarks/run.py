@@ -0,0 +1,149 @@
+"""Micro-benchmarks for the hot functions, with a JSON baseline and regression gate.
+
+Usage:
+    python -m benchmarks.run                                   # run and print
+    python -m benchmarks.run --save benchmarks/baseline.json   # record a new baseline
+    python -m benchmarks.run --compare benchmarks/baseline.json # the regression gate
+
+With --compare the exit code is 1 if any case is slower than baseline * (1 + threshold)
+(default +25%) and by more than --min-delta-ms (default 0.05 ms, below which timer noise
+dominates). A case over both limits is timed `--confirm` more times and only fails if its
+best time is still over them, so one noisy run does not fail the gate.
+Baselines are machine-specific: record them on the machine (or CI runner) that gates, and
+re-record (`--save`) in the same change as an intended slowdown or a new case.
+"""
+from __future__ import annotations
+import argparse
+import json
+import platform
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List
+from rich import print
+
+from src.features.keyword_extractor import extract_keywords, fuzzy_contains
+from src.features.tfidf_features import default_tfidf
+from src.ingestion.fetch_job_posting import extract_job_text, html_to_text
+from src.modeling.baseline_similarity import baseline_compare
+from src.preprocessing.clean_text import clean_text
+from src.preprocessing.section_parser import parse_sections
+from src.utils.text import tokens, unique_preserve_order
+from .synthetic import make_jd, make_job_html, make_resume
+
+SIZES = {"1KB": 1_000, "10KB": 10_000, "100KB": 100_000, "1MB": 1_000_000}
+
+@dataclass
+class Case:
+    name: str
+    size: str
+    fn: Callable[[], object]
+
+def build_cases(sizes: List[str], seed: int = 0) -> List[Case]:
+    cases = []
+    for size in sizes:
+        n = SIZES[size]
+        resume, jd, html = make_resume(n, seed), make_jd(n, seed), make_job_html(n, seed)
+        toks = tokens(resume)
+        jd_kw = extract_keywords(jd)[:40]
+        cases += [
+            Case("clean_text", size, lambda r=resume: clean_text(r)),
+            Case("tokens", size, lambda r=resume: tokens(r)),
+            Case("unique_preserve_order", size, lambda t=toks: unique_preserve_order(t)),
+            Case("extract_keywords", size, lambda r=resume: extract_keywords(r)),
+            Case("fuzzy_contains", size, lambda r=resume, kw=jd_kw: [fuzzy_contains(r, k) for k in kw]),
+            Case("TfidfSimilarity.score", size, lambda r=resume, j=jd: default_tfidf().score(r, j)),
+            Case("parse_sections", size, lambda r=resume: parse_sections(r)),
+            Case("baseline_compare", size, lambda r=resume, j=jd: baseline_compare(r, j)),
+            Case("html_to_text", size, lambda h=html: html_to_text(h)),
+            Case("extract_job_text", size, lambda h=html: extract_job_text(h)),
+        ]
+    return cases
+
+def time_case(case: Case, repeat: int = 5, min_time_s: float = 0.05) -> Dict[str, float]:
+    """Best-of-`repeat` seconds per call, each repeat looping until `min_time_s` has passed."""
+    loops = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            case.fn()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_time_s or loops >= 1_000_000:
+            break
+        loops *= 2 if elapsed == 0 else max(2, int(min_time_s / elapsed) + 1)
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            case.fn()
+        best = min(best, (time.perf_counter() - t0) / loops)
+    return {"per_call_s": best, "loops": loops}
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float, min_delta_s: float = 0.0) -> List[str]:
+    """Names of cases slower than baseline by more than `threshold` (e.g. 0.25 = +25%) and by
+    more than `min_delta_s` seconds per call."""
+    regressions = []
+    for key, r in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        slower = r["per_call_s"] - base["per_call_s"]
+        if r["per_call_s"] > base["per_call_s"] * (1.0 + threshold) and slower > min_delta_s:
+            regressions.append(key)
+    return regressions
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", nargs="+", default=list(SIZES), choices=list(SIZES))
+    ap.add_argument("--filter", type=str, default=None, help="Only run cases whose name contains this")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--save", type=str, default=None, help="Write results as the new baseline JSON")
+    ap.add_argument("--compare", type=str, default=None, help="Baseline JSON to gate against")
+    ap.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown ratio before failing")
+    ap.add_argument("--min-delta-ms", type=float, default=0.05, help="Ignore slowdowns smaller than this per call")
+    ap.add_argument("--confirm", type=int, default=3, help="Re-time suspected regressions this many times")
+    args = ap.parse_args()
+
+    cases = [c for c in build_cases(args.sizes, seed=args.seed) if not args.filter or args.filter in c.name]
+    baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))["results"] if args.compare else {}
+
+    results: Dict[str, Dict] = {}
+    for case in cases:
+        key = f"{case.name}[{case.size}]"
+        results[key] = time_case(case, repeat=args.repeat)
+        line = f"{key:<34} {results[key]['per_call_s'] * 1000:>10.3f} ms"
+        if key in baseline:
+            ratio = results[key]["per_call_s"] / baseline[key]["per_call_s"]
+            color = "red" if ratio > 1.0 + args.threshold else ("green" if ratio < 1.0 else "white")
+            line += f"  [{color}]x{ratio:.2f} vs baseline[/{color}]"
+        print(line)
+
+    if args.save:
+        payload = {
+            "meta": {"python": platform.python_version(), "machine": platform.machine(), "seed": args.seed},
+            "results": results,
+        }
+        Path(args.save).write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+        print(f"[bold]Saved baseline[/bold] {args.save}")
+
+    if args.compare:
+        min_delta_s = args.min_delta_ms / 1000.0
+        regressions = compare(results, baseline, args.threshold, min_delta_s)
+        by_key = {f"{c.name}[{c.size}]": c for c in cases}
+        for _ in range(args.confirm):
+            if not regressions:
+                break
+            for key in regressions:
+                again = time_case(by_key[key], repeat=args.repeat)
+                if again["per_call_s"] < results[key]["per_call_s"]:
+                    results[key] = again
+            regressions = compare(results, baseline, args.threshold, min_delta_s)
+        if regressions:
+            print(f"[bold red]{len(regressions)} regression(s) over +{args.threshold:.0%}:[/bold red] {', '.join(regressions)}")
+            sys.exit(1)
+        print(f"[bold green]No regressions over +{args.threshold:.0%}[/bold green]")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Cold start: import time, RSS and heavy modules loaded by the API, per TF-IDF engine.
+
+Each measurement runs in a fresh interpreter so nothing is already imported. The child
+imports `src.api.main`, then runs one `baseline_compare` (the first request's extra cost).
+
+Usage:
+    python -m benchmarks.startup --repeat 5
+    python -X importtime -c "import src.api.main" 2> importtime.log   # per-module breakdown
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from rich import print
+
+HEAVY = ("sklearn", "scipy", "pandas", "bs4", "lxml", "PyPDF2", "rapidfuzz", "httpx", "rich")
+
+CHILD = r"""
+import json, sys, time
+def rss_mb():
+    with open("/proc/self/status") as f:
+        return next(int(l.split()[1]) for l in f if l.startswith("VmRSS:")) / 1024
+t0 = time.perf_counter()
+import src.api.main
+t_import = time.perf_counter() - t0
+rss_import = rss_mb()
+from src.modeling.baseline_similarity import baseline_compare
+from benchmarks.synthetic import make_jd, make_resume
+resume, jd = make_resume(8000, seed=1), make_jd(4000, seed=2)
+t0 = time.perf_counter()
+baseline_compare(resume, jd)
+t_first = time.perf_counter() - t0
+print(json.dumps({
+    "import_s": t_import, "first_baseline_s": t_first, "rss_import_mb": rss_import, "rss_mb": rss_mb(),
+    "heavy": [m for m in HEAVY if m in sys.modules],
+}))
+"""
+
+def measure(engine: str) -> dict:
+    env = {**os.environ, "TFIDF_ENGINE": engine, "LLM_PROVIDER": ""}
+    out = subprocess.run(
+        [sys.executable, "-c", f"HEAVY = {HEAVY!r}\n{CHILD}"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--engines", nargs="+", default=["sklearn", "light"])
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    for engine in args.engines:
+        runs = [measure(engine) for _ in range(args.repeat)]
+        med = lambda k: statistics.median(r[k] for r in runs)
+        print(f"[bold]{engine}[/bold]: import={med('import_s')*1000:.0f} ms "
+              f"first_baseline={med('first_baseline_s')*1000:.0f} ms "
+              f"rss_after_import={med('rss_import_mb'):.0f} MB rss={med('rss_mb'):.0f} MB")
+        print(f"  heavy modules after first baseline: {', '.join(runs[-1]['heavy']) or '-'}")
+
+if __name__ == "__main__":
+    main()
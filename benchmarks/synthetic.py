@@ -0,0 +1,57 @@
+"""Seeded synthetic resumes, job descriptions and job-posting HTML at a target size."""
+from __future__ import annotations
+import random
+
+SKILLS = [
+    "python","sql","scikit-learn","pytorch","tensorflow","docker","kubernetes","aws","gcp","azure",
+    "fastapi","flask","django","spark","airflow","mlops","nlp","llm","statistics","pandas","numpy",
+    "java","golang","react","typescript","postgres","redis","kafka","terraform","linux","git",
+    "machine learning","deep learning","data pipelines","ci/cd","rest apis","a/b testing","xgboost",
+]
+FILLER = [
+    "built","designed","led","improved","reduced","owned","shipped","migrated","automated","mentored",
+    "team","pipeline","service","platform","customers","latency","costs","reports","models","features",
+    "with","and","for","the","across","using","to","of","in","our",
+]
+RESUME_SECTIONS = ["Summary", "Skills", "Experience", "Projects", "Education", "Certifications"]
+JD_SECTIONS = ["About", "Responsibilities", "Requirements", "Nice to have", "Benefits"]
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(FILLER) for _ in range(rng.randint(6, 14))]
+    for _ in range(rng.randint(1, 3)):
+        words.insert(rng.randrange(len(words) + 1), rng.choice(SKILLS))
+    return " ".join(words).capitalize() + "."
+
+def _document(rng: random.Random, size_bytes: int, sections: list[str]) -> str:
+    parts, size, i = [], 0, 0
+    while size < size_bytes:
+        header = sections[i % len(sections)]
+        body = [f"• {_sentence(rng)}" for _ in range(rng.randint(3, 8))]
+        block = header + "\n" + "\n".join(body) + "\n\n"
+        parts.append(block)
+        size += len(block.encode("utf-8"))
+        i += 1
+    return "".join(parts).encode("utf-8")[:size_bytes].decode("utf-8", errors="ignore")
+
+def make_resume(size_bytes: int, seed: int = 0) -> str:
+    return _document(random.Random(f"resume-{seed}-{size_bytes}"), size_bytes, RESUME_SECTIONS)
+
+def make_jd(size_bytes: int, seed: int = 0) -> str:
+    return _document(random.Random(f"jd-{seed}-{size_bytes}"), size_bytes, JD_SECTIONS)
+
+def make_job_html(size_bytes: int, seed: int = 0) -> str:
+    """A career-site-like page: nav, scripts, cookie banner and footer around a JD."""
+    rng = random.Random(f"html-{seed}-{size_bytes}")
+    nav = "".join(f'<li><a href="/p/{i}">{rng.choice(FILLER).title()} page</a></li>' for i in range(30))
+    script = "<script>window.__STATE__=" + '{"k":"' + "x" * 2000 + '"};</script>'
+    body = "".join(
+        f"<h2>{line}</h2>" if not line.startswith("•") else f"<li>{line[2:]}</li>"
+        for line in make_jd(max(size_bytes // 2, 256), seed).splitlines() if line
+    )
+    footer = "".join(f'<a href="/f/{i}">Footer link {i}</a> ' for i in range(40))
+    page = (
+        f"<html><head><title>Job</title><style>body{{margin:0}}</style>{script}</head><body>"
+        f"<nav><ul>{nav}</ul></nav><div class='cookie'>We use cookies. <a href='/c'>Accept</a></div>"
+        f"<main><h1>Senior ML Engineer</h1><ul>{body}</ul></main><footer>{footer}</footer></body></html>"
+    )
+    return page
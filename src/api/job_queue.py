@@ -0,0 +1,236 @@
+"""Background analyze jobs: a SQLite-backed queue and a bounded pool of async workers.
+
+The queue lives in one SQLite file (WAL), so it survives restarts and every uvicorn worker
+process on the host shares it: any process can accept a job and any process's workers
+can run it. Claims are atomic (`BEGIN IMMEDIATE`); a job left `running` by a process that
+died is claimable again once it is older than JOBS_STALE_S, unless it has already been claimed
+JOBS_MAX_ATTEMPTS times: a job that keeps killing its worker is marked `failed` instead.
+"""
+from __future__ import annotations
+import asyncio
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..utils.config import settings
+from ..utils.metrics import JOBS
+
+log = logging.getLogger("jobs")
+
+class QueueFull(RuntimeError):
+    """Raised by `JobStore.submit` when `max_queued` jobs are already waiting."""
+
+    def __init__(self, retry_after_s: int):
+        super().__init__(f"Job queue is full; retry in {retry_after_s}s")
+        self.retry_after_s = retry_after_s
+
+class JobStore:
+    """Job rows: id, status (queued/running/done/failed), request and result JSON, timestamps,
+    claim count."""
+
+    def __init__(self, path: str, stale_s: float = 600.0, ttl_s: float = 24 * 3600, max_attempts: int = 3):
+        self.stale_s = stale_s
+        self.ttl_s = ttl_s
+        self.max_attempts = max(1, max_attempts)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY, status TEXT NOT NULL, request TEXT NOT NULL, result TEXT, error TEXT,"
+            " created_at REAL NOT NULL, started_at REAL, finished_at REAL, worker TEXT,"
+            " attempts INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {r[1] for r in self._db.execute("PRAGMA table_info(jobs)")}
+        if "attempts" not in columns:  # stores created before claims were counted
+            self._db.execute("ALTER TABLE jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at)")
+        self._db.execute(
+            "DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?", (time.time() - ttl_s,)
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _retry_after_locked(self, queued: int, workers: int) -> int:
+        row = self._db.execute(
+            "SELECT AVG(finished_at - started_at) FROM"
+            " (SELECT finished_at, started_at FROM jobs WHERE status = 'done' ORDER BY finished_at DESC LIMIT 50)"
+        ).fetchone()
+        per_job = row[0] or 1.0
+        return max(1, min(60, math.ceil(queued * per_job / max(1, workers))))
+
+    def submit(self, request: Dict[str, Any], max_queued: int, workers: int = 1) -> str:
+        """Enqueue a job and return its id; raises `QueueFull` at capacity (checked atomically)."""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                queued = self._db.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+                if queued >= max_queued:
+                    retry = self._retry_after_locked(queued, workers)
+                    self._db.execute("ROLLBACK")
+                    JOBS.inc(1.0, "rejected")
+                    raise QueueFull(retry)
+                self._db.execute(
+                    "INSERT INTO jobs (id, status, request, created_at) VALUES (?, 'queued', ?, ?)",
+                    (job_id, json.dumps(request), time.time()),
+                )
+                self._db.execute("COMMIT")
+            except QueueFull:
+                raise
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        JOBS.inc(1.0, "submitted")
+        return job_id
+
+    def claim(self, worker: str) -> Optional[tuple[str, Dict[str, Any]]]:
+        """Atomically take the oldest queued (or stale running) job, or None. Stale jobs already
+        claimed `max_attempts` times are marked failed instead."""
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                abandoned = self._db.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, finished_at = ?"
+                    " WHERE status = 'running' AND started_at < ? AND attempts >= ?",
+                    (f"Abandoned after {self.max_attempts} attempts (worker died)", now, now - self.stale_s, self.max_attempts),
+                ).rowcount
+                row = self._db.execute(
+                    "SELECT id, request FROM jobs WHERE status = 'queued'"
+                    " OR (status = 'running' AND started_at < ?) ORDER BY created_at LIMIT 1",
+                    (now - self.stale_s,),
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE jobs SET status = 'running', started_at = ?, worker = ?, attempts = attempts + 1 WHERE id = ?",
+                        (now, worker, row[0]),
+                    )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        if abandoned:
+            JOBS.inc(float(abandoned), "failed")
+        return (row[0], json.loads(row[1])) if row is not None else None
+
+    def finish(self, job_id: str, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = 'done', result = ?, finished_at = ? WHERE id = ?",
+                (json.dumps(result), time.time(), job_id),
+            )
+        JOBS.inc(1.0, "done")
+
+    def fail(self, job_id: str, error: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?", (error, time.time(), job_id)
+            )
+        JOBS.inc(1.0, "failed")
+
+    def requeue(self, job_id: str) -> None:
+        """Put a job this process was running back in the queue (e.g. on shutdown); the claim
+        does not count as an attempt."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = 'queued', started_at = NULL, worker = NULL, attempts = MAX(attempts - 1, 0)"
+                " WHERE id = ? AND status = 'running'",
+                (job_id,),
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, status, result, error, created_at, started_at, finished_at, attempts FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row[0], "status": row[1], "result": json.loads(row[2]) if row[2] else None, "error": row[3],
+            "created_at": row[4], "started_at": row[5], "finished_at": row[6], "attempts": row[7],
+        }
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+class JobWorkers:
+    """`n` asyncio workers that claim jobs from `store` and pass their request to `run`.
+
+    Workers wake immediately for jobs submitted by this process (`notify`) and poll every
+    `poll_s` for jobs submitted by other processes sharing the store.
+    """
+
+    def __init__(self, store: JobStore, run: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]], n: int, poll_s: float = 0.5):
+        self.store = store
+        self.run = run
+        self.n = max(1, n)
+        self.poll_s = poll_s
+        self._wake = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self._current: Dict[int, str] = {}
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._work(i)) for i in range(self.n)]
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    async def stop(self) -> None:
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for job_id in self._current.values():
+            self.store.requeue(job_id)
+        self._tasks, self._current = [], {}
+
+    async def _work(self, i: int) -> None:
+        name = f"{os.getpid()}-{i}"
+        while True:
+            # cleared before claiming, so a notify that races with an empty claim is kept
+            self._wake.clear()
+            claimed = await asyncio.to_thread(self.store.claim, name)
+            if claimed is None:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_s)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            job_id, request = claimed
+            self._current[i] = job_id
+            try:
+                result = await self.run(request)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.exception("Job %s failed", job_id)
+                await asyncio.to_thread(self.store.fail, job_id, str(e) or type(e).__name__)
+            else:
+                await asyncio.to_thread(self.store.finish, job_id, result)
+            self._current.pop(i, None)
+
+_store: Optional[JobStore] = None
+_store_lock = threading.Lock()
+
+def get_job_store() -> JobStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = JobStore(
+                settings.jobs_db_path, stale_s=settings.jobs_stale_s, ttl_s=settings.jobs_ttl_s,
+                max_attempts=settings.jobs_max_attempts,
+            )
+        return _store
@@ -1,54 +1,168 @@
 from __future__ import annotations
+import json
 import logging
+from contextlib import asynccontextmanager
+from typing import Optional, Union
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from ..utils.logging import configure_logging
 from ..utils.config import settings
-from .schemas import AnalyzeRequest, AnalyzeResponse, BaselineOut
+from ..utils.metrics import CONTENT_TYPE, current_timings, render_metrics, start_request_timings
+from .job_queue import JobWorkers, QueueFull, get_job_store
+from .middleware import TimingMiddleware
+from .schemas import (
+    AnalyzeRequest, AnalyzeResponse, BaselineOut, JobOut, JobProfileIn, JobProfileOut, RankRequest, RankResponse, RankItemOut,
+    ResumeIn, ResumeOut, SearchRequest, SearchResponse, SearchHitOut,
+)
 from ..ingestion.fetch_job_posting import fetch_job_text
-from ..ingestion.load_resume import load_text_from_file
-from ..modeling.ranker import analyze
+from ..ingestion.job_fetcher import close_job_fetcher
+from ..ingestion.load_resume import load_text_from_file, shutdown_resume_pool
+from ..modeling.jd_dedup import JdMatch, get_jd_dedup_index
+from ..modeling.job_profiles import JobProfile, build_profile, get_job_profile_store
+from ..modeling.ranker import AnalyzeResult, JobSkills, analyze_async, analyze_many, analyze_stream
+from ..modeling.resume_index import get_resume_index
+from ..modeling.llm_extract import LlmExtraction, close_async_client, extraction_cache_stats, get_async_client
+from ..modeling.llm_resilience import get_breaker
+from ..features.tfidf_features import default_tfidf, load_default_tfidf
+from ..preprocessing.document import Document, TextLike
 
 configure_logging()
 log = logging.getLogger("api")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the corpus TF-IDF artifact once so requests only call `transform`. The light
+    # engine never uses it, so sklearn stays unimported.
+    if settings.tfidf_engine == "light":
+        log.info("Using the light TF-IDF engine")
+    else:
+        if load_default_tfidf() is None:
+            log.info("No TF-IDF artifact at %s; fitting per request", settings.tfidf_artifact_dir)
+        default_tfidf().score("warm up", "warm up")  # pay the lazy sklearn import before the first request
+    # One pooled keep-alive client for all LLM calls during the app's lifetime.
+    if settings.llm_provider:
+        get_async_client()
+    # Background /jobs workers; with JOBS_WORKERS=0 this process only accepts jobs.
+    workers = None
+    if settings.jobs_workers > 0:
+        workers = JobWorkers(get_job_store(), _run_job, settings.jobs_workers)
+        workers.start()
+    app.state.job_workers = workers
+    try:
+        yield
+    finally:
+        if workers is not None:
+            await workers.stop()
+        await close_async_client()
+        close_job_fetcher()
+        shutdown_resume_pool()
+
 app = FastAPI(
     title="JD–Resume Analyzer",
     version="1.0.0",
-    description="ATS-style analyzer with baseline NLP + optional LLM extraction"
+    description="ATS-style analyzer with baseline NLP + optional LLM extraction",
+    lifespan=lifespan,
 )
+app.add_middleware(TimingMiddleware)
 
 @app.get("/health")
 def health() -> dict:
-    return {"status":"ok", "llm_provider": settings.llm_provider}
+    tfidf = load_default_tfidf() if settings.tfidf_engine != "light" else None
+    return {
+        "status":"ok",
+        "llm_provider": settings.llm_provider,
+        "tfidf_engine": settings.tfidf_engine,
+        "tfidf_model": tfidf.version if tfidf else None,
+        "llm_cache": extraction_cache_stats(),
+        "llm_breaker": get_breaker(settings.llm_provider).state if settings.llm_provider else None,
+    }
 
-@app.post("/analyze", response_model=AnalyzeResponse)
-def analyze_endpoint(req: AnalyzeRequest) -> AnalyzeResponse:
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE)
+
+async def _resolve_inputs(
+    req: AnalyzeRequest,
+) -> tuple[str, TextLike, Optional[JobSkills], Optional[Union[JobProfile, JdMatch]]]:
+    """(resume text, job text or primed document, precomputed job skills or None, job profile or
+    near-duplicate JD whose analysis is reused, or None). A profile or near-duplicate whose
+    skills are stale is returned without them, so the analysis extracts them again."""
     # Resolve resume text
     resume_text = req.resume_text
     if not resume_text and req.resume_path:
         try:
-            resume_text = load_text_from_file(req.resume_path)
+            resume_text = await run_in_threadpool(load_text_from_file, req.resume_path)
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Failed to load resume_path: {e}")
 
+    if req.job_profile_id:
+        profile = await run_in_threadpool(get_job_profile_store().get, req.job_profile_id)
+        if profile is None:
+            raise HTTPException(status_code=404, detail=f"Unknown job profile id: {req.job_profile_id}")
+        if not resume_text:
+            raise HTTPException(status_code=400, detail="Provide resume_text or resume_path")
+        return resume_text, profile.document(), None if profile.skills_stale() else profile.skill_extraction(), profile
+
     # Resolve job text
     job_text = req.job_text
     if not job_text and req.job_url:
         try:
-            job_text = fetch_job_text(str(req.job_url))
+            job_text = await run_in_threadpool(fetch_job_text, str(req.job_url))
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Failed to fetch job_url: {e}")
 
     if not resume_text:
         raise HTTPException(status_code=400, detail="Provide resume_text or resume_path")
     if not job_text:
-        raise HTTPException(status_code=400, detail="Provide job_text or job_url")
+        raise HTTPException(status_code=400, detail="Provide job_text, job_url or job_profile_id")
+    if settings.jd_dedup_enabled:
+        job = Document(job_text)
+        match = await run_in_threadpool(get_jd_dedup_index().lookup, job)
+        if match is not None:
+            return resume_text, match.document(job), None if match.skills_stale() else match.skill_extraction(), match
+        return resume_text, job, None, None
+    return resume_text, job_text, None, None
 
+async def _remember_job(
+    job: TextLike, job_skills: Optional[JobSkills], reused: Optional[Union[JobProfile, JdMatch]],
+    skills_job: dict, explanations: dict,
+) -> None:
+    """Report a reused near-duplicate in `explanations`, store the re-extracted skills of a stale
+    job profile or near-duplicate, or remember a newly analyzed JD (none of them when the LLM
+    extraction fell back, which would be reused as if complete)."""
+    if isinstance(reused, JdMatch):
+        explanations["job_duplicate"] = reused.explanation()
+    if job_skills is not None or "llm_fallback" in explanations:
+        return
+    skills = LlmExtraction(**skills_job) if any(skills_job.values()) else None
+    if isinstance(reused, JobProfile):
+        profile = reused.with_skills(skills, explanations["skill_sources"]["job"], [])
+        await run_in_threadpool(get_job_profile_store().put, profile)
+    elif isinstance(reused, JdMatch):
+        await run_in_threadpool(get_jd_dedup_index().update_skills, reused, skills, explanations["skill_sources"]["job"])
+    elif settings.jd_dedup_enabled:
+        await run_in_threadpool(get_jd_dedup_index().add, job, skills, explanations["skill_sources"]["job"])
+
+def _budget_s(req: AnalyzeRequest) -> Optional[float]:
+    return req.llm_budget_ms / 1000.0 if req.llm_budget_ms is not None else None
+
+@app.post("/analyze", response_model=AnalyzeResponse)
+async def analyze_endpoint(req: AnalyzeRequest) -> AnalyzeResponse:
+    resume_text, job, job_skills, reused = await _resolve_inputs(req)
     try:
-        result = analyze(resume_text=resume_text, job_text=job_text)
+        result = await analyze_async(resume_text=resume_text, job_text=job, job_skills=job_skills, llm_budget_s=_budget_s(req))
     except Exception as e:
         log.exception("Analyze failed")
         raise HTTPException(status_code=500, detail=str(e))
+    await _remember_job(job, job_skills, reused, result.skills_job, result.explanations)
+    return _analyze_response(result, req.include_timings)
+
+def _analyze_response(result: AnalyzeResult, include_timings: bool) -> AnalyzeResponse:
+    explanations = result.explanations
+    timings = current_timings()
+    if include_timings and timings is not None:
+        explanations = {**explanations, "timings": {k: round(v * 1000, 2) for k, v in timings.items()}}
 
     return AnalyzeResponse(
         match_score=result.match_score,
@@ -57,5 +171,185 @@ def analyze_endpoint(req: AnalyzeRequest) -> AnalyzeResponse:
         skills_job=result.skills_job,
         missing_keywords=result.missing_keywords,
         recommended_keywords=result.recommended_keywords,
-        explanations=result.explanations,
+        explanations=explanations,
+    )
+
+async def _run_job(payload: dict) -> dict:
+    """Run one queued `/analyze` request inside a job worker; input errors fail the job."""
+    req = AnalyzeRequest(**payload)
+    start_request_timings()
+    try:
+        resume_text, job, job_skills, reused = await _resolve_inputs(req)
+    except HTTPException as e:
+        raise ValueError(e.detail) from None
+    result = await analyze_async(resume_text=resume_text, job_text=job, job_skills=job_skills, llm_budget_s=_budget_s(req))
+    await _remember_job(job, job_skills, reused, result.skills_job, result.explanations)
+    return _analyze_response(result, req.include_timings).model_dump()
+
+@app.post("/jobs", response_model=JobOut, status_code=202)
+async def submit_job_endpoint(req: AnalyzeRequest) -> JobOut:
+    """Queue an `/analyze` request (fetching included) and return its id at once; poll `/jobs/{id}`."""
+    if not (req.resume_text or req.resume_path):
+        raise HTTPException(status_code=400, detail="Provide resume_text or resume_path")
+    if not (req.job_text or req.job_url or req.job_profile_id):
+        raise HTTPException(status_code=400, detail="Provide job_text, job_url or job_profile_id")
+    store = get_job_store()
+    try:
+        job_id = await run_in_threadpool(store.submit, req.model_dump(mode="json"), settings.jobs_max_queued, settings.jobs_workers)
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after_s)})
+    job = await run_in_threadpool(store.get, job_id)  # before a woken worker claims it
+    workers = getattr(app.state, "job_workers", None)
+    if workers is not None:
+        workers.notify()
+    return JobOut(**job)
+
+@app.get("/jobs/{job_id}", response_model=JobOut)
+async def get_job_endpoint(job_id: str) -> JobOut:
+    job = await run_in_threadpool(get_job_store().get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job id: {job_id}")
+    return JobOut(**job)
+
+def _profile_out(profile: JobProfile) -> JobProfileOut:
+    skills, _ = profile.skill_extraction()
+    return JobProfileOut(
+        id=profile.id,
+        content_hash=profile.content_hash,
+        keywords=profile.keywords,
+        skills={"skills": skills.skills, "tools": skills.tools, "requirements": skills.requirements} if skills else {},
+        skill_source=profile.skill_source,
+        tfidf_model=profile.tfidf["model"] if profile.tfidf else None,
+        source_url=profile.source_url,
+        created_at=profile.created_at,
+        llm_fallback=profile.llm_fallback,
+    )
+
+@app.post("/jobs-profiles", response_model=JobProfileOut)
+async def add_job_profile_endpoint(req: JobProfileIn) -> JobProfileOut:
+    """Precompute a JD once (fetch, keywords, TF-IDF row, skill extraction) for use as
+    `job_profile_id` in `/analyze`, `/analyze/stream` and `/jobs`."""
+    job_text = req.job_text
+    if not job_text and req.job_url:
+        try:
+            job_text = await run_in_threadpool(fetch_job_text, str(req.job_url))
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Failed to fetch job_url: {e}")
+    if not job_text:
+        raise HTTPException(status_code=400, detail="Provide job_text or job_url")
+    try:
+        profile = await build_profile(job_text, profile_id=req.id, source_url=str(req.job_url) if req.job_url else None)
+    except Exception as e:
+        log.exception("Job profile failed")
+        raise HTTPException(status_code=500, detail=str(e))
+    await run_in_threadpool(get_job_profile_store().put, profile)
+    return _profile_out(profile)
+
+@app.get("/jobs-profiles/{profile_id}", response_model=JobProfileOut)
+async def get_job_profile_endpoint(profile_id: str) -> JobProfileOut:
+    profile = await run_in_threadpool(get_job_profile_store().get, profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job profile id: {profile_id}")
+    return _profile_out(profile)
+
+def _sse(event: str, payload: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+@app.post("/analyze/stream")
+async def analyze_stream_endpoint(req: AnalyzeRequest) -> StreamingResponse:
+    """Server-sent events: `baseline` first, then `skills_job` / `skills_resume` as each LLM
+    extraction finishes, then `recommended_keywords` and `done` (or a single `error`)."""
+    resume_text, job, job_skills, reused = await _resolve_inputs(req)
+
+    async def events():
+        stream = analyze_stream(resume_text=resume_text, job_text=job, job_skills=job_skills, llm_budget_s=_budget_s(req))
+        skills_job: dict = {}
+        try:
+            async for event, payload in stream:
+                if event == "skills_job":
+                    skills_job = payload
+                elif event == "done":
+                    await _remember_job(job, job_skills, reused, skills_job, payload["explanations"])
+                yield _sse(event, payload)
+        except Exception as e:
+            log.exception("Analyze stream failed")
+            yield _sse("error", {"detail": str(e)})
+        finally:
+            # on client disconnect this cancels the LLM calls still in flight
+            await stream.aclose()
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.post("/rank", response_model=RankResponse)
+def rank_endpoint(req: RankRequest) -> RankResponse:
+    if req.resume_text and req.job_texts and not (req.job_text or req.resume_texts):
+        mode = "jobs_for_resume"
+        resume_texts, job_texts = [req.resume_text], req.job_texts
+    elif req.job_text and req.resume_texts and not (req.resume_text or req.job_texts):
+        mode = "resumes_for_job"
+        resume_texts, job_texts = req.resume_texts, [req.job_text]
+    else:
+        raise HTTPException(status_code=400, detail="Provide resume_text + job_texts, or job_text + resume_texts")
+
+    try:
+        ranked = analyze_many(resume_texts=resume_texts, job_texts=job_texts, top_n=req.top_n)
+    except Exception as e:
+        log.exception("Rank failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return RankResponse(
+        mode=mode,
+        total=max(len(resume_texts), len(job_texts)),
+        results=[
+            RankItemOut(index=r.index, match_score=r.match_score, baseline=BaselineOut(**r.baseline.__dict__))
+            for r in ranked
+        ],
+    )
+
+@app.post("/resumes", response_model=ResumeOut)
+def add_resume_endpoint(req: ResumeIn) -> ResumeOut:
+    resume_text = req.resume_text
+    if not resume_text and req.resume_path:
+        try:
+            resume_text = load_text_from_file(req.resume_path)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Failed to load resume_path: {e}")
+    if not resume_text:
+        raise HTTPException(status_code=400, detail="Provide resume_text or resume_path")
+
+    index = get_resume_index()
+    resume_id = index.add(resume_text, resume_id=req.id)
+    return ResumeOut(id=resume_id, total=len(index))
+
+@app.delete("/resumes/{resume_id}", response_model=ResumeOut)
+def delete_resume_endpoint(resume_id: str) -> ResumeOut:
+    index = get_resume_index()
+    if not index.remove(resume_id):
+        raise HTTPException(status_code=404, detail=f"Unknown resume id: {resume_id}")
+    return ResumeOut(id=resume_id, total=len(index))
+
+@app.post("/search", response_model=SearchResponse)
+def search_endpoint(req: SearchRequest) -> SearchResponse:
+    job_text = req.job_text
+    if not job_text and req.job_url:
+        try:
+            job_text = fetch_job_text(str(req.job_url))
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Failed to fetch job_url: {e}")
+    if not job_text:
+        raise HTTPException(status_code=400, detail="Provide job_text or job_url")
+
+    index = get_resume_index()
+    try:
+        hits = index.search(job_text, top_n=req.top_n, shortlist=req.shortlist)
+    except Exception as e:
+        log.exception("Search failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return SearchResponse(
+        total=len(index),
+        results=[
+            SearchHitOut(resume_id=h.resume_id, match_score=h.match_score, baseline=BaselineOut(**h.baseline.__dict__))
+            for h in hits
+        ],
     )
@@ -0,0 +1,40 @@
+from __future__ import annotations
+import time
+
+from ..utils.metrics import REQUEST_SECONDS, REQUESTS_IN_FLIGHT, server_timing_header, start_request_timings
+
+class TimingMiddleware:
+    """Pure ASGI middleware: request histogram, in-flight gauge and a `Server-Timing` header.
+
+    Starts a per-request timings dict that `utils.metrics.timed` stages add to, and writes it
+    (plus `total`) into the response headers when they are sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        t0 = time.perf_counter()
+        timings = start_request_timings()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                stages = dict(timings)
+                stages["total"] = time.perf_counter() - t0
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing_header(stages).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            # route templates (e.g. /resumes/{resume_id}) keep the label set bounded
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            REQUEST_SECONDS.observe(time.perf_counter() - t0, path)
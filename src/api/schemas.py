@@ -7,6 +7,11 @@ class AnalyzeRequest(BaseModel):
     resume_path: Optional[str] = Field(default=None, description="Optional path to a local resume file (txt/pdf).")
     job_text: Optional[str] = Field(default=None, description="Raw job description text.")
     job_url: Optional[HttpUrl] = Field(default=None, description="Optional URL to fetch job posting text.")
+    job_profile_id: Optional[str] = Field(default=None, description="Precomputed job profile (POST /jobs-profiles) to use instead of job_text/job_url.")
+    include_timings: bool = Field(default=False, description="Add per-stage timings (ms) to `explanations`.")
+    llm_budget_ms: Optional[float] = Field(
+        default=None, ge=0, description="Latency budget for this request's LLM calls (0 = none; default LLM_BUDGET_MS).",
+    )
 
 class BaselineOut(BaseModel):
     tfidf_score: float
@@ -22,3 +27,70 @@ class AnalyzeResponse(BaseModel):
     missing_keywords: List[str]
     recommended_keywords: List[str]
     explanations: Dict[str, Any]
+
+class JobOut(BaseModel):
+    id: str
+    status: str = Field(..., description="queued, running, done or failed.")
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    attempts: int = Field(default=0, description="Times a worker claimed the job.")
+    result: Optional[AnalyzeResponse] = Field(default=None, description="The `/analyze` response once `done`.")
+    error: Optional[str] = Field(default=None, description="Failure reason once `failed`.")
+
+class JobProfileIn(BaseModel):
+    id: Optional[str] = Field(default=None, description="Stable profile id; defaults to a hash of the text. Re-adding an id replaces it.")
+    job_text: Optional[str] = Field(default=None, description="Raw job description text.")
+    job_url: Optional[HttpUrl] = Field(default=None, description="Optional URL to fetch job posting text.")
+
+class JobProfileOut(BaseModel):
+    id: str
+    content_hash: str
+    keywords: List[str]
+    skills: Dict[str, List[str]]
+    skill_source: str
+    tfidf_model: Optional[str] = Field(default=None, description="Version of the prefitted TF-IDF model the stored vector belongs to.")
+    source_url: Optional[str] = None
+    created_at: float
+    llm_fallback: List[str] = Field(default_factory=list, description="Why the LLM was skipped for the skills; they are extracted again when the profile is next used.")
+
+class RankRequest(BaseModel):
+    resume_text: Optional[str] = Field(default=None, description="Single resume to rank `job_texts` against.")
+    job_texts: Optional[List[str]] = Field(default=None, max_length=5000, description="Job descriptions to rank for `resume_text`.")
+    job_text: Optional[str] = Field(default=None, description="Single job description to rank `resume_texts` against.")
+    resume_texts: Optional[List[str]] = Field(default=None, max_length=5000, description="Resumes to rank for `job_text`.")
+    top_n: int = Field(default=10, ge=1, le=5000, description="Number of best matches to return.")
+
+class RankItemOut(BaseModel):
+    index: int = Field(..., description="Position of the item in `job_texts` / `resume_texts`.")
+    match_score: float = Field(..., ge=0.0, le=1.0)
+    baseline: BaselineOut
+
+class RankResponse(BaseModel):
+    mode: str
+    total: int
+    results: List[RankItemOut]
+
+class ResumeIn(BaseModel):
+    id: Optional[str] = Field(default=None, description="Stable resume id; generated when omitted. Re-adding an id replaces it.")
+    resume_text: Optional[str] = Field(default=None, description="Raw resume text.")
+    resume_path: Optional[str] = Field(default=None, description="Optional path to a local resume file (txt/pdf).")
+
+class ResumeOut(BaseModel):
+    id: str
+    total: int
+
+class SearchRequest(BaseModel):
+    job_text: Optional[str] = Field(default=None, description="Raw job description text.")
+    job_url: Optional[HttpUrl] = Field(default=None, description="Optional URL to fetch job posting text.")
+    top_n: int = Field(default=10, ge=1, le=1000)
+    shortlist: int = Field(default=200, ge=1, le=5000, description="Candidates taken from the index for exact rescoring.")
+
+class SearchHitOut(BaseModel):
+    resume_id: str
+    match_score: float = Field(..., ge=0.0, le=1.0)
+    baseline: BaselineOut
+
+class SearchResponse(BaseModel):
+    total: int
+    results: List[SearchHitOut]
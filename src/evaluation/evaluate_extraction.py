@@ -1,14 +1,23 @@
 from __future__ import annotations
 import argparse
+import asyncio
 import json
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+import httpx
 from rich import print
 
-from ..modeling.llm_extract import extract_with_llm
+from ..modeling.llm_extract import PROMPT_FINGERPRINT, close_async_client, extract_with_usage_async, model_name
+from ..features.skill_taxonomy import get_skill_taxonomy
+from ..modeling.skill_extract import EXTRACTORS, combine, dictionary_extraction, needs_llm
+from ..utils.config import settings
 from ..utils.text import normalize_token
 
 FIELDS = ["skills","tools","requirements"]
+RUN_FORMAT_VERSION = 1
 
 def _set(x: List[str]) -> set[str]:
     return set(normalize_token(i) for i in (x or []) if normalize_token(i))
@@ -22,70 +31,236 @@ def prf(gold: set[str], pred: set[str]) -> Tuple[float,float,float]:
     f1 = (2*precision*recall)/(precision+recall) if (precision+recall) else 0.0
     return precision, recall, f1
 
-def evaluate_file(path: Path) -> Dict:
-    obj = json.loads(path.read_text(encoding="utf-8"))
-    text = obj.get("job_text") or ""
-    gold_obj = obj.get("gold") or {}
-    gold = {f: _set(gold_obj.get(f, [])) for f in FIELDS}
+@dataclass
+class Sample:
+    id: str
+    text: str
+    gold: Dict[str, set[str]]
 
-    pred_struct = extract_with_llm(text)
-    if pred_struct is None:
-        raise RuntimeError("LLM extraction disabled. Set LLM_PROVIDER in .env to run evaluation.")
+@dataclass
+class Prediction:
+    """One recorded extraction; `fields` is None when the call failed.
 
-    pred = {
-        "skills": _set(pred_struct.skills),
-        "tools": _set(pred_struct.tools),
-        "requirements": _set(pred_struct.requirements),
-    }
+    `llm_called` is False when the dictionary alone produced the fields (see `skill_extract`).
+    """
+    id: str
+    fields: Optional[Dict[str, List[str]]]
+    latency_s: float
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached: bool = False
+    error: Optional[str] = None
+    llm_called: bool = True
 
-    per={}
-    for f in FIELDS:
-        p,r,f1 = prf(gold[f], pred[f])
-        per[f]={"precision":p,"recall":r,"f1":f1,"gold_n":len(gold[f]),"pred_n":len(pred[f])}
-    return {"id": obj.get("id", path.stem), "per_field": per}
+@dataclass
+class EvalRun:
+    """Predictions plus what produced them, so metrics can be recomputed without the LLM."""
+    provider: str
+    model: str
+    prompt_fingerprint: str
+    wall_s: float
+    predictions: List[Prediction] = field(default_factory=list)
+    extractor: str = "llm"
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--labeled_dir", type=str, required=True)
-    args = ap.parse_args()
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        obj = {"format_version": RUN_FORMAT_VERSION, **asdict(self)}
+        path.write_text(json.dumps(obj, indent=2), encoding="utf-8")
 
-    labeled_dir = Path(args.labeled_dir)
+    @classmethod
+    def load(cls, path: Path) -> "EvalRun":
+        obj = json.loads(path.read_text(encoding="utf-8"))
+        if obj.pop("format_version", None) != RUN_FORMAT_VERSION:
+            raise ValueError(f"Unsupported run file format: {path}")
+        preds = [Prediction(**p) for p in obj.pop("predictions")]
+        return cls(predictions=preds, **obj)
+
+def load_sample(path: Path) -> Sample:
+    obj = json.loads(path.read_text(encoding="utf-8"))
+    gold_obj = obj.get("gold") or {}
+    return Sample(
+        id=obj.get("id", path.stem),
+        text=obj.get("job_text") or "",
+        gold={f: _set(gold_obj.get(f, [])) for f in FIELDS},
+    )
+
+def load_samples(labeled_dir: Path) -> List[Sample]:
     files = sorted(labeled_dir.glob("*.json"))
     if not files:
         raise SystemExit(f"No .json files found in {labeled_dir}")
+    return [load_sample(f) for f in files]
+
+async def predict(
+    samples: List[Sample], concurrency: int = 4, use_cache: bool = False,
+    client: Optional[httpx.AsyncClient] = None, extractor: str = "llm",
+) -> EvalRun:
+    """Extract every sample exactly once, at most `concurrency` calls in flight.
 
-    results = [evaluate_file(f) for f in files]
+    `extractor` is one of `skill_extract.EXTRACTORS`; "dictionary" needs no LLM provider.
+    """
+    if extractor not in EXTRACTORS:
+        raise ValueError(f"Unknown extractor {extractor!r}")
+    if extractor != "dictionary" and not settings.llm_provider:
+        raise RuntimeError("LLM extraction disabled. Set LLM_PROVIDER in .env to run evaluation.")
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def one(s: Sample) -> Prediction:
+        t0 = time.perf_counter()
+        found = dictionary_extraction(s.text) if extractor != "llm" else None
+        if not needs_llm(found, extractor):
+            result, _ = combine(found, None)
+            fields = asdict(result) if result else {f: [] for f in FIELDS}
+            return Prediction(id=s.id, fields=fields, latency_s=time.perf_counter() - t0, llm_called=False)
+        async with sem:
+            try:
+                llm, usage = await extract_with_usage_async(s.text, client=client, use_cache=use_cache)
+            except Exception as e:
+                return Prediction(id=s.id, fields=None, latency_s=time.perf_counter() - t0, error=f"{type(e).__name__}: {e}")
+            result, _ = combine(found, llm)
+            return Prediction(
+                id=s.id, fields=asdict(result), latency_s=time.perf_counter() - t0,
+                prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens, cached=usage.cached,
+            )
+
+    t0 = time.perf_counter()
+    try:
+        preds = await asyncio.gather(*(one(s) for s in samples))
+    finally:
+        if client is None:
+            await close_async_client()
+    provider = settings.llm_provider or "none"
+    if settings.llm_provider:
+        model = model_name(provider)
+    else:
+        taxonomy = get_skill_taxonomy()
+        model = f"taxonomy-{taxonomy.version}" if taxonomy else "taxonomy"
+    return EvalRun(
+        provider=provider, model=model,
+        prompt_fingerprint=PROMPT_FINGERPRINT, wall_s=time.perf_counter() - t0, predictions=list(preds),
+        extractor=extractor,
+    )
 
-    # micro-average across all samples
+def _percentile(xs: List[float], q: float) -> float:
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(round(q * (len(xs) - 1))))] if xs else 0.0
+
+def score(samples: List[Sample], run: EvalRun) -> Dict:
+    """Per-sample, micro- and macro-averaged P/R/F1 plus latency/token stats, all from `run`."""
+    preds = {p.id: p for p in run.predictions}
     totals = {f: {"tp":0,"fp":0,"fn":0} for f in FIELDS}
-    for fpath in files:
-        obj = json.loads(fpath.read_text(encoding="utf-8"))
-        text = obj.get("job_text") or ""
-        gold_obj = obj.get("gold") or {}
-        gold = {f: _set(gold_obj.get(f, [])) for f in FIELDS}
-        pred_struct = extract_with_llm(text)
-        pred = {
-            "skills": _set(pred_struct.skills),
-            "tools": _set(pred_struct.tools),
-            "requirements": _set(pred_struct.requirements),
-        }
-        for fld in FIELDS:
-            g, pset = gold[fld], pred[fld]
-            totals[fld]["tp"] += len(g & pset)
-            totals[fld]["fp"] += len(pset - g)
-            totals[fld]["fn"] += len(g - pset)
+    per_sample, errors, missing = [], [], []
+    for s in samples:
+        p = preds.get(s.id)
+        if p is None:
+            missing.append(s.id)
+            continue
+        if p.fields is None:
+            errors.append({"id": s.id, "error": p.error})
+            continue
+        per={}
+        for f in FIELDS:
+            g, pset = s.gold[f], _set(p.fields.get(f, []))
+            totals[f]["tp"] += len(g & pset)
+            totals[f]["fp"] += len(pset - g)
+            totals[f]["fn"] += len(g - pset)
+            pr,rc,f1 = prf(g, pset)
+            per[f]={"precision":pr,"recall":rc,"f1":f1,"gold_n":len(g),"pred_n":len(pset)}
+        per_sample.append({"id": s.id, "per_field": per})
+
+    micro, macro = {}, {}
+    for f in FIELDS:
+        tp, fp, fn = totals[f]["tp"], totals[f]["fp"], totals[f]["fn"]
+        precision = tp/(tp+fp) if (tp+fp) else 0.0
+        recall = tp/(tp+fn) if (tp+fn) else 0.0
+        f1 = (2*precision*recall)/(precision+recall) if (precision+recall) else 0.0
+        micro[f] = {"precision":precision,"recall":recall,"f1":f1,"tp":tp,"fp":fp,"fn":fn}
+        rows = [r["per_field"][f] for r in per_sample]
+        macro[f] = {k: (statistics.fmean(r[k] for r in rows) if rows else 0.0) for k in ("precision","recall","f1")}
+
+    called = [p for p in run.predictions if p.llm_called and not p.cached]
+    lat = [p.latency_s for p in called]
+    completion = sum(p.completion_tokens for p in called)
+    perf = {
+        "n_calls": len(called),
+        "n_cached": sum(1 for p in run.predictions if p.llm_called and p.cached),
+        "n_dictionary_only": sum(1 for p in run.predictions if not p.llm_called),
+        "wall_s": run.wall_s,
+        "latency_mean_s": statistics.fmean(lat) if lat else 0.0,
+        "latency_p50_s": _percentile(lat, 0.5),
+        "latency_p95_s": _percentile(lat, 0.95),
+        "latency_max_s": max(lat) if lat else 0.0,
+        "prompt_tokens": sum(p.prompt_tokens for p in called),
+        "completion_tokens": completion,
+        # per-call decode speed and end-to-end throughput with calls overlapping
+        "completion_tokens_per_s": completion / sum(lat) if sum(lat) else 0.0,
+        "completion_tokens_per_wall_s": completion / run.wall_s if run.wall_s else 0.0,
+    }
+    return {
+        "provider": run.provider, "model": run.model, "extractor": run.extractor,
+        "per_sample": per_sample, "micro": micro, "macro": macro, "perf": perf,
+        "errors": errors, "missing": missing,
+    }
 
+def evaluate_file(path: Path) -> Dict:
+    """Score a single labeled file (one LLM call)."""
+    sample = load_sample(path)
+    run = asyncio.run(predict([sample], concurrency=1, use_cache=True))
+    report = score([sample], run)
+    if report["errors"]:
+        raise RuntimeError(report["errors"][0]["error"])
+    return report["per_sample"][0]
+
+def _print_report(report: Dict) -> None:
     print("[bold]\nPer-sample results[/bold]")
-    for r in results:
+    for r in report["per_sample"]:
         print(f"- {r['id']}: {r['per_field']}")
+    for e in report["errors"]:
+        print(f"[red]- {e['id']}: {e['error']}[/red]")
+    if report["missing"]:
+        print(f"[yellow]No prediction recorded for: {', '.join(report['missing'])}[/yellow]")
 
     print("[bold]\nMicro-average[/bold]")
-    for fld in FIELDS:
-        tp, fp, fn = totals[fld]["tp"], totals[fld]["fp"], totals[fld]["fn"]
-        precision = tp/(tp+fp) if (tp+fp) else 0.0
-        recall = tp/(tp+fn) if (tp+fn) else 0.0
-        f1 = (2*precision*recall)/(precision+recall) if (precision+recall) else 0.0
-        print(f"{fld}: precision={precision:.3f} recall={recall:.3f} f1={f1:.3f} (tp={tp} fp={fp} fn={fn})")
+    for fld, m in report["micro"].items():
+        print(f"{fld}: precision={m['precision']:.3f} recall={m['recall']:.3f} f1={m['f1']:.3f} (tp={m['tp']} fp={m['fp']} fn={m['fn']})")
+    print("[bold]\nMacro-average[/bold]")
+    for fld, m in report["macro"].items():
+        print(f"{fld}: precision={m['precision']:.3f} recall={m['recall']:.3f} f1={m['f1']:.3f}")
+
+    p = report["perf"]
+    print("[bold]\nLatency / throughput[/bold]")
+    print(f"extractor={report['extractor']} calls={p['n_calls']} cached={p['n_cached']} "
+          f"dictionary_only={p['n_dictionary_only']} wall={p['wall_s']:.2f}s")
+    print(f"latency mean={p['latency_mean_s']:.2f}s p50={p['latency_p50_s']:.2f}s p95={p['latency_p95_s']:.2f}s max={p['latency_max_s']:.2f}s")
+    print(f"tokens prompt={p['prompt_tokens']} completion={p['completion_tokens']} "
+          f"({p['completion_tokens_per_s']:.1f} tok/s per call, {p['completion_tokens_per_wall_s']:.1f} tok/s overall)")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--labeled_dir", type=str, required=True)
+    ap.add_argument("--concurrency", type=int, default=4, help="Max LLM calls in flight.")
+    ap.add_argument("--record", type=str, default=None, help="Write predictions to this run file.")
+    ap.add_argument("--replay", type=str, default=None, help="Score a recorded run file; no LLM calls.")
+    ap.add_argument("--use-cache", action="store_true", help="Allow extraction cache hits (skews latency).")
+    ap.add_argument("--json", type=str, default=None, help="Also write the full report as JSON.")
+    ap.add_argument("--extractor", choices=EXTRACTORS, default="llm",
+                    help="llm, dictionary (taxonomy only, no LLM calls) or hybrid.")
+    args = ap.parse_args()
+
+    samples = load_samples(Path(args.labeled_dir))
+    if args.replay:
+        run = EvalRun.load(Path(args.replay))
+        if run.prompt_fingerprint != PROMPT_FINGERPRINT:
+            print("[yellow]Run file was recorded with a different prompt version.[/yellow]")
+    else:
+        run = asyncio.run(predict(samples, concurrency=args.concurrency, use_cache=args.use_cache, extractor=args.extractor))
+        if args.record:
+            run.save(Path(args.record))
+            print(f"Recorded {len(run.predictions)} predictions to {args.record}")
+
+    report = score(samples, run)
+    _print_report(report)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,62 @@
+"""Fit the TF-IDF vocabulary/IDF on a corpus of JDs and resumes and save it as an artifact.
+
+Usage:
+    python -m src.features.build_tfidf --corpus data/raw data/labeled --out artifacts/tfidf
+"""
+from __future__ import annotations
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Iterator
+from rich import print
+
+from ..ingestion.load_resume import load_text_from_file
+from ..preprocessing.clean_text import clean_text
+from .tfidf_features import _new_vectorizer, save_tfidf_artifact
+
+TEXT_SUFFIXES = {".txt", ".md", ".pdf"}
+TEXT_KEYS = ("resume_text", "job_text")
+
+def _texts_from_obj(obj: dict) -> Iterator[str]:
+    for k in TEXT_KEYS:
+        if obj.get(k):
+            yield obj[k]
+
+def iter_corpus(paths: list[str]) -> Iterator[str]:
+    """Yield raw texts from .txt/.md/.pdf files and from .json/.jsonl records (resume_text/job_text)."""
+    for root in paths:
+        p = Path(root)
+        files = sorted(f for f in p.rglob("*") if f.is_file()) if p.is_dir() else [p]
+        for f in files:
+            suffix = f.suffix.lower()
+            if suffix in TEXT_SUFFIXES:
+                yield load_text_from_file(str(f))
+            elif suffix == ".json":
+                yield from _texts_from_obj(json.loads(f.read_text(encoding="utf-8")))
+            elif suffix == ".jsonl":
+                with f.open(encoding="utf-8") as fh:
+                    for line in fh:
+                        if line.strip():
+                            yield from _texts_from_obj(json.loads(line))
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", nargs="+", required=True, help="Files or directories with JDs and resumes")
+    ap.add_argument("--out", type=str, default="artifacts/tfidf")
+    ap.add_argument("--version", type=str, default=None, help="Artifact version (default: UTC timestamp)")
+    args = ap.parse_args()
+
+    docs = [clean_text(t) for t in iter_corpus(args.corpus)]
+    docs = [d for d in docs if d]
+    if not docs:
+        raise SystemExit(f"No documents found in {args.corpus}")
+
+    vec = _new_vectorizer()
+    vec.fit(docs)
+    version = args.version or time.strftime("%Y%m%d-%H%M%S", time.gmtime())
+    target = save_tfidf_artifact(vec, args.out, version=version, n_docs=len(docs))
+    print(f"[bold]Saved TF-IDF artifact[/bold] {target} ({len(docs)} docs, {len(vec.vocabulary_)} terms)")
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,21 @@
 from __future__ import annotations
-from rapidfuzz import fuzz
-from ..utils.text import normalize_token, tokens, unique_preserve_order
+import numpy as np
+from ..preprocessing.document import TextLike, as_document
+from ..utils.metrics import timed
+from ..utils.text import normalize_token
 
-STOPWORDS = set([
+STOPWORDS = frozenset([
     "and","or","the","a","an","to","of","in","for","with","on","as","at","by","from",
     "is","are","be","this","that","it","we","you","your","our","their","they",
     "experience","years","year","role","responsibilities","required","preferred",
 ])
 
-def extract_keywords(text: str, min_len: int = 3) -> list[str]:
-    toks=[t for t in tokens(text) if len(t) >= min_len]
-    toks=[t for t in toks if t not in STOPWORDS]
-    return unique_preserve_order(toks)
+@timed("extract_keywords")
+def extract_keywords(text: TextLike, min_len: int = 3) -> list[str]:
+    return as_document(text).keywords(min_len, STOPWORDS)
 
 def fuzzy_contains(haystack: str, needle: str, threshold: int = 90) -> bool:
+    from rapidfuzz import fuzz  # imported on first fuzzy match, keeps cold start light
     h = normalize_token(haystack)
     n = normalize_token(needle)
     if not h or not n:
@@ -24,3 +26,46 @@ def fuzzy_contains(haystack: str, needle: str, threshold: int = 90) -> bool:
     # fuzzy match against sliding windows of tokens
     # (simple and fast enough for portfolio-scale inputs)
     return fuzz.partial_ratio(h, n) >= threshold
+
+class KeywordMatcher:
+    """Match many keywords against one haystack; same results as repeated `fuzzy_contains`.
+
+    The haystack's normalized form comes from its `Document`, so it is built once per text.
+    Exact substring hits are checked first (any n-gram hit is also a substring hit, and a
+    substring scan is far cheaper than building an n-gram set); the remaining keywords are
+    scored together in one batched `process.cdist` call with a score cutoff.
+    """
+
+    def __init__(self, haystack: TextLike):
+        self.haystack = as_document(haystack).normalized
+
+    def contains_many(self, needles: list[str], threshold: int = 90) -> list[bool]:
+        h = self.haystack
+        norm = [normalize_token(n) for n in needles]
+        out = [False] * len(norm)
+        if not h:
+            return out
+        pending = []
+        for i, n in enumerate(norm):
+            if not n:
+                continue
+            if n in h:
+                out[i] = True
+            else:
+                pending.append(i)
+        if pending:
+            # partial_ratio against the whole haystack (not per n-gram window) keeps the
+            # alignment semantics of fuzzy_contains and is the faster batched form.
+            from rapidfuzz import fuzz, process
+            scores = process.cdist([norm[i] for i in pending], [h], scorer=fuzz.partial_ratio, score_cutoff=threshold, dtype=np.uint8)
+            for i, score in zip(pending, scores[:, 0]):
+                out[i] = bool(score >= threshold)
+        return out
+
+    @timed("keyword_match")
+    def split(self, keywords: list[str], threshold: int = 90) -> tuple[list[str], list[str]]:
+        """Return (matched, missing) preserving keyword order."""
+        hits = self.contains_many(keywords, threshold=threshold)
+        matched = [k for k, hit in zip(keywords, hits) if hit]
+        missing = [k for k, hit in zip(keywords, hits) if not hit]
+        return matched, missing
@@ -0,0 +1,69 @@
+from __future__ import annotations
+import heapq
+from collections import Counter
+from typing import Optional
+import numpy as np
+
+from ..preprocessing.document import Document, TextLike, as_document
+from ..utils.metrics import timed
+from .keyword_extractor import STOPWORDS
+
+class LightTfidf:
+    """NumPy-only TF-IDF + cosine similarity, fit on the texts being compared.
+
+    Follows the settings of the sklearn engine (1-2-grams, smooth IDF, L2 norm,
+    `max_features` by corpus frequency) but tokenizes with the project's `tokens()` (via
+    `Document`) and `STOPWORDS`, so scores are close to, not identical with, `TfidfSimilarity`.
+    Importing and running it never loads sklearn or scipy.
+    """
+
+    prefitted = False
+    version: Optional[str] = None
+
+    def __init__(self, max_features: int = 5000, bigrams: bool = True, min_len: int = 2):
+        self.max_features = max_features
+        self.bigrams = bigrams
+        self.min_len = min_len
+
+    def _terms(self, doc: Document) -> list[str]:
+        toks = [t for t in doc.tokens if len(t) >= self.min_len and t not in STOPWORDS]
+        if self.bigrams:
+            return toks + [f"{a} {b}" for a, b in zip(toks, toks[1:])]
+        return toks
+
+    def _fit_transform(self, texts: list[TextLike]) -> tuple[list[tuple[np.ndarray, np.ndarray]], int]:
+        """L2-normalized TF-IDF rows as (term ids, weights) pairs, plus the vocabulary size."""
+        counts = [Counter(self._terms(as_document(t))) for t in texts]
+        df: Counter = Counter()
+        total: Counter = Counter()
+        for c in counts:
+            df.update(c.keys())
+            total.update(c)
+        terms = list(df)
+        if len(terms) > self.max_features:
+            terms = heapq.nlargest(self.max_features, terms, key=total.__getitem__)
+        index = {t: i for i, t in enumerate(terms)}
+        n = len(texts)
+        idf = np.log((1.0 + n) / (1.0 + np.array([df[t] for t in terms], dtype=np.float64))) + 1.0
+
+        rows = []
+        for c in counts:
+            pairs = [(index[t], v) for t, v in c.items() if t in index]
+            ids = np.fromiter((i for i, _ in pairs), dtype=np.int64, count=len(pairs))
+            w = np.fromiter((v for _, v in pairs), dtype=np.float64, count=len(pairs)) * idf[ids]
+            norm = np.linalg.norm(w)
+            rows.append((ids, w / norm if norm else w))
+        return rows, len(terms)
+
+    def score(self, a: TextLike, b: TextLike) -> float:
+        return self.score_many(a, [b])[0]
+
+    @timed("tfidf")
+    def score_many(self, query: TextLike, docs: list[TextLike]) -> list[float]:
+        """Score `query` against every doc; the query row is densified once and dotted with each doc."""
+        if not docs:
+            return []
+        rows, n_terms = self._fit_transform([query] + list(docs))
+        q = np.zeros(n_terms, dtype=np.float64)
+        q[rows[0][0]] = rows[0][1]
+        return [float(q[ids] @ w) if len(ids) else 0.0 for ids, w in rows[1:]]
@@ -0,0 +1,124 @@
+"""MinHash signatures and a banded LSH index for near-duplicate text detection.
+
+A text's set of word shingles (`shingle_size` consecutive words of the lowercased, cleaned
+text) is summarized by `num_perm` minimum hash values; the share of equal positions in two
+signatures estimates the Jaccard similarity of the shingle sets. `MinHashLSH` splits each
+signature into `bands` bands of `rows` values and files the key under one bucket per band, so
+a query only looks at keys sharing at least one whole band: lookup cost depends on the number
+of near-duplicates, not on the number of stored texts.
+"""
+from __future__ import annotations
+import zlib
+from typing import Dict, Iterable, Union
+
+import numpy as np
+
+_MERSENNE = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+def shingles(text: str, size: int = 5) -> set[str]:
+    """Distinct runs of `size` words; a text shorter than that is one shingle."""
+    words = text.lower().split()
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+class MinHasher:
+    """`num_perm` universal hash functions (a*x + b mod 2^61-1) over CRC32 shingle hashes.
+
+    Hashes are stable across processes for a given `seed`, so signatures can be persisted.
+    """
+
+    def __init__(self, num_perm: int = 128, seed: int = 1, shingle_size: int = 5):
+        self.num_perm = num_perm
+        self.seed = seed
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MERSENNE, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text_or_shingles: Union[str, Iterable[str]]) -> np.ndarray:
+        """uint32 signature of a text (shingled here) or of a precomputed shingle set."""
+        items = shingles(text_or_shingles, self.shingle_size) if isinstance(text_or_shingles, str) else text_or_shingles
+        hv = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in items), dtype=np.uint64)
+        if not hv.size:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        # uint64 products wrap around; still a fine hash family (same trick as datasketch)
+        perm = (np.outer(hv, self._a) + self._b) % _MERSENNE & _MAX_HASH
+        return perm.min(axis=0).astype(np.uint32)
+
+def jaccard(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+def lsh_params(threshold: float, num_perm: int) -> tuple[int, int]:
+    """(bands, rows) minimizing the false positive + false negative areas around `threshold`.
+
+    A pair with similarity s becomes a candidate with probability 1 - (1 - s^rows)^bands.
+    """
+    s = np.linspace(0.0, 1.0, 401)
+    best, best_err = (1, num_perm), float("inf")
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        p = 1.0 - (1.0 - s ** rows) ** bands
+        below = s < threshold
+        err = (p[below].sum() + (1.0 - p[~below]).sum()) / len(s)
+        if err < best_err:
+            best, best_err = (bands, rows), err
+    return best
+
+class MinHashLSH:
+    """In-memory band buckets mapping int keys to signatures; no signatures are kept here.
+
+    A bucket holds a bare int for its (typical) single key and a list only on collisions,
+    which keeps the index at roughly one dict entry per band per key.
+    """
+
+    def __init__(self, num_perm: int = 128, threshold: float = 0.85):
+        self.num_perm = num_perm
+        self.threshold = threshold
+        self.bands, self.rows = lsh_params(threshold, num_perm)
+        self._buckets: list[Dict[int, Union[int, list[int]]]] = [{} for _ in range(self.bands)]
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _band_hashes(self, sig: np.ndarray) -> list[int]:
+        r = self.rows
+        return [hash(sig[i * r:(i + 1) * r].tobytes()) for i in range(self.bands)]
+
+    def insert(self, key: int, sig: np.ndarray) -> None:
+        self._count += 1
+        for bucket, h in zip(self._buckets, self._band_hashes(sig)):
+            v = bucket.get(h)
+            if v is None:
+                bucket[h] = key
+            elif isinstance(v, list):
+                v.append(key)
+            else:
+                bucket[h] = [v, key]
+
+    def remove(self, key: int, sig: np.ndarray) -> None:
+        self._count -= 1
+        for bucket, h in zip(self._buckets, self._band_hashes(sig)):
+            v = bucket.get(h)
+            if v == key:
+                del bucket[h]
+            elif isinstance(v, list) and key in v:
+                v.remove(key)
+                if len(v) == 1:
+                    bucket[h] = v[0]
+
+    def candidates(self, sig: np.ndarray) -> set[int]:
+        """Keys sharing at least one band with `sig` (verify with `jaccard` before use)."""
+        out: set[int] = set()
+        for bucket, h in zip(self._buckets, self._band_hashes(sig)):
+            v = bucket.get(h)
+            if v is None:
+                continue
+            if isinstance(v, list):
+                out.update(v)
+            else:
+                out.add(v)
+        return out
@@ -0,0 +1,129 @@
+from __future__ import annotations
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from ..preprocessing.document import TextLike, as_document
+from ..utils.config import settings
+from ..utils.text import normalize_token
+
+log = logging.getLogger("taxonomy")
+
+CATEGORIES = ("skill", "tool")
+
+# Characters that continue a word: a match must not start or end inside one
+# ("java" in "javascript", "c" in "c++").
+_WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789+#")
+
+@dataclass(frozen=True)
+class Skill:
+    name: str
+    category: str
+    aliases: tuple[str, ...] = ()
+
+@dataclass(frozen=True)
+class SkillMatch:
+    start: int
+    end: int
+    skill: Skill
+
+class SkillTaxonomy:
+    """Canonical skills/tools and their aliases, compiled into one Aho-Corasick automaton.
+
+    `find` scans the normalized text (lowercase, single spaces) once, character by
+    character, whatever the number of patterns; overlapping matches are resolved
+    leftmost-longest, so "machine learning engineer" yields "machine learning", not "ml".
+    """
+
+    def __init__(self, skills: Iterable[Skill], version: Optional[str] = None):
+        self.skills = list(skills)
+        self.version = version
+        self._goto: list[Dict[str, int]] = [{}]
+        self._out: list[list[tuple[int, int]]] = [[]]  # state -> (pattern length, skill index)
+        for i, s in enumerate(self.skills):
+            if s.category not in CATEGORIES:
+                raise ValueError(f"Unknown category {s.category!r} for skill {s.name!r}")
+            for alias in dict.fromkeys(normalize_token(a) for a in (s.name, *s.aliases)):
+                if alias:
+                    self._add(alias, i)
+        self._fail = self._link()
+
+    def _add(self, pattern: str, skill: int) -> None:
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = self._goto[state][ch] = len(self._goto)
+                self._goto.append({})
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(pattern), skill))
+
+    def _link(self) -> list[int]:
+        """Breadth-first failure links; each state's outputs include those of its fail state."""
+        fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                f = fail[state]
+                while f and ch not in self._goto[f]:
+                    f = fail[f]
+                fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[fail[nxt]]
+                queue.append(nxt)
+        return fail
+
+    @classmethod
+    def load(cls, path: str | Path) -> "SkillTaxonomy":
+        obj = json.loads(Path(path).read_text(encoding="utf-8"))
+        skills = [
+            Skill(name=normalize_token(s["name"]), category=s.get("category", "skill"), aliases=tuple(s.get("aliases", ())))
+            for s in obj["skills"]
+        ]
+        return cls(skills, version=obj.get("version"))
+
+    def find(self, text: TextLike) -> list[SkillMatch]:
+        """Whole-word, non-overlapping matches in `Document.normalized` order."""
+        hay = as_document(text).normalized
+        goto, fail, out = self._goto, self._fail, self._out
+        hits: list[tuple[int, int, int]] = []
+        state, n = 0, len(hay)
+        for i, ch in enumerate(hay):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            if end < n and hay[end] in _WORD_CHARS:
+                continue
+            for length, skill in out[state]:
+                start = end - length
+                if start == 0 or hay[start - 1] not in _WORD_CHARS:
+                    hits.append((start, -length, skill))
+
+        matches, last_end = [], 0
+        for start, neg_len, skill in sorted(hits):
+            if start >= last_end:
+                matches.append(SkillMatch(start, start - neg_len, self.skills[skill]))
+                last_end = start - neg_len
+        return matches
+
+    def extract(self, text: TextLike) -> Dict[str, list[str]]:
+        """Canonical names per category ("skills", "tools"), in order of first mention."""
+        found = dict.fromkeys(m.skill for m in self.find(text))
+        return {f"{c}s": [s.name for s in found if s.category == c] for c in CATEGORIES}
+
+@lru_cache(maxsize=1)
+def get_skill_taxonomy() -> Optional[SkillTaxonomy]:
+    """Load the configured taxonomy once per process; None if it is not available."""
+    path = settings.skill_taxonomy_path
+    if not path or not Path(path).exists():
+        log.warning("No skill taxonomy at %s; dictionary extraction disabled", path)
+        return None
+    return SkillTaxonomy.load(path)
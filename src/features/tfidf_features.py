@@ -1,24 +1,240 @@
 from __future__ import annotations
+import hashlib
+import json
+import logging
+import time
+import zlib
+from collections.abc import Mapping
 from dataclasses import dataclass
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from ..preprocessing.clean_text import clean_text
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Union
+import numpy as np
+from ..preprocessing.document import TextLike, as_document
+from ..utils.config import settings
+from ..utils.metrics import timed
+
+if TYPE_CHECKING:  # sklearn is imported on first use, not at startup
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from .light_tfidf import LightTfidf
+
+log = logging.getLogger("tfidf")
+
+VECTORIZER_PARAMS: Dict[str, Any] = {
+    "lowercase": True,
+    "ngram_range": (1,2),
+    "max_features": 5000,
+    "stop_words": "english",
+}
+
+# Bump when the on-disk layout written by save_tfidf_artifact changes.
+ARTIFACT_FORMAT_VERSION = 1
+
+def _term_hash(term: bytes) -> int:
+    return zlib.crc32(term)  # collisions are resolved by comparing the term bytes
+
+def _term_index(blob: Any, offsets: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(sorted term hashes, feature index of each) for `TermVocabulary` lookups."""
+    hashes = np.fromiter(
+        (_term_hash(bytes(blob[offsets[i]:offsets[i + 1]])) for i in range(len(offsets) - 1)),
+        dtype=np.uint32, count=len(offsets) - 1,
+    )
+    order = np.argsort(hashes, kind="stable")
+    return hashes[order], order.astype(np.int64)
+
+class TermVocabulary(Mapping):
+    """Read-only term -> feature index mapping over a memory-mapped artifact vocabulary.
+
+    A term is found by binary search of its hash in the sorted hash array and checked against
+    its bytes in terms.bin, so nothing is decoded up front and the vocabulary stays in the
+    page cache. Recent lookups (including misses) are kept in a bounded dict, since
+    `transform` looks the same common terms up again and again.
+    """
+
+    CACHE_ITEMS = 65_536
+
+    def __init__(self, blob: Any, offsets: np.ndarray, hashes: np.ndarray, order: np.ndarray):
+        # views of the memmaps (no copy): slicing a memoryview, or indexing a plain ndarray,
+        # is much cheaper than going through the memmap subclass
+        self._blob = memoryview(np.asarray(blob))
+        self._offsets, self._hashes, self._order = np.asarray(offsets), np.asarray(hashes), np.asarray(order)
+        self._cache: Dict[str, int] = {}
+
+    def _bytes(self, i: int) -> memoryview:
+        return self._blob[int(self._offsets[i]):int(self._offsets[i + 1])]
+
+    def _find(self, term: str) -> int:
+        raw = term.encode("utf-8")
+        h = np.uint32(_term_hash(raw))
+        pos = int(self._hashes.searchsorted(h))
+        while pos < len(self._hashes) and self._hashes[pos] == h:
+            i = int(self._order[pos])
+            if self._bytes(i) == raw:
+                return i
+            pos += 1
+        return -1
+
+    def __getitem__(self, term: str) -> int:
+        i = self._cache.get(term)
+        if i is None:
+            if len(self._cache) >= self.CACHE_ITEMS:
+                self._cache.clear()
+            i = self._cache[term] = self._find(term)
+        if i < 0:
+            raise KeyError(term)
+        return i
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._bytes(i).tobytes().decode("utf-8") for i in range(len(self)))
 
 @dataclass
 class TfidfSimilarity:
     vectorizer: TfidfVectorizer
+    prefitted: bool = False
+    version: Optional[str] = None
 
-    def score(self, a: str, b: str) -> float:
-        a2, b2 = clean_text(a), clean_text(b)
-        X = self.vectorizer.fit_transform([a2, b2])
+    def _vectorize(self, texts: list[str]):
+        # A prefitted (corpus) model is read-only on the hot path; otherwise fit on the inputs.
+        if self.prefitted:
+            return self.vectorizer.transform(texts)
+        return self.vectorizer.fit_transform(texts)
+
+    def row(self, text: TextLike):
+        """(1 x n_terms) sparse row of a prefitted model, memoized on the `Document` per model version."""
+        doc = as_document(text)
+        return doc.derived(("tfidf", self.version), lambda: self.vectorizer.transform([doc.clean]))
+
+    def row_from_parts(self, indices: list[int], data: list[float]):
+        """Rebuild a row stored as its nonzero (indices, data), e.g. from a job profile."""
+        from scipy.sparse import csr_matrix
+        return csr_matrix(
+            (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32), [0, len(indices)]),
+            shape=(1, len(self.vectorizer.idf_)),
+        )
+
+    @timed("tfidf")
+    def score(self, a: TextLike, b: TextLike) -> float:
+        from sklearn.metrics.pairwise import cosine_similarity
+        if self.prefitted:
+            return float(cosine_similarity(self.row(a), self.row(b))[0][0])
+        X = self._vectorize([as_document(a).clean, as_document(b).clean])
         sim = cosine_similarity(X[0], X[1])[0][0]
         return float(sim)
 
-def default_tfidf() -> TfidfSimilarity:
-    vec = TfidfVectorizer(
-        lowercase=True,
-        ngram_range=(1,2),
-        max_features=5000,
-        stop_words="english"
-    )
-    return TfidfSimilarity(vectorizer=vec)
+    @timed("tfidf")
+    def score_many(self, query: TextLike, docs: list[TextLike]) -> list[float]:
+        """Score `query` against every doc with one vectorization and one sparse product."""
+        if not docs:
+            return []
+        from sklearn.metrics.pairwise import cosine_similarity
+        if self.prefitted:
+            sims = cosine_similarity(self.row(query), self._vectorize([as_document(d).clean for d in docs]))[0]
+            return [float(s) for s in sims]
+        X = self._vectorize([as_document(query).clean] + [as_document(d).clean for d in docs])
+        sims = cosine_similarity(X[0], X[1:])[0]
+        return [float(s) for s in sims]
+
+def _new_vectorizer(**params: Any) -> TfidfVectorizer:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    return TfidfVectorizer(**{**VECTORIZER_PARAMS, **params})
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+def save_tfidf_artifact(vectorizer: TfidfVectorizer, out_dir: str, version: str, n_docs: int) -> Path:
+    """Persist a fitted vectorizer as `<out_dir>/<version>/` and point `<out_dir>/LATEST` at it.
+
+    Layout (all arrays are plain .npy / raw bytes so they can be memory-mapped):
+    - terms.bin: UTF-8 terms joined back to back, sorted by feature index
+    - terms_offsets.npy: int64 offsets into terms.bin (n_terms + 1)
+    - terms_hash.npy / terms_order.npy: sorted uint32 term hashes (CRC32) and the feature index of
+      each, the lookup index of `TermVocabulary` (rebuilt on load when missing)
+    - idf.npy: float64 IDF weights
+    - manifest.json: format/model version, vectorizer params and file checksums
+    """
+    vocab = vectorizer.vocabulary_
+    terms = sorted(vocab, key=vocab.get)
+    encoded = [t.encode("utf-8") for t in terms]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+
+    root = Path(out_dir)
+    target = root / version
+    target.mkdir(parents=True, exist_ok=True)
+    (target / "terms.bin").write_bytes(b"".join(encoded))
+    np.save(target / "terms_offsets.npy", offsets)
+    hashes, order = _term_index(b"".join(encoded), offsets)
+    np.save(target / "terms_hash.npy", hashes)
+    np.save(target / "terms_order.npy", order)
+    np.save(target / "idf.npy", np.asarray(vectorizer.idf_, dtype=np.float64))
+
+    params = {k: vectorizer.get_params()[k] for k in VECTORIZER_PARAMS}
+    manifest = {
+        "format_version": ARTIFACT_FORMAT_VERSION,
+        "version": version,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "n_docs": n_docs,
+        "n_terms": len(terms),
+        "params": {**params, "ngram_range": list(params["ngram_range"])},
+        "files": {
+            f: _sha256(target / f) for f in ("terms.bin", "terms_offsets.npy", "terms_hash.npy", "terms_order.npy", "idf.npy")
+        },
+    }
+    (target / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    (root / "LATEST").write_text(version, encoding="utf-8")
+    return target
+
+def load_tfidf_artifact(path: str) -> TfidfSimilarity:
+    """Load an artifact directory (or an artifact root containing LATEST) as a prefitted model."""
+    p = Path(path)
+    if not (p / "manifest.json").exists() and (p / "LATEST").exists():
+        p = p / (p / "LATEST").read_text(encoding="utf-8").strip()
+    manifest = json.loads((p / "manifest.json").read_text(encoding="utf-8"))
+    if manifest.get("format_version") != ARTIFACT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported TF-IDF artifact format: {manifest.get('format_version')}")
+
+    blob = np.memmap(p / "terms.bin", dtype=np.uint8, mode="r") if (p / "terms.bin").stat().st_size else np.zeros(0, np.uint8)
+    offsets = np.load(p / "terms_offsets.npy", mmap_mode="r")
+    idf = np.load(p / "idf.npy", mmap_mode="r")
+    if (p / "terms_hash.npy").exists() and (p / "terms_order.npy").exists():
+        hashes, order = np.load(p / "terms_hash.npy", mmap_mode="r"), np.load(p / "terms_order.npy", mmap_mode="r")
+    else:  # artifacts saved before the lookup index was written
+        hashes, order = _term_index(blob, offsets)
+
+    params = dict(manifest["params"])
+    params["ngram_range"] = tuple(params["ngram_range"])
+    # The vocabulary is set as the fitted attribute, not the `vocabulary` parameter, which
+    # sklearn would copy into a dict of every term.
+    vec = _new_vectorizer(**params)
+    vec.vocabulary_ = TermVocabulary(blob, offsets, hashes, order)
+    vec.idf_ = np.asarray(idf)
+    vec.fixed_vocabulary_ = True
+    return TfidfSimilarity(vectorizer=vec, prefitted=True, version=manifest["version"])
+
+@lru_cache(maxsize=1)
+def load_default_tfidf() -> Optional[TfidfSimilarity]:
+    """Load the configured corpus artifact once per process; None if it is not available."""
+    path = settings.tfidf_artifact_dir
+    if not path or not Path(path).exists():
+        return None
+    try:
+        model = load_tfidf_artifact(path)
+    except Exception:
+        log.exception("Failed to load TF-IDF artifact from %s; falling back to per-request fit", path)
+        return None
+    log.info("Loaded TF-IDF artifact %s (%d terms)", model.version, len(model.vectorizer.vocabulary_))
+    return model
+
+def default_tfidf() -> Union[TfidfSimilarity, "LightTfidf"]:
+    """The scorer `baseline_compare` uses: TFIDF_ENGINE=light selects the NumPy engine
+    (no sklearn import); otherwise the corpus artifact, or a per-request sklearn fit."""
+    if settings.tfidf_engine == "light":
+        from .light_tfidf import LightTfidf
+        return LightTfidf()
+    prefitted = load_default_tfidf()
+    if prefitted is not None:
+        return prefitted
+    return TfidfSimilarity(vectorizer=_new_vectorizer())
@@ -1,32 +1,19 @@
 from __future__ import annotations
-import httpx
-from bs4 import BeautifulSoup
+from ..utils.metrics import timed
+from .html_extract import extract_job_text
+from .job_fetcher import DEFAULT_HEADERS, get_job_fetcher, html_to_text
 
-DEFAULT_HEADERS = {
-    "User-Agent": "jd-resume-analyzer/1.0 (+portfolio project)"
-}
+__all__ = ["DEFAULT_HEADERS", "extract_job_text", "fetch_job_text", "html_to_text"]
 
+@timed("fetch_job")
 def fetch_job_text(job_url: str, timeout_s: float = 20.0) -> str:
     """Fetch a job posting from a URL and return best-effort visible text.
 
-    This is intentionally simple (portfolio-grade). In production, you'd add:
+    Goes through the shared `JobFetcher` (connection pool, on-disk cache with
+    ETag/Last-Modified revalidation, per-host rate limiting, response size cap) and
+    keeps the posting itself (JSON-LD or the page without its boilerplate, see
+    `html_extract`). Still simple in places; in production, you'd add:
     - robots.txt compliance
-    - stronger boilerplate removal
-    - retries/backoff and caching
+    - retries/backoff
     """
-    if not job_url:
-        raise ValueError("job_url is required")
-
-    with httpx.Client(headers=DEFAULT_HEADERS, timeout=timeout_s, follow_redirects=True) as client:
-        resp = client.get(job_url)
-        resp.raise_for_status()
-
-    soup = BeautifulSoup(resp.text, "lxml")
-    # remove scripts/styles
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
-    text = soup.get_text("\n")
-    # collapse excessive blank lines
-    lines = [ln.strip() for ln in text.splitlines()]
-    lines = [ln for ln in lines if ln]
-    return "\n".join(lines)
+    return get_job_fetcher().fetch_text(job_url, timeout_s=timeout_s)
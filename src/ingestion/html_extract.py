@@ -0,0 +1,269 @@
+"""Job posting text from HTML: streamed, bounded, without the page's boilerplate.
+
+`extract_job_text` feeds the page to lxml's HTML parser in chunks with a callback target, so
+no tree is built, and stops at `max_bytes` (characters for str input). Text is collected
+into blocks split at block-level tags, then:
+
+- a JSON-LD `JobPosting` with a description wins outright (title, description and the
+  qualification fields); the parse stops as soon as one is complete, usually in `<head>`;
+- subtrees that are navigation, footers, cookie banners, sidebars, forms or hidden
+  (by tag, ARIA role or a whole word of a class/id) are dropped; `html`, `body`, `main` and
+  `article` never are;
+- of the rest, blocks with link density above `MAX_LINK_DENSITY` are dropped, blocks with at
+  least `GOOD_WORDS` words are kept, and shorter ones (headings, bullet lists) are kept when
+  their nearest long neighbor before or after is a kept block.
+
+When no block is long enough to judge by (tiny pages), every non-boilerplate block is kept.
+When the filtered text is under `GOOD_WORDS` words but the page has at least
+`MIN_FALLBACK_WORDS` without boilerplate detection, the page is re-read without it: a
+misjudged wrapper must not hide the whole posting.
+`job_fetcher.html_to_text` is the older whole-page `get_text` (JOB_HTML_EXTRACTOR=full).
+"""
+from __future__ import annotations
+import html as htmllib
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional, Union
+
+from ..utils.metrics import timed
+
+CHUNK = 16_384
+GOOD_WORDS = 8
+MAX_LINK_DENSITY = 0.4
+MIN_JSONLD_WORDS = 20
+MIN_FALLBACK_WORDS = 20
+
+SKIP_TAGS = frozenset({"script", "style", "noscript", "template", "svg", "iframe", "object", "canvas", "select", "option"})
+BOILERPLATE_TAGS = frozenset({"nav", "footer", "aside", "form", "dialog"})
+BOILERPLATE_ROLES = frozenset({"navigation", "contentinfo", "complementary", "dialog", "alertdialog", "search", "menu", "menubar"})
+BLOCK_TAGS = frozenset({
+    "html", "body", "main", "article", "section", "header", "div", "p", "ul", "ol", "li", "dl", "dt", "dd",
+    "h1", "h2", "h3", "h4", "h5", "h6", "table", "thead", "tbody", "tr", "td", "th", "blockquote", "pre",
+    "address", "figure", "figcaption", "br", "hr", "title",
+}) | BOILERPLATE_TAGS
+CONTENT_TAGS = frozenset({"html", "body", "main", "article"})  # page wrappers, never boilerplate
+SPACED_TAGS = frozenset({"span", "label", "time"})  # inline, but often laid out as separate chips
+# whole words of one class/id token, words separated by "-" or "_" ("site-footer", "footer__links")
+_BOILERPLATE_RE = re.compile(
+    r"(?:^|[-_])(?:cookies?|consent|gdpr|banner|navbar|nav|menu|breadcrumbs?|footer|sidebar|share|social|"
+    r"newsletter|subscribe|related|recommended|similar[-_]jobs|popup|modal|ads?|advert)(?:[-_]|$)",
+    re.I,
+)
+_STATE_RE = re.compile(r"^(?:is|has|with|no)[-_]", re.I)  # state modifiers: "has-sidebar" describes the page
+_HIDDEN_STYLE_RE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.I)
+_JOB_FIELDS = ("responsibilities", "qualifications", "skills", "experienceRequirements", "educationRequirements")
+
+@dataclass
+class Block:
+    text: str
+    link_chars: int = 0
+    boilerplate: bool = False
+
+    @property
+    def words(self) -> int:
+        return len(self.text.split())
+
+    @property
+    def link_density(self) -> float:
+        return self.link_chars / len(self.text) if self.text else 0.0
+
+def _is_boilerplate(tag: str, attrib: Any) -> bool:
+    if tag in CONTENT_TAGS:
+        return False
+    if tag in BOILERPLATE_TAGS:
+        return True
+    if not attrib:
+        return False
+    attrib = dict(attrib)  # lxml's attribute mapping is slow to query key by key
+    if "hidden" in attrib or attrib.get("aria-hidden") == "true":
+        return True
+    if (attrib.get("role") or "").lower() in BOILERPLATE_ROLES:
+        return True
+    if _HIDDEN_STYLE_RE.search(attrib.get("style") or ""):
+        return True
+    tokens = f"{attrib.get('class') or ''} {attrib.get('id') or ''}".split()
+    return any(_BOILERPLATE_RE.search(t) and not _STATE_RE.match(t) for t in tokens)
+
+class _Collector:
+    """lxml parser target: blocks of visible text plus the JSON-LD scripts, in document order."""
+
+    def __init__(self, detect_boilerplate: bool = True):
+        self.detect_boilerplate = detect_boilerplate
+        self.blocks: list[Block] = []
+        self.jsonld: list[str] = []
+        self.posting: Optional[str] = None  # text of the first usable JSON-LD JobPosting
+        self._stack: list[tuple[str, bool, bool, bool]] = []  # (tag, skip, boilerplate, link)
+        self._skip = self._boilerplate = self._link = 0
+        self._in_head = False
+        self._jsonld: Optional[list[str]] = None
+        self._text: list[str] = []
+        self._link_chars = 0
+
+    def _flush(self) -> None:
+        if self._text:
+            text = " ".join("".join(self._text).split())
+            if text:
+                self.blocks.append(Block(text, min(self._link_chars, len(text))))
+            self._text, self._link_chars = [], 0
+
+    def start(self, tag: str, attrib: Any) -> None:
+        if self._skip:
+            self._stack.append((tag, False, False, False))
+            return
+        if tag == "script" and attrib and (attrib.get("type") or "").lower() == "application/ld+json":
+            self._jsonld = []
+        skip = tag in SKIP_TAGS
+        boilerplate = self.detect_boilerplate and not skip and _is_boilerplate(tag, attrib)
+        link = tag == "a"
+        if tag in BLOCK_TAGS or boilerplate:
+            self._flush()
+        if tag == "head":
+            self._in_head = True
+        self._stack.append((tag, skip, boilerplate, link))
+        self._skip += skip
+        self._boilerplate += boilerplate
+        self._link += link
+
+    def end(self, tag: str) -> None:
+        if not self._stack:
+            return
+        _, skip, boilerplate, link = self._stack.pop()
+        if skip:
+            self._skip -= 1
+            if self._jsonld is not None:
+                self.jsonld.append("".join(self._jsonld))
+                self._jsonld = None
+        self._link -= link
+        if tag in BLOCK_TAGS or boilerplate:
+            self._flush()
+        elif tag in SPACED_TAGS and self._text:
+            self._text.append(" ")
+        if boilerplate:
+            self._boilerplate -= 1
+            if not self._boilerplate:
+                self.blocks.append(Block("", boilerplate=True))  # separates kept content, see `_select`
+        if tag == "head":
+            self._in_head = False
+
+    def data(self, text: str) -> None:
+        if self._jsonld is not None:
+            self._jsonld.append(text)
+        elif not (self._skip or self._boilerplate or self._in_head):
+            self._text.append(text)
+            if self._link:
+                self._link_chars += len(text.strip())
+
+    def comment(self, text: str) -> None:
+        pass
+
+    def close(self) -> None:
+        self._flush()
+
+def _parse(html: Union[str, bytes], max_bytes: Optional[int], collector: _Collector, stop_on_jsonld: bool = False) -> None:
+    from lxml import etree  # imported on first extraction, keeps cold start light
+    parser = etree.HTMLParser(target=collector)
+    end = len(html) if max_bytes is None else min(len(html), max_bytes)
+    seen = 0
+    for i in range(0, end, CHUNK):
+        parser.feed(html[i:min(i + CHUNK, end)])
+        if stop_on_jsonld and len(collector.jsonld) > seen:
+            collector.posting = _jsonld_text(collector.jsonld[seen:])
+            seen = len(collector.jsonld)
+            if collector.posting is not None:
+                break
+    parser.close()
+
+def _job_postings(node: Any) -> Iterator[dict]:
+    if isinstance(node, list):
+        for item in node:
+            yield from _job_postings(item)
+    elif isinstance(node, dict):
+        types = node.get("@type")
+        if types == "JobPosting" or (isinstance(types, list) and "JobPosting" in types):
+            yield node
+        if "@graph" in node:
+            yield from _job_postings(node["@graph"])
+
+def _fragment_text(fragment: str) -> str:
+    """Text of an HTML fragment (e.g. a JSON-LD description), one line per block."""
+    if "<" not in fragment and "&lt;" in fragment:
+        fragment = htmllib.unescape(fragment)  # description HTML escaped once more inside the JSON
+    collector = _Collector(detect_boilerplate=False)
+    _parse(f"<html><body>{fragment}</body></html>", None, collector)
+    return "\n".join(b.text for b in collector.blocks)
+
+def _jsonld_text(scripts: list[str]) -> Optional[str]:
+    """Title, description and qualification fields of the first JSON-LD JobPosting with a
+    substantial description."""
+    for script in scripts:
+        try:
+            data = json.loads(script, strict=False)
+        except ValueError:
+            continue
+        for posting in _job_postings(data):
+            description = posting.get("description")
+            if not isinstance(description, str):
+                continue
+            body = _fragment_text(description)
+            if len(body.split()) < MIN_JSONLD_WORDS:
+                continue
+            parts = [posting["title"].strip()] if isinstance(posting.get("title"), str) else []
+            parts.append(body)
+            for name in _JOB_FIELDS:
+                value = posting.get(name)
+                values = value if isinstance(value, list) else [value]
+                parts += [_fragment_text(v) for v in values if isinstance(v, str) and v.strip()]
+            return "\n".join(p for p in parts if p)
+    return None
+
+def _select(blocks: list[Block]) -> list[Block]:
+    """Drop boilerplate and link-heavy blocks; keep long blocks and the short ones next to them."""
+    labels: list[Optional[bool]] = []  # True = keep, False = drop, None = short (decided by context)
+    for b in blocks:
+        if b.boilerplate or b.link_density > MAX_LINK_DENSITY:
+            labels.append(False)
+        else:
+            labels.append(True if b.words >= GOOD_WORDS else None)
+    if True not in labels:
+        return [b for b, label in zip(blocks, labels) if label is not False and b.text]
+
+    prev: list[Optional[bool]] = []
+    last: Optional[bool] = None
+    for label in labels:
+        prev.append(last)
+        if label is not None:
+            last = label
+    kept = []
+    nxt: Optional[bool] = None
+    for i in range(len(blocks) - 1, -1, -1):
+        label = labels[i]
+        if label is None:
+            label = bool(prev[i] or nxt)
+        else:
+            nxt = label
+        if label and blocks[i].text:
+            kept.append(blocks[i])
+    kept.reverse()
+    return kept
+
+@timed("html_extract")
+def extract_job_text(html: Union[str, bytes], max_bytes: Optional[int] = 2_000_000) -> str:
+    """Main text of a job page: the JSON-LD JobPosting when there is one, else the page's
+    content blocks without boilerplate. At most `max_bytes` of `html` are parsed."""
+    if not html:
+        return ""
+    collector = _Collector()
+    _parse(html, max_bytes, collector, stop_on_jsonld=True)
+    if collector.posting is None and len(collector.jsonld) > 0:
+        collector.posting = _jsonld_text(collector.jsonld)  # scripts completed by the final close()
+    if collector.posting is not None:
+        return collector.posting
+    text = "\n".join(b.text for b in _select(collector.blocks))
+    if len(text.split()) < GOOD_WORDS:
+        unfiltered = _Collector(detect_boilerplate=False)
+        _parse(html, max_bytes, unfiltered)
+        fallback = "\n".join(b.text for b in _select(unfiltered.blocks))
+        if len(fallback.split()) >= MIN_FALLBACK_WORDS:
+            return fallback
+    return text
@@ -0,0 +1,244 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional
+from urllib.parse import urlsplit
+
+from ..utils.config import settings
+from ..utils.metrics import FETCH_BYTES, timed
+from .html_extract import extract_job_text
+
+if TYPE_CHECKING:  # httpx and bs4/lxml are imported on first fetch, not at startup
+    import httpx
+
+DEFAULT_HEADERS = {
+    "User-Agent": "jd-resume-analyzer/1.0 (+portfolio project)"
+}
+
+class ResponseTooLarge(ValueError):
+    pass
+
+@dataclass
+class FetchResult:
+    url: str
+    text: str
+    status: int            # HTTP status of the network response (0 when served without a request)
+    from_cache: bool       # text came from the disk cache (fresh hit or 304)
+    n_bytes: int           # body bytes transferred over the network
+
+class HostLimiter:
+    """Per-host concurrency cap plus a minimum spacing between request starts."""
+
+    def __init__(self, concurrency: int, rps: float):
+        self.concurrency = max(1, concurrency)
+        self.min_interval = 1.0 / rps if rps > 0 else 0.0
+        self._lock = threading.Lock()
+        self._sems: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    def _semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._sems:
+                self._sems[host] = threading.BoundedSemaphore(self.concurrency)
+            return self._sems[host]
+
+    def acquire(self, host: str) -> None:
+        self._semaphore(host).acquire()
+        if not self.min_interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, 0.0))
+            self._next_start[host] = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+    def release(self, host: str) -> None:
+        self._semaphore(host).release()
+
+HTML_EXTRACTORS = ("main", "full")
+
+@timed("html_to_text")
+def html_to_text(html: str) -> str:
+    """Best-effort visible text from an HTML page (all of it; see `html_extract` for the
+    main-content extractor)."""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "lxml")
+    # remove scripts/styles
+    for tag in soup(["script", "style", "noscript"]):
+        tag.decompose()
+    text = soup.get_text("\n")
+    # collapse excessive blank lines
+    lines = [ln.strip() for ln in text.splitlines()]
+    lines = [ln for ln in lines if ln]
+    return "\n".join(lines)
+
+class JobFetcher:
+    """Job posting fetcher with a shared connection pool and an on-disk page cache.
+
+    - cached pages younger than `fresh_s` are served without a request;
+    - older ones are revalidated with If-None-Match / If-Modified-Since, and a 304
+      reuses the cached text without re-parsing;
+    - requests are limited per host (`HostLimiter`) and bodies are capped at `max_bytes`;
+    - page text comes from `extract_job_text` (`html_extractor="main"`, parsing at most
+      `html_max_bytes`) or `html_to_text` ("full").
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: int = 5_000_000,
+        host_concurrency: int = 2,
+        host_rps: float = 1.0,
+        fresh_s: float = 300.0,
+        timeout_s: float = 20.0,
+        client: Optional[httpx.Client] = None,
+        html_extractor: str = "main",
+        html_max_bytes: int = 2_000_000,
+    ):
+        if html_extractor not in HTML_EXTRACTORS:
+            raise ValueError(f"Unknown HTML extractor {html_extractor!r}; expected one of {', '.join(HTML_EXTRACTORS)}")
+        self.html_extractor = html_extractor
+        self.html_max_bytes = html_max_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.fresh_s = fresh_s
+        self.timeout_s = timeout_s
+        self.limiter = HostLimiter(host_concurrency, host_rps)
+        import httpx
+        self.client = client or httpx.Client(
+            headers=DEFAULT_HEADERS,
+            timeout=timeout_s,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+
+    def close(self) -> None:
+        self.client.close()
+
+    def _paths(self, url: str) -> tuple[Path, Path, Path]:
+        stem = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{stem}.json", self.cache_dir / f"{stem}.html", self.cache_dir / f"{stem}.txt"
+
+    def _extract(self, html: str) -> str:
+        return extract_job_text(html, self.html_max_bytes) if self.html_extractor == "main" else html_to_text(html)
+
+    def _load_cached(self, url: str) -> Optional[tuple[dict, str]]:
+        """(meta, text) of the cached page; text made by another extractor (or before the
+        extractor was recorded) is re-extracted from the cached HTML and stored."""
+        if not self.cache_dir:
+            return None
+        meta_p, html_p, text_p = self._paths(url)
+        try:
+            meta = json.loads(meta_p.read_text(encoding="utf-8"))
+            if meta.get("extractor") == self.html_extractor:
+                return meta, text_p.read_text(encoding="utf-8")
+            text = self._extract(html_p.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        meta = {**meta, "extractor": self.html_extractor}
+        self._store(url, meta, None, text)
+        return meta, text
+
+    @staticmethod
+    def _write_atomic(path: Path, data: str) -> None:
+        tmp = path.with_suffix(path.suffix + f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(data, encoding="utf-8")
+        os.replace(tmp, path)
+
+    def _store(self, url: str, meta: dict, html: Optional[str], text: Optional[str]) -> None:
+        if not self.cache_dir:
+            return
+        meta_p, html_p, text_p = self._paths(url)
+        if html is not None:
+            self._write_atomic(html_p, html)
+        if text is not None:
+            self._write_atomic(text_p, text)
+        self._write_atomic(meta_p, json.dumps(meta))
+
+    def _read_capped(self, resp: httpx.Response) -> bytes:
+        declared = resp.headers.get("content-length")
+        if declared and declared.isdigit() and int(declared) > self.max_bytes:
+            raise ResponseTooLarge(f"Response is {declared} bytes (limit {self.max_bytes})")
+        buf = bytearray()
+        for chunk in resp.iter_bytes():
+            buf.extend(chunk)
+            if len(buf) > self.max_bytes:
+                raise ResponseTooLarge(f"Response exceeds {self.max_bytes} bytes")
+        return bytes(buf)
+
+    def fetch(self, url: str, timeout_s: Optional[float] = None) -> FetchResult:
+        if not url:
+            raise ValueError("job_url is required")
+
+        cached = self._load_cached(url)
+        if cached and time.time() - cached[0].get("fetched_at", 0) < self.fresh_s:
+            return FetchResult(url=url, text=cached[1], status=0, from_cache=True, n_bytes=0)
+
+        headers = {}
+        if cached:
+            if cached[0].get("etag"):
+                headers["If-None-Match"] = cached[0]["etag"]
+            if cached[0].get("last_modified"):
+                headers["If-Modified-Since"] = cached[0]["last_modified"]
+
+        host = urlsplit(url).netloc.lower()
+        self.limiter.acquire(host)
+        try:
+            with self.client.stream("GET", url, headers=headers, timeout=timeout_s or self.timeout_s) as resp:
+                if resp.status_code == 304 and cached:
+                    meta = {**cached[0], "fetched_at": time.time()}
+                    self._store(url, meta, None, None)
+                    return FetchResult(url=url, text=cached[1], status=304, from_cache=True, n_bytes=0)
+                resp.raise_for_status()
+                raw = self._read_capped(resp)
+                FETCH_BYTES.inc(len(raw))
+                encoding = resp.encoding or "utf-8"
+                etag, last_modified = resp.headers.get("etag"), resp.headers.get("last-modified")
+        finally:
+            self.limiter.release(host)
+
+        html = raw.decode(encoding, errors="replace")
+        text = self._extract(html)
+        meta = {
+            "url": url, "etag": etag, "last_modified": last_modified, "fetched_at": time.time(),
+            "extractor": self.html_extractor,
+        }
+        self._store(url, meta, html, text)
+        return FetchResult(url=url, text=text, status=200, from_cache=False, n_bytes=len(raw))
+
+    def fetch_text(self, url: str, timeout_s: Optional[float] = None) -> str:
+        return self.fetch(url, timeout_s=timeout_s).text
+
+_fetcher: Optional[JobFetcher] = None
+_fetcher_lock = threading.Lock()
+
+def get_job_fetcher() -> JobFetcher:
+    """Process-wide fetcher configured from settings."""
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = JobFetcher(
+                cache_dir=settings.job_cache_dir or None,
+                max_bytes=settings.job_fetch_max_bytes,
+                host_concurrency=settings.job_fetch_host_concurrency,
+                host_rps=settings.job_fetch_host_rps,
+                fresh_s=settings.job_fetch_fresh_s,
+                html_extractor=settings.job_html_extractor,
+                html_max_bytes=settings.job_html_max_bytes,
+            )
+        return _fetcher
+
+def close_job_fetcher() -> None:
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is not None:
+            _fetcher.close()
+            _fetcher = None
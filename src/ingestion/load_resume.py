@@ -1,18 +1,223 @@
 from __future__ import annotations
+import argparse
+import hashlib
+import io
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
-from PyPDF2 import PdfReader
+from typing import Callable, Dict, Iterable, Optional
 
-def load_text_from_file(path: str) -> str:
-    p = Path(path)
+from ..modeling.llm_cache import ExtractionCache
+from ..utils.config import settings
+from ..utils.metrics import timed
+
+RESUME_SUFFIXES = {".pdf", ".txt", ".md"}
+
+@dataclass
+class LoadReport:
+    texts: Dict[str, str] = field(default_factory=dict)
+    failed: Dict[str, str] = field(default_factory=dict)
+    n_files: int = 0
+    n_bytes: int = 0
+    cache_hits: int = 0
+    elapsed_s: float = 0.0
+
+def _extract_pages(data: bytes, start: int, stop: int) -> list[str]:
+    from PyPDF2 import PdfReader
+    reader = PdfReader(io.BytesIO(data))
+    return [(reader.pages[i].extract_text() or "") for i in range(start, stop)]
+
+def _pdf_text(data: bytes, max_pages: Optional[int], executor: Optional[Executor]) -> str:
+    from PyPDF2 import PdfReader  # imported on the first PDF, not at API startup
+    reader = PdfReader(io.BytesIO(data))
+    n_pages = len(reader.pages)
+    if max_pages:
+        n_pages = min(n_pages, max_pages)  # early cut-off: later pages are never parsed
+
+    workers = settings.resume_pdf_workers
+    if executor is None or workers <= 1 or n_pages < settings.resume_parallel_min_pages:
+        return "\n".join((reader.pages[i].extract_text() or "") for i in range(n_pages))
+
+    step = -(-n_pages // workers)
+    futures = [executor.submit(_extract_pages, data, s, min(s + step, n_pages)) for s in range(0, n_pages, step)]
+    return "\n".join(page for f in futures for page in f.result())
+
+def _decode_text(data: bytes) -> str:
+    # universal newlines, as `Path.read_text` gave: CRLF/CR files split into the same sections
+    return data.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
+
+_pool: Optional[ProcessPoolExecutor] = None
+_cache: Optional[ExtractionCache] = None
+_lock = threading.Lock()
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    global _pool
+    if settings.resume_pdf_workers <= 1:
+        return None
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=settings.resume_pdf_workers)
+        return _pool
+
+def _get_cache() -> Optional[ExtractionCache]:
+    global _cache
+    if not settings.resume_cache_enabled:
+        return None
+    with _lock:
+        if _cache is None:
+            _cache = ExtractionCache(path=settings.resume_cache_path or None, max_memory_items=256, name="resume_text")
+        return _cache
+
+def shutdown_resume_pool() -> None:
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+def _read_limited(p: Path, max_bytes: Optional[int]) -> bytes:
     if not p.exists():
-        raise FileNotFoundError(path)
+        raise FileNotFoundError(str(p))
+    size = p.stat().st_size
+    if max_bytes and size > max_bytes:
+        raise ValueError(f"{p} is {size} bytes (limit {max_bytes})")
+    return p.read_bytes()
+
+def _cache_key(data: bytes, suffix: str, max_pages: Optional[int]) -> str:
+    return hashlib.sha256(data).hexdigest() + f":{suffix}:{max_pages or 0}"
+
+@timed("load_resume")
+def load_text_from_file(path: str, max_pages: Optional[int] = None, max_bytes: Optional[int] = None) -> str:
+    """Load resume text from a txt/md/pdf file.
+
+    PDFs with at least `RESUME_PARALLEL_MIN_PAGES` pages are extracted page-parallel in a
+    process pool, and extracted text is cached by content hash. Files over `max_bytes` are
+    rejected before parsing; only the first `max_pages` pages are extracted.
+    """
+    max_pages = max_pages if max_pages is not None else settings.resume_max_pages
+    max_bytes = max_bytes if max_bytes is not None else settings.resume_max_bytes
+    p = Path(path)
+    data = _read_limited(p, max_bytes)
+
+    if p.suffix.lower() != ".pdf":
+        # txt / md fallback
+        return _decode_text(data)
+
+    cache = _get_cache()
+    key = _cache_key(data, ".pdf", max_pages)
+    if cache:
+        hit = cache.get(key)
+        if hit is not None:
+            return hit["text"]
+    text = _pdf_text(data, max_pages, _get_pool())
+    if cache:
+        cache.set(key, {"text": text})
+    return text
+
+def _load_one(path: str, max_pages: Optional[int], max_bytes: Optional[int]) -> tuple[str, int]:
+    data = _read_limited(Path(path), max_bytes)
+    if Path(path).suffix.lower() == ".pdf":
+        return _pdf_text(data, max_pages, None), len(data)
+    return _decode_text(data), len(data)
+
+def iter_resume_files(root: str) -> Iterable[Path]:
+    p = Path(root)
+    if p.is_file():
+        yield p
+        return
+    for f in sorted(p.rglob("*")):
+        if f.is_file() and f.suffix.lower() in RESUME_SUFFIXES:
+            yield f
+
+def load_many(
+    paths: Iterable[str],
+    max_pages: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int, str], None]] = None,
+) -> LoadReport:
+    """Load many resumes (files and/or directories) in parallel, one file per worker process.
+
+    Cached PDFs are served without touching the pool. `progress(done, total, path)` is
+    called after every file; per-file errors are collected in `LoadReport.failed`.
+    """
+    max_pages = max_pages if max_pages is not None else settings.resume_max_pages
+    max_bytes = max_bytes if max_bytes is not None else settings.resume_max_bytes
+    files = [str(f) for root in paths for f in iter_resume_files(root)]
+    report = LoadReport(n_files=len(files))
+    t0 = time.perf_counter()
+    cache = _get_cache()
+    done = 0
+
+    def _tick(path: str) -> None:
+        nonlocal done
+        done += 1
+        if progress:
+            progress(done, len(files), path)
+
+    pending: Dict[str, str] = {}
+    for f in files:
+        if cache and f.lower().endswith(".pdf"):
+            try:
+                data = _read_limited(Path(f), max_bytes)
+            except Exception as e:
+                report.failed[f] = str(e)
+                _tick(f)
+                continue
+            key = _cache_key(data, ".pdf", max_pages)
+            hit = cache.get(key)
+            if hit is not None:
+                report.texts[f] = hit["text"]
+                report.n_bytes += len(data)
+                report.cache_hits += 1
+                _tick(f)
+                continue
+            pending[f] = key
+        else:
+            pending[f] = ""
+
+    n_workers = workers if workers is not None else max(1, settings.resume_pdf_workers)
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = {pool.submit(_load_one, f, max_pages, max_bytes): f for f in pending}
+        for fut in as_completed(futures):
+            f = futures[fut]
+            try:
+                text, n_bytes = fut.result()
+            except Exception as e:
+                report.failed[f] = str(e)
+            else:
+                report.texts[f] = text
+                report.n_bytes += n_bytes
+                if cache and pending[f]:
+                    cache.set(pending[f], {"text": text})
+            _tick(f)
+
+    report.texts = {f: report.texts[f] for f in files if f in report.texts}
+    report.elapsed_s = time.perf_counter() - t0
+    return report
+
+def main():
+    ap = argparse.ArgumentParser(description="Bulk-load resumes and report throughput.")
+    ap.add_argument("paths", nargs="+", help="Resume files or directories")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--max_pages", type=int, default=None)
+    args = ap.parse_args()
+    from rich import print
+    from rich.progress import Progress
 
-    if p.suffix.lower() == ".pdf":
-        reader = PdfReader(str(p))
-        parts=[]
-        for page in reader.pages:
-            parts.append(page.extract_text() or "")
-        return "\n".join(parts)
+    with Progress() as bar:
+        task = bar.add_task("Loading resumes", total=None)
+        report = load_many(
+            args.paths, max_pages=args.max_pages, workers=args.workers,
+            progress=lambda done, total, _: bar.update(task, completed=done, total=total),
+        )
+    print(f"loaded={len(report.texts)} failed={len(report.failed)} cache_hits={report.cache_hits} "
+          f"bytes={report.n_bytes} elapsed={report.elapsed_s:.2f}s")
+    for f, err in report.failed.items():
+        print(f"  FAILED {f}: {err}")
 
-    # txt / md fallback
-    return p.read_text(encoding="utf-8", errors="ignore")
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from ..features.tfidf_features import default_tfidf
-from ..features.keyword_extractor import extract_keywords, fuzzy_contains
-from ..utils.text import unique_preserve_order
+from ..features.keyword_extractor import KeywordMatcher, extract_keywords
+from ..preprocessing.document import TextLike, as_document
+from ..utils.metrics import timed
 
 @dataclass
 class BaselineResult:
@@ -11,21 +12,14 @@ class BaselineResult:
     missing_keywords: list[str]
     matched_keywords: list[str]
 
-def baseline_compare(resume_text: str, job_text: str, top_k: int = 40) -> BaselineResult:
-    tfidf = default_tfidf()
-    tfidf_score = tfidf.score(resume_text, job_text)
-
+def _job_keywords(job_text: TextLike, top_k: int) -> list[str]:
     job_kw = extract_keywords(job_text)
     # keep top_k earliest keywords to avoid huge lists
-    job_kw = job_kw[:top_k] if top_k else job_kw
+    return job_kw[:top_k] if top_k else job_kw
 
-    matched=[]
-    missing=[]
-    for kw in job_kw:
-        if fuzzy_contains(resume_text, kw, threshold=90):
-            matched.append(kw)
-        else:
-            missing.append(kw)
+def _keyword_result(matcher: KeywordMatcher, job_kw: list[str], tfidf_score: float) -> BaselineResult:
+    # job_kw is already unique and normalized, so matched/missing need no re-normalization
+    matched, missing = matcher.split(job_kw, threshold=90)
 
     denom = max(len(job_kw), 1)
     coverage = len(matched) / denom
@@ -33,6 +27,39 @@ def baseline_compare(resume_text: str, job_text: str, top_k: int = 40) -> Baseli
     return BaselineResult(
         tfidf_score=tfidf_score,
         keyword_coverage=float(coverage),
-        missing_keywords=unique_preserve_order(missing),
-        matched_keywords=unique_preserve_order(matched),
+        missing_keywords=missing,
+        matched_keywords=matched,
     )
+
+@timed("baseline")
+def baseline_compare(resume_text: TextLike, job_text: TextLike, top_k: int = 40) -> BaselineResult:
+    resume, job = as_document(resume_text), as_document(job_text)
+    tfidf = default_tfidf()
+    tfidf_score = tfidf.score(resume, job)
+    return _keyword_result(KeywordMatcher(resume), _job_keywords(job, top_k), tfidf_score)
+
+@timed("baseline")
+def baseline_compare_many(resume_texts: list[TextLike], job_texts: list[TextLike], top_k: int = 40) -> list[BaselineResult]:
+    """Batch version of `baseline_compare` for one resume vs many JDs or one JD vs many resumes.
+
+    Exactly one side must hold a single text; results follow the order of the other side.
+    All texts share one TF-IDF fit, so IDF weights come from the whole batch rather than
+    from each pair; JD keywords are extracted once per JD and each resume is indexed for
+    keyword matching only once.
+    """
+    resumes = [as_document(t) for t in resume_texts]
+    jobs = [as_document(t) for t in job_texts]
+    if len(resumes) == 1:
+        query, docs = resumes[0], jobs
+    elif len(jobs) == 1:
+        query, docs = jobs[0], resumes
+    else:
+        raise ValueError("baseline_compare_many expects exactly one resume or exactly one job text")
+
+    scores = default_tfidf().score_many(query, docs)
+
+    if len(jobs) == 1:
+        job_kw = _job_keywords(jobs[0], top_k)
+        return [_keyword_result(KeywordMatcher(r), job_kw, s) for r, s in zip(resumes, scores)]
+    matcher = KeywordMatcher(resumes[0])
+    return [_keyword_result(matcher, _job_keywords(j, top_k), s) for j, s in zip(jobs, scores)]
@@ -0,0 +1,186 @@
+"""Offline bulk analysis of a JSONL file of analyze requests.
+
+Each input line is a JSON object with `resume_text`, `job_text` and an optional `id`.
+Output is NDJSON in input order: `{"id", "line", "result"}` or `{"id", "line", "error"}`.
+
+Usage:
+    python -m src.modeling.batch --input requests.jsonl --output results.ndjson
+    python -m src.modeling.batch --input requests.jsonl --output results.ndjson --resume
+
+Baselines run in a process pool, LLM extractions on an async pool with bounded
+concurrency; each extraction gets LLM_BUDGET_MS once it starts, and items whose LLM calls
+fell back report why in `explanations.llm_fallback` like `/analyze`. At most `--window`
+items are in flight, so memory does not grow with the input size. A checkpoint
+(input/output byte offsets of the last written line) is committed every
+`--checkpoint_every` lines; `--resume` continues from it, or from the first line when the
+output it points into is missing or shorter.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+from rich import print
+
+from .baseline_similarity import baseline_compare
+from .llm_extract import close_async_client
+from .llm_resilience import LlmBudget, start_budget, use_budget
+from .skill_extract import extract_skills_async
+from .ranker import build_result
+
+@dataclass
+class Checkpoint:
+    lines_done: int = 0
+    input_offset: int = 0
+    output_offset: int = 0
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["Checkpoint"]:
+        if not path.exists():
+            return None
+        return cls(**json.loads(path.read_text(encoding="utf-8")))
+
+    def save(self, path: Path) -> None:
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(asdict(self)), encoding="utf-8")
+        os.replace(tmp, path)
+
+def iter_requests(path: Path, start_offset: int = 0, start_line: int = 0) -> Iterator[tuple[int, int, Optional[Dict[str, Any]], Optional[str]]]:
+    """Yield (line_no, offset_after_line, request, parse_error) lazily from a JSONL file."""
+    with path.open("rb") as fh:
+        fh.seek(start_offset)
+        line_no, offset = start_line, start_offset
+        for raw in fh:
+            offset += len(raw)
+            if not raw.strip():
+                continue
+            try:
+                obj, err = json.loads(raw), None
+            except ValueError as e:
+                obj, err = None, f"invalid JSON: {e}"
+            yield line_no, offset, obj, err
+            line_no += 1
+
+async def _analyze_item(
+    obj: Optional[Dict[str, Any]],
+    err: Optional[str],
+    pool: ProcessPoolExecutor,
+    llm_sem: asyncio.Semaphore,
+) -> Dict[str, Any]:
+    if err:
+        return {"error": err}
+    if not isinstance(obj, dict):
+        return {"error": f"expected a JSON object, got {type(obj).__name__}"}
+    resume_text, job_text = obj.get("resume_text"), obj.get("job_text")
+    if not resume_text or not job_text:
+        return {"error": "resume_text and job_text are required"}
+
+    budget = LlmBudget(None)  # collects both extractions' fallbacks
+
+    async def _skills(text: str):
+        async with llm_sem:
+            # the budget starts here, not while the item waits for the semaphore
+            with use_budget(start_budget()) as own:
+                try:
+                    return await extract_skills_async(text)
+                finally:
+                    budget.fallbacks += own.fallbacks
+
+    loop = asyncio.get_running_loop()
+    try:
+        base, (llm_resume, src_resume), (llm_job, src_job) = await asyncio.gather(
+            loop.run_in_executor(pool, baseline_compare, resume_text, job_text),
+            _skills(resume_text),
+            _skills(job_text),
+        )
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+    return {"result": asdict(build_result(base, llm_resume, llm_job, {"resume": src_resume, "job": src_job}, budget))}
+
+async def run_batch(
+    input_path: Path,
+    output_path: Path,
+    checkpoint_path: Path,
+    resume: bool = False,
+    workers: int = os.cpu_count() or 1,
+    llm_concurrency: int = 8,
+    window: int = 256,
+    checkpoint_every: int = 500,
+) -> Checkpoint:
+    ckpt = (Checkpoint.load(checkpoint_path) if resume else None) or Checkpoint()
+    if ckpt.output_offset and (not output_path.exists() or output_path.stat().st_size < ckpt.output_offset):
+        print(f"[yellow]{output_path} does not hold the checkpointed lines; starting from the first line[/yellow]")
+        ckpt = Checkpoint()
+    mode = "r+b" if resume and output_path.exists() else "wb"
+    llm_sem = asyncio.Semaphore(llm_concurrency)
+    inflight: deque = deque()
+    t0, written = time.perf_counter(), 0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool, output_path.open(mode) as out:
+        # drop any lines written after the last committed checkpoint
+        out.seek(ckpt.output_offset)
+        out.truncate()
+
+        def _commit() -> None:
+            out.flush()
+            os.fsync(out.fileno())
+            ckpt.output_offset = out.tell()
+            ckpt.save(checkpoint_path)
+
+        async def _drain(limit: int) -> None:
+            nonlocal written
+            while len(inflight) > limit:
+                line_no, offset, obj, task = inflight.popleft()
+                record = await task
+                item_id = obj.get("id", line_no) if isinstance(obj, dict) else line_no
+                out.write((json.dumps({"id": item_id, "line": line_no, **record}) + "\n").encode("utf-8"))
+                ckpt.lines_done, ckpt.input_offset = line_no + 1, offset
+                written += 1
+                if written % checkpoint_every == 0:
+                    _commit()
+                    rate = written / (time.perf_counter() - t0)
+                    print(f"{ckpt.lines_done} lines done ({rate:,.1f} lines/s)")
+
+        try:
+            for line_no, offset, obj, err in iter_requests(input_path, ckpt.input_offset, ckpt.lines_done):
+                task = asyncio.ensure_future(_analyze_item(obj, err, pool, llm_sem))
+                inflight.append((line_no, offset, obj, task))
+                await _drain(window)
+            await _drain(0)
+        finally:
+            for *_, task in inflight:
+                task.cancel()
+            _commit()
+            await close_async_client()
+    return ckpt
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--input", type=str, required=True)
+    ap.add_argument("--output", type=str, required=True)
+    ap.add_argument("--checkpoint", type=str, default=None, help="Default: <output>.ckpt")
+    ap.add_argument("--resume", action="store_true", help="Continue from the checkpoint")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Baseline processes")
+    ap.add_argument("--llm_concurrency", type=int, default=8)
+    ap.add_argument("--window", type=int, default=256, help="Max items in flight")
+    ap.add_argument("--checkpoint_every", type=int, default=500)
+    args = ap.parse_args()
+
+    output = Path(args.output)
+    checkpoint = Path(args.checkpoint) if args.checkpoint else output.with_name(output.name + ".ckpt")
+    t0 = time.perf_counter()
+    ckpt = asyncio.run(run_batch(
+        Path(args.input), output, checkpoint,
+        resume=args.resume, workers=args.workers, llm_concurrency=args.llm_concurrency,
+        window=args.window, checkpoint_every=args.checkpoint_every,
+    ))
+    print(f"[bold]Done[/bold]: {ckpt.lines_done} lines -> {output} in {time.perf_counter() - t0:.1f}s")
+
+if __name__ == "__main__":
+    main()
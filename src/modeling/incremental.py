@@ -0,0 +1,90 @@
+"""Section-level incremental re-analysis of resumes.
+
+A resume is split into `Document.spans` (header line + body, covering every line). Keyword
+matches are cached per (section text, JD keywords) and LLM extractions per section text via
+the regular extraction cache, so re-submitting a resume with one edited bullet only
+recomputes that bullet's section. Partial results are merged in section order.
+"""
+from __future__ import annotations
+import hashlib
+from typing import Optional
+
+from ..features.keyword_extractor import KeywordMatcher
+from ..features.tfidf_features import default_tfidf
+from ..preprocessing.document import Document
+from ..utils.config import settings
+from .baseline_similarity import BaselineResult, _job_keywords
+from .llm_cache import ExtractionCache
+from .llm_extract import LlmExtraction, extract_with_usage, extract_with_usage_async, merge_extractions
+from .llm_resilience import gather_or_cancel
+
+_cache: Optional[ExtractionCache] = None
+
+def get_section_cache() -> ExtractionCache:
+    """Memory-only cache of per-section keyword matches."""
+    global _cache
+    if _cache is None:
+        _cache = ExtractionCache(None, max_memory_items=settings.section_cache_items, name="section_keywords")
+    return _cache
+
+def use_sections(resume: Document) -> bool:
+    return settings.section_cache_enabled and len(resume.spans) > 1
+
+def _digest(*parts: str) -> str:
+    h = hashlib.sha256()
+    for p in parts:
+        h.update(p.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+def baseline_compare_sections(resume: Document, job: Document, top_k: int = 40) -> tuple[BaselineResult, list[str]]:
+    """`baseline_compare` with keyword matching done (and cached) per resume section.
+
+    Returns the result and the names of the sections whose matches were recomputed.
+    Exact matches are identical to whole-text matching; fuzzy matches are scored within
+    a section, never across a section boundary.
+    """
+    tfidf_score = default_tfidf().score(resume, job)
+    job_kw = _job_keywords(job, top_k)
+    kw_digest = _digest(*job_kw)
+    cache = get_section_cache()
+    found, recomputed = set(), []
+    for name, text in resume.spans:
+        key = _digest(kw_digest, text)
+        hit = cache.get(key)
+        if hit is None:
+            matched, _ = KeywordMatcher(text).split(job_kw, threshold=90)
+            cache.set(key, {"matched": matched})
+            recomputed.append(name)
+        else:
+            matched = hit["matched"]
+        found.update(matched)
+
+    matched = [k for k in job_kw if k in found]
+    return BaselineResult(
+        tfidf_score=tfidf_score,
+        keyword_coverage=float(len(matched) / max(len(job_kw), 1)),
+        missing_keywords=[k for k in job_kw if k not in found],
+        matched_keywords=matched,
+    ), recomputed
+
+def extract_sections(resume: Document) -> tuple[Optional[LlmExtraction], list[str]]:
+    """Per-section LLM extraction; returns the merged result and the sections actually sent to the LLM."""
+    if not settings.llm_provider:
+        return None, []
+    results = [extract_with_usage(text) for _, text in resume.spans]
+    recomputed = [name for (name, _), (_, usage) in zip(resume.spans, results) if not usage.cached]
+    return merge_extractions([r for r, _ in results]), recomputed
+
+async def extract_sections_async(resume: Document) -> tuple[Optional[LlmExtraction], list[str]]:
+    """Async `extract_sections`: the changed sections are extracted concurrently."""
+    if not settings.llm_provider:
+        return None, []
+    results = await gather_or_cancel(*(extract_with_usage_async(text) for _, text in resume.spans))
+    recomputed = [name for (name, _), (_, usage) in zip(resume.spans, results) if not usage.cached]
+    return merge_extractions([r for r, _ in results]), recomputed
+
+def section_explanation(resume: Document, *recomputed: list[str]) -> dict:
+    changed = set().union(*recomputed)
+    names = [name for name, _ in resume.spans]
+    return {"names": names, "recomputed": [n for n in names if n in changed]}
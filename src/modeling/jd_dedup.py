@@ -0,0 +1,164 @@
+"""Near-duplicate job descriptions: reuse the analysis of a JD already seen in another posting.
+
+Boards repost the same JD with a new date, location line or tracking text, which a content
+hash (and the LLM extraction cache) misses. Each analyzed JD's MinHash signature over
+`clean_text` shingles goes into an LSH index together with its keyword list and skill
+extraction; an incoming JD whose estimated Jaccard similarity to a stored one reaches
+JD_DEDUP_THRESHOLD reuses both instead of being extracted again. Each entry records the
+`job_profiles.skills_version()` its skills were made with; a match made by other prompts, model
+or extractor is `skills_stale()`, and its skills are extracted again and overwritten.
+
+Signatures and results live in SQLite; the band buckets are rebuilt in memory on first use
+(about one dict entry per band per JD), and a lookup reads only the rows of its candidates.
+"""
+from __future__ import annotations
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from ..features.keyword_extractor import STOPWORDS, extract_keywords
+from ..features.minhash import MinHasher, MinHashLSH, jaccard
+from ..preprocessing.document import Document, TextLike, as_document
+from ..utils.config import settings
+from ..utils.metrics import timed
+from .job_profiles import content_hash, skills_version
+from .llm_extract import LlmExtraction
+
+@dataclass
+class JdMatch:
+    id: str
+    similarity: float
+    keywords: list[str]
+    skills: Optional[Dict[str, list[str]]]
+    skill_source: str
+    prompt_fingerprint: Optional[str] = None
+    llm_model: Optional[str] = None
+
+    def document(self, job_text: TextLike) -> Document:
+        """`job_text` as a `Document` whose keyword list is the matched JD's."""
+        return as_document(job_text).prime(keywords={(3, STOPWORDS): self.keywords})
+
+    def skill_extraction(self) -> tuple[Optional[LlmExtraction], str]:
+        """(extraction, source) in the shape `ranker` takes as `job_skills`."""
+        return (LlmExtraction(**self.skills) if self.skills else None), self.skill_source
+
+    def skills_stale(self) -> bool:
+        """Whether the skills were made by other prompts or model than the current ones (or
+        before the LLM was enabled)."""
+        return (self.prompt_fingerprint, self.llm_model) != skills_version()
+
+    def explanation(self) -> Dict[str, Any]:
+        return {"id": self.id, "similarity": round(self.similarity, 4)}
+
+class JdDedupIndex:
+    """Analyzed JDs keyed by content-hash id, searchable by estimated Jaccard similarity."""
+
+    def __init__(self, path: str, threshold: float = 0.85, num_perm: int = 128, shingle_size: int = 5):
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm, shingle_size=shingle_size)
+        self.lsh = MinHashLSH(num_perm, threshold)
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.executescript("""
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS jd_signatures (
+                rid INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE, signature BLOB NOT NULL,
+                data TEXT NOT NULL, created_at REAL NOT NULL
+            );
+        """)
+        self._load()
+
+    def _load(self) -> None:
+        # signatures from other hash parameters are not comparable: start over
+        params = f"perm={self.hasher.num_perm};seed={self.hasher.seed};shingle={self.hasher.shingle_size}"
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'params'").fetchone()
+        if row is not None and row[0] != params:
+            self._db.execute("DELETE FROM jd_signatures")
+        self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('params', ?)", (params,))
+        for rid, blob in self._db.execute("SELECT rid, signature FROM jd_signatures"):
+            self.lsh.insert(rid, np.frombuffer(blob, dtype=np.uint32))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self.lsh)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def signature(self, job_text: TextLike) -> np.ndarray:
+        doc = as_document(job_text)
+        return doc.derived(("minhash", self.hasher.num_perm), lambda: self.hasher.signature(doc.clean))
+
+    @timed("jd_dedup")
+    def lookup(self, job_text: TextLike) -> Optional[JdMatch]:
+        """The most similar stored JD at or above the threshold, if any."""
+        sig = self.signature(job_text)
+        with self._lock:
+            rids = self.lsh.candidates(sig)
+            if not rids:
+                return None
+            marks = ",".join("?" * len(rids))
+            rows = self._db.execute(
+                f"SELECT id, signature, data FROM jd_signatures WHERE rid IN ({marks})", list(rids),
+            ).fetchall()
+        best: Optional[tuple[float, str, str]] = None
+        for jd_id, blob, data in rows:
+            sim = jaccard(sig, np.frombuffer(blob, dtype=np.uint32))
+            if sim >= self.threshold and (best is None or sim > best[0]):
+                best = (sim, jd_id, data)
+        if best is None:
+            return None
+        sim, jd_id, data = best
+        return JdMatch(id=jd_id, similarity=sim, **json.loads(data))
+
+    @staticmethod
+    def _data(keywords: list[str], skills: Optional[LlmExtraction], skill_source: str) -> str:
+        fingerprint, model = skills_version()
+        return json.dumps({
+            "keywords": keywords, "skills": asdict(skills) if skills else None, "skill_source": skill_source,
+            "prompt_fingerprint": fingerprint, "llm_model": model,
+        })
+
+    def add(self, job_text: TextLike, skills: Optional[LlmExtraction], skill_source: str) -> str:
+        """Store a JD's keywords and skill extraction; returns its id (content-hash prefix)."""
+        doc = as_document(job_text)
+        jd_id = content_hash(doc.raw)[:16]
+        sig = self.signature(doc)
+        data = self._data(extract_keywords(doc), skills, skill_source)
+        with self._lock:
+            old = self._db.execute("SELECT rid, signature FROM jd_signatures WHERE id = ?", (jd_id,)).fetchone()
+            if old is not None:
+                self.lsh.remove(old[0], np.frombuffer(old[1], dtype=np.uint32))
+                self._db.execute("DELETE FROM jd_signatures WHERE rid = ?", (old[0],))
+            rid = self._db.execute(
+                "INSERT INTO jd_signatures (id, signature, data, created_at) VALUES (?, ?, ?, ?)",
+                (jd_id, sig.tobytes(), data, time.time()),
+            ).lastrowid
+            self.lsh.insert(rid, sig)
+        return jd_id
+
+    def update_skills(self, match: JdMatch, skills: Optional[LlmExtraction], skill_source: str) -> None:
+        """Overwrite a stored JD's skill extraction, e.g. re-extracted because `match` was stale."""
+        data = self._data(match.keywords, skills, skill_source)
+        with self._lock:
+            self._db.execute("UPDATE jd_signatures SET data = ? WHERE id = ?", (data, match.id))
+
+_index: Optional[JdDedupIndex] = None
+_index_lock = threading.Lock()
+
+def get_jd_dedup_index() -> JdDedupIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = JdDedupIndex(settings.jd_dedup_path, settings.jd_dedup_threshold, settings.jd_dedup_num_perm)
+        return _index
@@ -0,0 +1,182 @@
+"""Precomputed job description profiles, stored once and referenced by id from `/analyze`.
+
+A profile holds everything `analyze` derives from the JD alone: cleaned text, keyword list,
+TF-IDF row (when a prefitted corpus model is loaded), skill extraction and a content hash.
+`JobProfile.document()` returns a `Document` primed with those forms, so scoring many
+resumes against one posting only does the resume-side work.
+
+The skill extraction records the prompt fingerprint and model it came from and whether the
+LLM fell back; `skills_stale()` profiles have their skills extracted again when used (see
+`api.main`), so an outage or a prompt/model change is not frozen into the profile.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..features.keyword_extractor import STOPWORDS, extract_keywords
+from ..features.tfidf_features import default_tfidf
+from ..preprocessing.document import Document
+from ..utils.config import settings
+from .llm_extract import PROMPT_FINGERPRINT, LlmExtraction, model_name
+from .llm_resilience import start_budget, use_budget
+from .skill_extract import extract_skills_async
+
+@dataclass
+class JobProfile:
+    id: str
+    content_hash: str
+    text: str
+    clean_text: str
+    keywords: list[str]
+    tfidf: Optional[Dict[str, Any]]  # {"model": version, "indices": [...], "data": [...]}
+    skills: Optional[Dict[str, list[str]]]
+    skill_source: str
+    source_url: Optional[str] = None
+    created_at: float = 0.0
+    prompt_fingerprint: Optional[str] = None  # of the LLM prompts the skills came from
+    llm_model: Optional[str] = None  # "provider:model"
+    llm_fallback: list[str] = field(default_factory=list)  # reasons the LLM was skipped
+    _doc: Optional[Document] = field(default=None, init=False, repr=False, compare=False)
+
+    def document(self) -> Document:
+        """The JD as a `Document` with the stored forms primed (built once per profile)."""
+        if self._doc is None:
+            derived = {}
+            model = default_tfidf()
+            if self.tfidf and getattr(model, "prefitted", False) and model.version == self.tfidf["model"]:
+                derived[("tfidf", model.version)] = model.row_from_parts(self.tfidf["indices"], self.tfidf["data"])
+            self._doc = Document(self.text).prime(
+                clean=self.clean_text, keywords={(3, STOPWORDS): self.keywords}, derived=derived,
+            )
+        return self._doc
+
+    def skill_extraction(self) -> tuple[Optional[LlmExtraction], str]:
+        """(extraction, source) in the shape `ranker` takes as `job_skills`."""
+        return (LlmExtraction(**self.skills) if self.skills else None), self.skill_source
+
+    def skills_stale(self) -> bool:
+        """Whether the skills should be extracted again: the LLM fell back, or the prompts or
+        model changed since."""
+        return bool(self.llm_fallback) or (self.prompt_fingerprint, self.llm_model) != skills_version()
+
+    def with_skills(self, skills: Optional[LlmExtraction], source: str, fallbacks: list[str]) -> "JobProfile":
+        """A copy with a new skill extraction, made by the current prompts and model."""
+        fingerprint, model = skills_version()
+        profile = replace(
+            self, skills=asdict(skills) if skills else None, skill_source=source,
+            prompt_fingerprint=fingerprint, llm_model=model, llm_fallback=list(fallbacks),
+        )
+        profile._doc = self._doc
+        return profile
+
+    def to_json(self) -> str:
+        d = asdict(self)
+        d.pop("_doc")
+        return json.dumps(d)
+
+    @classmethod
+    def from_json(cls, s: str) -> "JobProfile":
+        return cls(**json.loads(s))
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def skills_version() -> tuple[Optional[str], Optional[str]]:
+    """(prompt fingerprint, "provider:model") skill extractions currently depend on; (None, None)
+    when the LLM is not used."""
+    provider = settings.llm_provider
+    if not provider or settings.skill_extractor == "dictionary":
+        return None, None
+    return PROMPT_FINGERPRINT, f"{provider.lower()}:{model_name(provider)}"
+
+async def build_profile(job_text: str, profile_id: Optional[str] = None, source_url: Optional[str] = None) -> JobProfile:
+    """Run the JD-side pipeline once; the id defaults to a content-hash prefix, so re-posting
+    the same text yields the same profile. The skill extraction runs under LLM_BUDGET_MS."""
+    doc = Document(job_text)
+    h = content_hash(job_text)
+    model = default_tfidf()
+    tfidf = None
+    if getattr(model, "prefitted", False):
+        row = model.row(doc)
+        tfidf = {"model": model.version, "indices": row.indices.tolist(), "data": row.data.tolist()}
+    with use_budget(start_budget()) as budget:
+        skills, source = await extract_skills_async(doc)
+    profile = JobProfile(
+        id=profile_id or h[:16], content_hash=h, text=job_text, clean_text=doc.clean,
+        keywords=extract_keywords(doc), tfidf=tfidf, skills=None, skill_source=source,
+        source_url=source_url, created_at=time.time(),
+    )
+    profile._doc = doc
+    return profile.with_skills(skills, source, budget.fallbacks)
+
+class JobProfileStore:
+    """SQLite-backed profiles with a bounded in-process LRU of decoded (and primed) profiles."""
+
+    def __init__(self, path: str, max_memory_items: int = 256):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_memory_items = max_memory_items
+        self._lock = threading.Lock()
+        self._mem: OrderedDict[str, JobProfile] = OrderedDict()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS job_profiles ("
+            " id TEXT PRIMARY KEY, content_hash TEXT NOT NULL, data TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM job_profiles").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _remember(self, profile: JobProfile) -> None:
+        self._mem[profile.id] = profile
+        self._mem.move_to_end(profile.id)
+        while len(self._mem) > self.max_memory_items:
+            self._mem.popitem(last=False)
+
+    def put(self, profile: JobProfile) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO job_profiles (id, content_hash, data, created_at) VALUES (?, ?, ?, ?)",
+                (profile.id, profile.content_hash, profile.to_json(), profile.created_at),
+            )
+            self._remember(profile)
+
+    def get(self, profile_id: str) -> Optional[JobProfile]:
+        with self._lock:
+            profile = self._mem.get(profile_id)
+            if profile is not None:
+                self._mem.move_to_end(profile_id)
+                return profile
+            row = self._db.execute("SELECT data FROM job_profiles WHERE id = ?", (profile_id,)).fetchone()
+            if row is None:
+                return None
+            profile = JobProfile.from_json(row[0])
+            self._remember(profile)
+            return profile
+
+    def remove(self, profile_id: str) -> bool:
+        with self._lock:
+            self._mem.pop(profile_id, None)
+            return self._db.execute("DELETE FROM job_profiles WHERE id = ?", (profile_id,)).rowcount > 0
+
+_store: Optional[JobProfileStore] = None
+_store_lock = threading.Lock()
+
+def get_job_profile_store() -> JobProfileStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = JobProfileStore(settings.job_profiles_path, settings.job_profiles_memory_items)
+        return _store
@@ -0,0 +1,213 @@
+from __future__ import annotations
+import asyncio
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from ..preprocessing.document import TextLike, raw_text
+from ..utils.config import settings
+from ..utils.metrics import LLM_BATCH_SIZE, timed
+from .llm_extract import (
+    DEFAULT_SCHEMA_HINT, MAX_INPUT_CHARS, PROMPT_FINGERPRINT, SYSTEM_PROMPT, LlmExtraction, cache_lookup, chat_request,
+    extract_with_usage_async, extraction_cache_key, extraction_from_obj, get_async_client, get_extraction_cache,
+    parse_json, response_content, response_usage,
+)
+from .llm_resilience import LlmBudget, post_json_async, use_budget
+
+if TYPE_CHECKING:
+    import httpx
+
+BATCH_SYSTEM_PROMPT = SYSTEM_PROMPT + "You may receive several documents; extract each one independently.\n"
+
+BATCH_USER_PROMPT_TEMPLATE = '''For EACH document below, extract a JSON object with keys:
+- skills: list of general skills (e.g., machine learning, NLP, MLOps)
+- tools: list of tools/technologies (e.g., scikit-learn, FastAPI, AWS)
+- requirements: list of requirements/expectations (e.g., deploy models, work with APIs)
+
+Output must be JSON only: one object {{"results": {{"<id>": <extraction>, ...}}}} containing
+every document id exactly once. Example extraction:
+{example}
+
+{documents}'''
+
+DOCUMENT_TEMPLATE = '''DOCUMENT id={id}:
+"""{text}"""
+'''
+
+# Batched answers are cached under their own keys: a batch prompt edit invalidates them, and
+# single-document callers are never served batch-prompt output (see `LlmBatcher.submit`).
+BATCH_PROMPT_FINGERPRINT = hashlib.sha256(
+    (PROMPT_FINGERPRINT + "\x00" + BATCH_SYSTEM_PROMPT + "\x00" + BATCH_USER_PROMPT_TEMPLATE + "\x00" + DOCUMENT_TEMPLATE).encode("utf-8")
+).hexdigest()
+
+def build_batch_prompt(texts: List[str]) -> str:
+    docs = "\n".join(DOCUMENT_TEMPLATE.format(id=i, text=t[:MAX_INPUT_CHARS]) for i, t in enumerate(texts))
+    return BATCH_USER_PROMPT_TEMPLATE.format(example=json.dumps(DEFAULT_SCHEMA_HINT), documents=docs)
+
+def parse_batch(content: str, n: int) -> Dict[int, LlmExtraction]:
+    """Map document index -> extraction; ids that are missing or malformed are left out."""
+    obj = parse_json(content)
+    results = obj.get("results", obj) if isinstance(obj, dict) else None
+    if not isinstance(results, dict):
+        raise ValueError("Batched LLM output is not a JSON object keyed by document id")
+    out = {}
+    for k, v in results.items():
+        try:
+            i = int(str(k).strip())
+        except ValueError:
+            continue
+        if 0 <= i < n and isinstance(v, dict):
+            out[i] = extraction_from_obj(v)
+    return out
+
+@dataclass
+class _Pending:
+    text: str
+    key: str
+    future: asyncio.Future
+
+class LlmBatcher:
+    """Collect concurrent extraction requests and send them as one multi-document prompt.
+
+    A batch is flushed `window_s` after its first request arrives, or as soon as it holds
+    `max_items` texts or `max_chars` characters, whichever comes first; a lone request is
+    sent with the regular single-document prompt. While `max_concurrency` batches are
+    already in flight an expired window does not flush: the batch keeps filling and goes
+    out when one of them completes, so batches grow with load (adaptive) instead of
+    queueing up at the provider. Cache hits never wait for a batch; batched answers are
+    cached under `BATCH_PROMPT_FINGERPRINT`, single-prompt ones under the regular keys.
+    Documents missing from (or the whole of) an unparseable batched answer fall back to
+    per-item calls; errors (`LlmUnavailable`) are raised to every caller in the batch.
+    Batches are not bound by any one caller's budget; callers stop waiting at their own
+    deadline (see `llm_extract.extract_with_llm_async`).
+    """
+
+    def __init__(
+        self, window_s: Optional[float] = None, max_items: Optional[int] = None,
+        max_chars: Optional[int] = None, max_concurrency: Optional[int] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.window_s = settings.llm_batch_window_ms / 1000.0 if window_s is None else window_s
+        self.max_items = max(1, max_items or settings.llm_batch_max_items)
+        self.max_chars = max_chars or settings.llm_batch_max_chars
+        self.max_concurrency = max(1, max_concurrency or settings.llm_batch_concurrency)
+        self.client = client
+        self.stats = {"batches": 0, "items": 0, "fallbacks": 0}
+        self._pending: List[_Pending] = []
+        self._chars = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._inflight = 0
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, text: TextLike) -> Optional[LlmExtraction]:
+        provider = settings.llm_provider
+        if not provider:
+            return None
+        text = raw_text(text)
+        cache, key, hit = cache_lookup(text, provider)
+        if hit is None and cache:
+            _, _, hit = cache_lookup(text, provider, BATCH_PROMPT_FINGERPRINT)
+        if hit is not None:
+            return hit
+
+        size = min(len(text), MAX_INPUT_CHARS)
+        if self._pending and self._chars + size > self.max_chars:
+            self._flush()
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.append(_Pending(text, key, fut))
+        self._chars += size
+        if len(self._pending) >= self.max_items or self._chars >= self.max_chars:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window_s, self._on_window)
+        return await fut
+
+    def _on_window(self) -> None:
+        self._timer = None
+        if self._inflight < self.max_concurrency:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._chars = self._pending, [], 0
+        if batch:
+            self._inflight += 1
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[_Pending]) -> None:
+        try:
+            with use_budget(LlmBudget(None)):
+                await self._send(batch)
+        finally:
+            self._inflight -= 1
+            if self._pending and self._timer is None and self._inflight < self.max_concurrency:
+                self._flush()
+
+    async def _send(self, batch: List[_Pending]) -> None:
+        provider = settings.llm_provider
+        client = self.client or get_async_client()
+        self.stats["batches"] += 1
+        self.stats["items"] += len(batch)
+        LLM_BATCH_SIZE.observe(len(batch))
+        try:
+            results: Dict[int, LlmExtraction] = {}
+            if len(batch) > 1:
+                results = await self._call_batch([p.text for p in batch], provider, client)
+            missing = [i for i in range(len(batch)) if i not in results]
+            if len(batch) > 1 and missing:
+                self.stats["fallbacks"] += len(missing)
+            singles = await asyncio.gather(
+                *(extract_with_usage_async(batch[i].text, client=client, use_cache=False) for i in missing),
+                return_exceptions=True,
+            )
+        except Exception as e:
+            for p in batch:
+                if not p.future.done():
+                    p.future.set_exception(e)
+            return
+
+        cache = get_extraction_cache()
+        if cache:
+            for i in results:  # answered by the batch prompt
+                cache.set(extraction_cache_key(batch[i].text, provider, BATCH_PROMPT_FINGERPRINT), asdict(results[i]))
+        for i, single in zip(missing, singles):
+            if isinstance(single, BaseException):
+                if not batch[i].future.done():
+                    batch[i].future.set_exception(single)
+            else:
+                results[i] = single[0]
+                if cache:
+                    cache.set(batch[i].key, asdict(single[0]))
+        for i, p in enumerate(batch):
+            if i not in results:
+                continue
+            if not p.future.done():
+                p.future.set_result(results[i])
+
+    @timed("llm_batch")
+    async def _call_batch(self, texts: List[str], provider: str, client: httpx.AsyncClient) -> Dict[int, LlmExtraction]:
+        url, headers, body, timeout = chat_request(BATCH_SYSTEM_PROMPT, build_batch_prompt(texts), provider)
+        # no hedging: a duplicate of a whole batch costs as much as the batch
+        data: Dict[str, Any] = await post_json_async(client, provider, url, headers, body, timeout * 2, hedge=False)
+        response_usage(provider, data)
+        try:
+            return parse_batch(response_content(provider, data), len(texts))
+        except (ValueError, KeyError, TypeError):
+            # json.JSONDecodeError is a ValueError; every document falls back to a single call
+            return {}
+
+_batcher: Optional[LlmBatcher] = None
+_batcher_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def get_llm_batcher() -> LlmBatcher:
+    """Process-wide batcher for the running event loop (see `get_async_client`)."""
+    global _batcher, _batcher_loop
+    loop = asyncio.get_running_loop()
+    if _batcher is None or _batcher_loop is not loop:
+        _batcher, _batcher_loop = LlmBatcher(), loop
+    return _batcher
@@ -0,0 +1,139 @@
+from __future__ import annotations
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..utils.metrics import CACHE_LOOKUPS
+
+class ExtractionCache:
+    """Two-tier cache for LLM extractions: bounded in-process LRU in front of SQLite.
+
+    Keys are content hashes (see `llm_extract.extraction_cache_key`), values are JSON-able
+    dicts. Entries older than `ttl_s` are treated as misses; both tiers are size-bounded
+    (`max_memory_items` for the LRU, `max_disk_items` rows on disk, least recently used first).
+    The disk tier counts its rows in memory and runs the exact `COUNT(*)` only when that count
+    passes the cap; it then evicts down to 90% of it, so the count runs once per ~10% of the
+    cap's worth of inserts (rows added by other processes are caught at that recount).
+    `path=None` keeps the cache memory-only; `name` labels its lookups in the metrics.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str],
+        max_memory_items: int = 512,
+        max_disk_items: int = 50_000,
+        ttl_s: float = 7 * 24 * 3600,
+        name: str = "llm",
+    ):
+        self.name = name
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._mem: OrderedDict[str, tuple[float, Dict[str, Any]]] = OrderedDict()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "sets": 0, "evictions": 0}
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_rows = 0
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS extractions ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_extractions_accessed ON extractions(accessed_at)")
+            self._db.execute("DELETE FROM extractions WHERE created_at < ?", (time.time() - self.ttl_s,))
+            self._disk_rows = self._db.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return bool(self.ttl_s) and now - created_at > self.ttl_s
+
+    def _remember(self, key: str, created_at: float, value: Dict[str, Any]) -> None:
+        self._mem[key] = (created_at, value)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_memory_items:
+            self._mem.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                if not self._expired(entry[0], now):
+                    self._mem.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    CACHE_LOOKUPS.inc(1.0, self.name, "memory_hit")
+                    return entry[1]
+                del self._mem[key]
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value, created_at FROM extractions WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    if not self._expired(row[1], now):
+                        self._db.execute("UPDATE extractions SET accessed_at = ? WHERE key = ?", (now, key))
+                        value = json.loads(row[0])
+                        self._remember(key, row[1], value)
+                        self._stats["disk_hits"] += 1
+                        CACHE_LOOKUPS.inc(1.0, self.name, "disk_hit")
+                        return value
+                    self._db.execute("DELETE FROM extractions WHERE key = ?", (key,))
+                    self._disk_rows -= 1
+
+            self._stats["misses"] += 1
+            CACHE_LOOKUPS.inc(1.0, self.name, "miss")
+            return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, value)
+            self._stats["sets"] += 1
+            if self._db is None:
+                return
+            data = json.dumps(value)
+            updated = self._db.execute(
+                "UPDATE extractions SET value = ?, created_at = ?, accessed_at = ? WHERE key = ?", (data, now, now, key),
+            ).rowcount
+            if not updated:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO extractions(key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, data, now, now),
+                )
+                self._disk_rows += 1
+            if self._disk_rows > self.max_disk_items:
+                self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        (n,) = self._db.execute("SELECT COUNT(*) FROM extractions").fetchone()
+        if n > self.max_disk_items:
+            keep = self.max_disk_items - self.max_disk_items // 10
+            cur = self._db.execute(
+                "DELETE FROM extractions WHERE key IN (SELECT key FROM extractions ORDER BY accessed_at LIMIT ?)",
+                (n - keep,),
+            )
+            self._stats["evictions"] += cur.rowcount
+            n -= cur.rowcount
+        self._disk_rows = n
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM extractions")
+                self._disk_rows = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            out["memory_items"] = len(self._mem)
+            if self._db is not None:
+                out["disk_items"] = self._db.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+        lookups = out["memory_hits"] + out["disk_hits"] + out["misses"]
+        out["hit_rate"] = (out["memory_hits"] + out["disk_hits"]) / lookups if lookups else 0.0
+        return out
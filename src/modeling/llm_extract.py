@@ -1,11 +1,22 @@
 from __future__ import annotations
+import asyncio
+import contextvars
+import hashlib
 import json
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
-import httpx
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
+from ..preprocessing.chunking import CHARS_PER_TOKEN, chunk_text
+from ..preprocessing.document import TextLike, raw_text
 from ..utils.config import settings
+from ..utils.metrics import LLM_TOKENS, timed
 from ..utils.text import unique_preserve_order
+from .llm_cache import ExtractionCache
+from .llm_resilience import LlmUnavailable, gather_or_cancel, post_json, post_json_async, within_budget
+
+if TYPE_CHECKING:  # httpx is imported when the first client is created
+    import httpx
 
 DEFAULT_SCHEMA_HINT = {
     "skills": ["python", "machine learning", "statistics"],
@@ -19,7 +30,7 @@ Do not invent items not supported by the input text.
 If unsure, omit the item.
 """
 
-USER_PROMPT_TEMPLATE = """Extract a JSON object with keys:
+USER_PROMPT_TEMPLATE = '''Extract a JSON object with keys:
 - skills: list of general skills (e.g., machine learning, NLP, MLOps)
 - tools: list of tools/technologies (e.g., scikit-learn, FastAPI, AWS)
 - requirements: list of requirements/expectations (e.g., deploy models, work with APIs)
@@ -29,7 +40,10 @@ Output must be JSON only. Example shape:
 
 TEXT:
 """{text}"""
-"""
+'''
+
+# Hard cap on the text sent in one prompt; longer documents are chunked (see `llm_chunks`).
+MAX_INPUT_CHARS = 12000
 
 @dataclass
 class LlmExtraction:
@@ -37,25 +51,226 @@ class LlmExtraction:
     tools: list[str]
     requirements: list[str]
 
+@dataclass
+class LlmUsage:
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached: bool = False
+
+def merge_extractions(parts: list[Optional[LlmExtraction]]) -> Optional[LlmExtraction]:
+    """Concatenate extractions in order and deduplicate each list; None if there are none."""
+    parts = [p for p in parts if p is not None]
+    if not parts:
+        return None
+    return LlmExtraction(
+        skills=unique_preserve_order(i for p in parts for i in p.skills),
+        tools=unique_preserve_order(i for p in parts for i in p.tools),
+        requirements=unique_preserve_order(i for p in parts for i in p.requirements),
+    )
+
+def _sum_usage(usages: list[LlmUsage]) -> LlmUsage:
+    return LlmUsage(
+        prompt_tokens=sum(u.prompt_tokens for u in usages),
+        completion_tokens=sum(u.completion_tokens for u in usages),
+        cached=all(u.cached for u in usages),
+    )
+
+def llm_chunks(text: str) -> list[str]:
+    """The pieces one document is extracted in: a single one unless it exceeds LLM_CHUNK_TOKENS.
+
+    LLM_CHUNK_TOKENS=0 disables chunking (the text is truncated to MAX_INPUT_CHARS instead).
+    """
+    if settings.llm_chunk_tokens <= 0 or len(text) <= settings.llm_chunk_tokens * CHARS_PER_TOKEN:
+        return [text]
+    return chunk_text(text, min(settings.llm_chunk_tokens, MAX_INPUT_CHARS // CHARS_PER_TOKEN)) or [text]
+
 def _normalize_list(x: Any) -> list[str]:
     if not isinstance(x, list):
         return []
     return unique_preserve_order([str(i) for i in x if str(i).strip()])
 
-def extract_with_llm(text: str) -> Optional[LlmExtraction]:
+# Any change to the prompts or the schema hint changes this fingerprint and therefore
+# every cache key, so stale extractions are never served after a prompt edit.
+PROMPT_FINGERPRINT = hashlib.sha256(
+    (SYSTEM_PROMPT + "\x00" + USER_PROMPT_TEMPLATE + "\x00" + json.dumps(DEFAULT_SCHEMA_HINT, sort_keys=True)).encode("utf-8")
+).hexdigest()
+
+_cache: Optional[ExtractionCache] = None
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """Process-wide extraction cache, or None when LLM_CACHE_ENABLED is off."""
+    global _cache
+    if not settings.llm_cache_enabled:
+        return None
+    if _cache is None:
+        _cache = ExtractionCache(
+            path=settings.llm_cache_path or None,
+            max_memory_items=settings.llm_cache_memory_items,
+            max_disk_items=settings.llm_cache_max_items,
+            ttl_s=settings.llm_cache_ttl_s,
+        )
+    return _cache
+
+def extraction_cache_stats() -> Optional[Dict[str, Any]]:
+    """Stats of the extraction cache, or None when it is off or not opened yet (this does not
+    open it)."""
+    return _cache.stats() if settings.llm_cache_enabled and _cache is not None else None
+
+def model_name(provider: str) -> str:
+    """The configured model of `provider` ("ollama" or "openai")."""
+    return settings.ollama_model if provider.lower() == "ollama" else settings.openai_model
+
+def extraction_cache_key(text: str, provider: str, fingerprint: Optional[str] = None) -> str:
+    """Cache key of `text`'s extraction by the prompts with `fingerprint` (the single-document
+    ones by default) and the provider's current model."""
+    h = hashlib.sha256()
+    for part in (fingerprint or PROMPT_FINGERPRINT, provider.lower(), model_name(provider), text):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+def cache_lookup(
+    text: str, provider: str, fingerprint: Optional[str] = None,
+) -> tuple[Optional[ExtractionCache], str, Optional[LlmExtraction]]:
+    """(cache, key, cached extraction or None); (None, "", None) when caching is off."""
+    cache = get_extraction_cache()
+    if not cache:
+        return None, "", None
+    key = extraction_cache_key(text, provider, fingerprint)
+    hit = cache.get(key)
+    if hit is None:
+        return cache, key, None
+    # copies: the lists of a memory-tier hit are the cached entry's own
+    return cache, key, LlmExtraction(**{k: list(v) for k, v in hit.items()})
+
+def extract_with_llm(text: TextLike) -> Optional[LlmExtraction]:
     """Optional LLM extraction.
 
     Returns None if no provider is configured.
     Supports:
     - OpenAI-compatible Chat Completions endpoint
     - Ollama chat endpoint
+
+    Results are cached by text/prompt/provider/model (see `get_extraction_cache`).
+    Long documents are extracted chunk by chunk (see `llm_chunks`) and the results merged.
+    Calls go through `llm_resilience` (budget, retries, breaker) and raise `LlmUnavailable`
+    when no answer could be had.
     """
+    result, _ = extract_with_usage(text)
+    return result
+
+def extract_with_usage(text: TextLike) -> tuple[Optional[LlmExtraction], LlmUsage]:
+    """`extract_with_llm` plus the provider's token usage (zero for cache hits)."""
     provider = settings.llm_provider
     if not provider:
-        return None
+        return None, LlmUsage()
+    chunks = llm_chunks(raw_text(text))
+    if len(chunks) == 1:
+        return _extract_chunk(chunks[0], provider)
+    # map-reduce: chunks are extracted (and cached) independently, in parallel
+    with ThreadPoolExecutor(max_workers=min(len(chunks), settings.llm_chunk_concurrency)) as pool:
+        # each chunk runs in a copy of this context, so it sees the request's budget and timings
+        futures = [pool.submit(contextvars.copy_context().run, _extract_chunk, c, provider) for c in chunks]
+        results = [f.result() for f in futures]
+    return merge_extractions([r for r, _ in results]), _sum_usage([u for _, u in results])
 
-    payload_text = USER_PROMPT_TEMPLATE.format(example=json.dumps(DEFAULT_SCHEMA_HINT), text=text[:12000])
+@timed("llm_extract")
+def _extract_chunk(text: str, provider: str) -> tuple[LlmExtraction, LlmUsage]:
+    cache, key, hit = cache_lookup(text, provider)
+    if hit is not None:
+        return hit, LlmUsage(cached=True)
 
+    result, usage = _extract_uncached(text, provider)
+    if cache:
+        cache.set(key, asdict(result))
+    return result, usage
+
+async def extract_with_llm_async(text: TextLike, client: Optional[httpx.AsyncClient] = None) -> Optional[LlmExtraction]:
+    """Async twin of `extract_with_llm` over the shared pooled client (see `get_async_client`).
+
+    With LLM_BATCH_ENABLED, concurrent calls (and the chunks of long documents) are packed
+    into shared prompts by `llm_batcher`.
+    """
+    if settings.llm_batch_enabled and settings.llm_provider and client is None:
+        from .llm_batcher import get_llm_batcher  # imports this module
+        batcher = get_llm_batcher()
+        chunks = llm_chunks(raw_text(text))
+        if len(chunks) == 1:
+            return await within_budget(batcher.submit(chunks[0]))
+        return merge_extractions(await gather_or_cancel(*(within_budget(batcher.submit(c)) for c in chunks)))
+    result, _ = await extract_with_usage_async(text, client=client)
+    return result
+
+async def extract_with_usage_async(
+    text: TextLike, client: Optional[httpx.AsyncClient] = None, use_cache: bool = True,
+) -> tuple[Optional[LlmExtraction], LlmUsage]:
+    """`extract_with_llm_async` plus the provider's token usage (zero for cache hits)."""
+    provider = settings.llm_provider
+    if not provider:
+        return None, LlmUsage()
+    chunks = llm_chunks(raw_text(text))
+    if len(chunks) == 1:
+        return await _extract_chunk_async(chunks[0], provider, client, use_cache)
+    # map-reduce, at most LLM_CHUNK_CONCURRENCY chunk calls in flight (like the sync path's pool)
+    limit = asyncio.Semaphore(max(1, settings.llm_chunk_concurrency))
+
+    async def bounded(chunk: str) -> tuple[LlmExtraction, LlmUsage]:
+        async with limit:
+            return await _extract_chunk_async(chunk, provider, client, use_cache)
+    results = await gather_or_cancel(*(bounded(c) for c in chunks))
+    return merge_extractions([r for r, _ in results]), _sum_usage([u for _, u in results])
+
+@timed("llm_extract")
+async def _extract_chunk_async(
+    text: str, provider: str, client: Optional[httpx.AsyncClient], use_cache: bool,
+) -> tuple[LlmExtraction, LlmUsage]:
+    cache, key, hit = cache_lookup(text, provider) if use_cache else (None, "", None)
+    if hit is not None:
+        return hit, LlmUsage(cached=True)
+
+    url, headers, body, timeout = _request_spec(text, provider)
+    data = await post_json_async(client or get_async_client(), provider, url, headers, body, timeout)
+    result = _parse_response(provider, data)
+    usage = response_usage(provider, data)
+    if cache:
+        cache.set(key, asdict(result))
+    return result, usage
+
+_async_client: Optional[httpx.AsyncClient] = None
+_async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def get_async_client() -> httpx.AsyncClient:
+    """Long-lived AsyncClient with connection pooling/keep-alive for the running event loop.
+
+    The API opens it in its lifespan and closes it on shutdown; other callers get one lazily.
+    """
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client.is_closed or _async_client_loop is not loop:
+        import httpx
+        _async_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.llm_max_connections,
+                max_keepalive_connections=settings.llm_max_connections,
+                keepalive_expiry=settings.llm_keepalive_s,
+            ),
+        )
+        _async_client_loop = loop
+    return _async_client
+
+async def close_async_client() -> None:
+    global _async_client, _async_client_loop
+    if _async_client is not None and _async_client_loop is asyncio.get_running_loop():
+        await _async_client.aclose()
+    _async_client, _async_client_loop = None, None
+
+def _request_spec(text: str, provider: str) -> tuple[str, Dict[str, str], Dict[str, Any], float]:
+    """Build (url, headers, body, timeout_s) for one extraction call."""
+    payload_text = USER_PROMPT_TEMPLATE.format(example=json.dumps(DEFAULT_SCHEMA_HINT), text=text[:MAX_INPUT_CHARS])
+    return chat_request(SYSTEM_PROMPT, payload_text, provider)
+
+def chat_request(system: str, payload_text: str, provider: str) -> tuple[str, Dict[str, str], Dict[str, Any], float]:
+    """(url, headers, body, timeout_s) of a chat call with these system and user messages."""
     if provider.lower() == "openai":
         if not settings.openai_api_key:
             raise RuntimeError("OPENAI_API_KEY not set but LLM_PROVIDER=openai")
@@ -67,38 +282,61 @@ def extract_with_llm(text: str) -> Optional[LlmExtraction]:
             "model": settings.openai_model,
             "temperature": 0,
             "messages": [
-                {"role":"system","content": SYSTEM_PROMPT},
+                {"role":"system","content": system},
                 {"role":"user","content": payload_text},
             ],
             "response_format": {"type":"json_object"},
         }
-        with httpx.Client(timeout=45.0) as client:
-            r = client.post(url, headers=headers, json=body)
-            r.raise_for_status()
-            data = r.json()
-        content = data["choices"][0]["message"]["content"]
+        return url, headers, body, 45.0
 
-    elif provider.lower() == "ollama":
+    if provider.lower() == "ollama":
         url = settings.ollama_base_url.rstrip("/") + "/api/chat"
         body = {
             "model": settings.ollama_model,
             "messages": [
-                {"role":"system","content": SYSTEM_PROMPT},
+                {"role":"system","content": system},
                 {"role":"user","content": payload_text},
             ],
             "stream": False,
             "format": "json"
         }
-        with httpx.Client(timeout=60.0) as client:
-            r = client.post(url, json=body)
-            r.raise_for_status()
-            data = r.json()
-        content = data.get("message", {}).get("content", "")
+        return url, {}, body, 60.0
+
+    raise ValueError(f"Unsupported LLM_PROVIDER: {provider}")
+
+def response_content(provider: str, data: Dict[str, Any]) -> str:
+    """The assistant message of a chat response."""
+    if provider.lower() == "openai":
+        return data["choices"][0]["message"]["content"]
+    return data.get("message", {}).get("content", "")
 
+def response_usage(provider: str, data: Dict[str, Any]) -> LlmUsage:
+    """Token usage of a chat response, also counted in LLM_TOKENS."""
+    if provider.lower() == "openai":
+        u = data.get("usage") or {}
+        usage = LlmUsage(int(u.get("prompt_tokens") or 0), int(u.get("completion_tokens") or 0))
     else:
-        raise ValueError(f"Unsupported LLM_PROVIDER: {provider}")
+        usage = LlmUsage(int(data.get("prompt_eval_count") or 0), int(data.get("eval_count") or 0))
+    LLM_TOKENS.inc(usage.prompt_tokens, provider.lower(), "prompt")
+    LLM_TOKENS.inc(usage.completion_tokens, provider.lower(), "completion")
+    return usage
+
+def _extract_uncached(text: str, provider: str) -> tuple[LlmExtraction, LlmUsage]:
+    url, headers, body, timeout = _request_spec(text, provider)
+    data = post_json(provider, url, headers, body, timeout)
+    return _parse_response(provider, data), response_usage(provider, data)
+
+def _parse_response(provider: str, data: Dict[str, Any]) -> LlmExtraction:
+    try:
+        return _parse_extraction(response_content(provider, data))
+    except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+        raise LlmUnavailable("bad_response", f"{type(e).__name__}: {e}") from e
+
+def _parse_extraction(content: str) -> LlmExtraction:
+    return extraction_from_obj(parse_json(content))
 
-    # Parse JSON safely
+def parse_json(content: str) -> Any:
+    """JSON in a model answer, also when it is wrapped in other text."""
     try:
         obj = json.loads(content)
     except json.JSONDecodeError:
@@ -109,7 +347,10 @@ def extract_with_llm(text: str) -> Optional[LlmExtraction]:
             obj = json.loads(content[start:end+1])
         else:
             raise
+    return obj
 
+def extraction_from_obj(obj: Dict[str, Any]) -> LlmExtraction:
+    """An extraction from a parsed JSON object; missing or malformed lists become empty."""
     return LlmExtraction(
         skills=_normalize_list(obj.get("skills")),
         tools=_normalize_list(obj.get("tools")),
@@ -0,0 +1,333 @@
+"""Latency-budgeted, fault-tolerant LLM calls: deadlines, retries, hedging and a circuit breaker.
+
+- Budget: `use_budget(start_budget(s))` bounds every LLM call made inside it (each attempt's
+  timeout is capped by the time left) and collects the reasons LLM results were dropped.
+- Retries: transport errors, 429 and 5xx are retried up to LLM_RETRIES times with full-jitter
+  exponential backoff, never past the deadline.
+- Hedging (async calls): an attempt still unanswered after the provider's recent p95 latency
+  gets a duplicate; the first answer wins and the other is cancelled.
+- Circuit breaker per provider: LLM_BREAKER_FAILURES consecutive failed attempts (the
+  retryable kinds above: a 4xx is the request's fault, not the provider's) open it for
+  LLM_BREAKER_RESET_S, during which calls fail at once; then one trial call decides.
+
+Every failure surfaces as `LlmUnavailable(reason)`; `skill_extract` records it with
+`note_fallback` and carries on without the LLM.
+"""
+from __future__ import annotations
+import asyncio
+import contextvars
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Dict, Iterator, Optional
+
+from ..utils.config import settings
+from ..utils.metrics import LLM_BREAKER_OPEN, LLM_CALLS, LLM_FALLBACKS, LLM_RETRIES
+
+if TYPE_CHECKING:
+    import httpx
+
+class LlmUnavailable(RuntimeError):
+    """No LLM answer: reason is "circuit_open", "deadline_exceeded", "provider_error" or "bad_response"."""
+
+    def __init__(self, reason: str, detail: str = ""):
+        super().__init__(f"LLM unavailable ({reason})" + (f": {detail}" if detail else ""))
+        self.reason = reason
+
+@dataclass
+class LlmBudget:
+    deadline: Optional[float]  # time.monotonic() value, None = unbounded
+    fallbacks: list[str] = field(default_factory=list)
+
+    def time_left(self) -> Optional[float]:
+        return None if self.deadline is None else self.deadline - time.monotonic()
+
+def start_budget(budget_s: Optional[float] = None) -> LlmBudget:
+    """A budget of `budget_s` seconds from now (None: LLM_BUDGET_MS; <= 0: unbounded)."""
+    if budget_s is None:
+        budget_s = settings.llm_budget_ms / 1000.0
+    return LlmBudget(time.monotonic() + budget_s if budget_s > 0 else None)
+
+_budget: contextvars.ContextVar[Optional[LlmBudget]] = contextvars.ContextVar("jdra_llm_budget", default=None)
+
+@contextmanager
+def use_budget(budget: LlmBudget) -> Iterator[LlmBudget]:
+    """Apply `budget` to the LLM calls made inside (and in tasks/threads started inside)."""
+    token = _budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _budget.reset(token)
+
+def time_left() -> Optional[float]:
+    budget = _budget.get()
+    return budget.time_left() if budget is not None else None
+
+def note_fallback(reason: str) -> None:
+    LLM_FALLBACKS.inc(1.0, reason)
+    budget = _budget.get()
+    if budget is not None:
+        budget.fallbacks.append(reason)
+
+async def within_budget(aw: Awaitable[Any]) -> Any:
+    """Await `aw` (e.g. a shared batch future) for at most the time left in the budget."""
+    left = time_left()
+    if left is None:
+        return await aw
+    try:
+        return await asyncio.wait_for(asyncio.shield(aw), max(0.0, left))
+    except asyncio.TimeoutError:
+        raise LlmUnavailable("deadline_exceeded") from None
+
+async def gather_or_cancel(*aws: Awaitable[Any]) -> list[Any]:
+    """`asyncio.gather`, but the first failure cancels the calls still running."""
+    tasks = [asyncio.ensure_future(a) for a in aws]
+    try:
+        return list(await asyncio.gather(*tasks))
+    finally:
+        for t in tasks:
+            t.cancel()
+
+class CircuitBreaker:
+    """closed -> open after `failures` consecutive failures -> half_open after `reset_s`
+    (one trial call) -> closed on success / open again on failure. `failures` <= 0 disables it."""
+
+    def __init__(self, name: str, failures: int, reset_s: float):
+        self.name = name
+        self.failures = failures
+        self.reset_s = reset_s
+        self._lock = threading.Lock()
+        self._consecutive = 0
+        self._opened_at: Optional[float] = None
+        self._trial = False
+
+    def _state_locked(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self._opened_at >= self.reset_s else "open"
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state_locked()
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state_locked()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._consecutive, self._opened_at, self._trial = 0, None, False
+            LLM_BREAKER_OPEN.set(0.0, self.name)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive += 1
+            if self.failures > 0 and (self._trial or self._consecutive >= self.failures):
+                self._opened_at = time.monotonic()
+                LLM_BREAKER_OPEN.set(1.0, self.name)
+            self._trial = False
+
+    def release(self) -> None:
+        """An allowed attempt ended without an outcome (cancelled): free the trial slot."""
+        with self._lock:
+            self._trial = False
+
+class LatencyWindow:
+    """Recent successful call latencies (seconds) for the hedging threshold."""
+
+    def __init__(self, size: int = 200):
+        self._values: deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._values.append(seconds)
+
+    def quantile(self, q: float, min_samples: int) -> Optional[float]:
+        with self._lock:
+            values = sorted(self._values)
+        if not values or len(values) < min_samples:
+            return None
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+_providers: Dict[str, tuple[CircuitBreaker, LatencyWindow]] = {}
+_providers_lock = threading.Lock()
+
+def _provider_state(provider: str) -> tuple[CircuitBreaker, LatencyWindow]:
+    provider = provider.lower()
+    with _providers_lock:
+        state = _providers.get(provider)
+        if state is None:
+            breaker = CircuitBreaker(provider, settings.llm_breaker_failures, settings.llm_breaker_reset_s)
+            state = _providers[provider] = (breaker, LatencyWindow())
+        return state
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    return _provider_state(provider)[0]
+
+def reset_llm_resilience() -> None:
+    """Forget breaker states and latency history (tests, config reloads)."""
+    with _providers_lock:
+        _providers.clear()
+
+def _retryable(e: BaseException) -> bool:
+    import httpx
+    if isinstance(e, httpx.HTTPStatusError):
+        return e.response.status_code == 429 or e.response.status_code >= 500
+    return isinstance(e, (httpx.TransportError, asyncio.TimeoutError))
+
+def _backoff_s(retry: int) -> float:
+    cap = min(settings.llm_backoff_max_ms, settings.llm_backoff_base_ms * 2 ** (retry - 1))
+    return random.uniform(0.0, cap) / 1000.0
+
+def _attempt_timeout(timeout: float) -> float:
+    left = time_left()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise LlmUnavailable("deadline_exceeded")
+    return min(timeout, left)
+
+def _gave_up(provider: str, last: Optional[BaseException]) -> LlmUnavailable:
+    left = time_left()
+    if left is not None and left <= 0:
+        return LlmUnavailable("deadline_exceeded")
+    return LlmUnavailable("provider_error", f"{type(last).__name__}: {last}" if last else "")
+
+def _ok(provider: str, breaker: CircuitBreaker, latency: LatencyWindow, t0: float) -> None:
+    breaker.record_success()
+    latency.observe(time.perf_counter() - t0)
+    LLM_CALLS.inc(1.0, provider, "ok")
+
+def _failed(provider: str, breaker: CircuitBreaker, e: BaseException, capped: bool) -> None:
+    """Record a failed attempt; only retryable errors count toward the breaker. A timeout cut
+    short by the request's budget is the caller's deadline, not a provider failure, and raises
+    `deadline_exceeded` without tripping the breaker."""
+    import httpx
+    LLM_CALLS.inc(1.0, provider, "error")
+    if capped and isinstance(e, (asyncio.TimeoutError, httpx.TimeoutException)):
+        breaker.release()
+        raise LlmUnavailable("deadline_exceeded") from e
+    if not _retryable(e):  # bad request, auth, unparsable answer: the provider is up
+        breaker.release()
+        return
+    breaker.record_failure()
+
+async def _attempt_async(
+    client: httpx.AsyncClient, provider: str, url: str, headers: Dict[str, str], body: Dict[str, Any], timeout: float,
+) -> Dict[str, Any]:
+    breaker, latency = _provider_state(provider)
+    attempt_timeout = _attempt_timeout(timeout)  # checked first: an expired budget is not a provider failure
+    if not breaker.allow():
+        raise LlmUnavailable("circuit_open")
+    t0 = time.perf_counter()
+    try:
+        # wait_for as well: not every transport enforces httpx timeouts
+        r = await asyncio.wait_for(client.post(url, headers=headers, json=body, timeout=attempt_timeout), attempt_timeout)
+        r.raise_for_status()
+        data = r.json()
+    except asyncio.CancelledError:
+        breaker.release()
+        raise
+    except Exception as e:
+        _failed(provider, breaker, e, attempt_timeout < timeout)
+        raise
+    _ok(provider, breaker, latency, t0)
+    return data
+
+async def _hedged_async(
+    client: httpx.AsyncClient, provider: str, url: str, headers: Dict[str, str], body: Dict[str, Any], timeout: float,
+) -> Dict[str, Any]:
+    _, latency = _provider_state(provider)
+    delay = latency.quantile(0.95, settings.llm_hedge_min_samples) if settings.llm_hedge_enabled else None
+    left = time_left()
+    if delay is None or delay >= timeout or (left is not None and delay >= left):
+        return await _attempt_async(client, provider, url, headers, body, timeout)
+
+    tasks = [asyncio.ensure_future(_attempt_async(client, provider, url, headers, body, timeout))]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            LLM_RETRIES.inc(1.0, provider, "hedge")
+            tasks.append(asyncio.ensure_future(_attempt_async(client, provider, url, headers, body, timeout)))
+        error: Optional[BaseException] = None
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for t in done:
+                if t.exception() is None:
+                    return t.result()
+                error = t.exception()
+        raise error
+    finally:
+        for t in tasks:
+            t.cancel()
+
+async def post_json_async(
+    client: httpx.AsyncClient, provider: str, url: str, headers: Dict[str, str], body: Dict[str, Any],
+    timeout: float, hedge: bool = True,
+) -> Dict[str, Any]:
+    """POST to the provider and return its JSON answer, with the budget, retries, hedging
+    and breaker applied; raises `LlmUnavailable` when no answer could be had."""
+    provider = provider.lower()
+    last: Optional[BaseException] = None
+    for attempt in range(max(0, settings.llm_retries) + 1):
+        if attempt:
+            delay, left = _backoff_s(attempt), time_left()
+            if left is not None and delay >= left:
+                break
+            LLM_RETRIES.inc(1.0, provider, "retry")
+            await asyncio.sleep(delay)
+        try:
+            if hedge:
+                return await _hedged_async(client, provider, url, headers, body, timeout)
+            return await _attempt_async(client, provider, url, headers, body, timeout)
+        except LlmUnavailable:
+            raise
+        except Exception as e:
+            if not _retryable(e):
+                raise LlmUnavailable("bad_response" if isinstance(e, ValueError) else "provider_error", str(e)) from e
+            last = e
+    raise _gave_up(provider, last) from last
+
+def post_json(provider: str, url: str, headers: Dict[str, str], body: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+    """Blocking `post_json_async` (budget, retries and breaker; no hedging)."""
+    import httpx
+    provider = provider.lower()
+    breaker, latency = _provider_state(provider)
+    last: Optional[BaseException] = None
+    for attempt in range(max(0, settings.llm_retries) + 1):
+        if attempt:
+            delay, left = _backoff_s(attempt), time_left()
+            if left is not None and delay >= left:
+                break
+            LLM_RETRIES.inc(1.0, provider, "retry")
+            time.sleep(delay)
+        attempt_timeout = _attempt_timeout(timeout)
+        if not breaker.allow():
+            raise LlmUnavailable("circuit_open")
+        t0 = time.perf_counter()
+        try:
+            with httpx.Client(timeout=attempt_timeout) as client:
+                r = client.post(url, headers=headers, json=body)
+                r.raise_for_status()
+                data = r.json()
+        except Exception as e:
+            _failed(provider, breaker, e, attempt_timeout < timeout)
+            if not _retryable(e):
+                raise LlmUnavailable("bad_response" if isinstance(e, ValueError) else "provider_error", str(e)) from e
+            last = e
+            continue
+        _ok(provider, breaker, latency, t0)
+        return data
+    raise _gave_up(provider, last) from last
@@ -1,10 +1,16 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Optional, Dict, Any
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Dict, Optional
 
-from .baseline_similarity import baseline_compare, BaselineResult
-from .llm_extract import extract_with_llm, LlmExtraction
-from ..utils.text import unique_preserve_order
+from .baseline_similarity import baseline_compare, baseline_compare_many, BaselineResult
+from .incremental import baseline_compare_sections, section_explanation, use_sections
+from .llm_extract import LlmExtraction
+from .llm_resilience import LlmBudget, start_budget, use_budget
+from .skill_extract import (
+    extract_skills, extract_skills_async, extract_skills_sections, extract_skills_sections_async,
+)
+from ..preprocessing.document import TextLike, as_document
 
 @dataclass
 class AnalyzeResult:
@@ -16,6 +22,20 @@ class AnalyzeResult:
     recommended_keywords: list[str]
     explanations: Dict[str, Any]
 
+@dataclass
+class RankedResult:
+    index: int
+    match_score: float
+    baseline: BaselineResult
+
+TFIDF_WEIGHT = 0.55
+COVERAGE_WEIGHT = 0.45
+
+def blend_score(base: BaselineResult) -> float:
+    """Blended score: baseline similarity + keyword coverage, clipped to [0, 1]."""
+    match_score = TFIDF_WEIGHT * base.tfidf_score + COVERAGE_WEIGHT * base.keyword_coverage
+    return max(0.0, min(1.0, float(match_score)))
+
 def _merge_skill_dict(llm: Optional[LlmExtraction]) -> Dict[str, list[str]]:
     if not llm:
         return {"skills": [], "tools": [], "requirements": []}
@@ -25,30 +45,101 @@ def _merge_skill_dict(llm: Optional[LlmExtraction]) -> Dict[str, list[str]]:
         "requirements": llm.requirements,
     }
 
-def analyze(resume_text: str, job_text: str) -> AnalyzeResult:
-    base = baseline_compare(resume_text, job_text)
+# (extraction, source) for a JD whose skills were extracted ahead of time (see job_profiles)
+JobSkills = tuple[Optional[LlmExtraction], str]
 
-    llm_resume = extract_with_llm(resume_text)
-    llm_job = extract_with_llm(job_text)
+async def _job_skills_async(job, job_skills: Optional[JobSkills]) -> JobSkills:
+    return job_skills if job_skills is not None else await extract_skills_async(job)
 
-    s_resume = _merge_skill_dict(llm_resume)
-    s_job = _merge_skill_dict(llm_job)
+def analyze(
+    resume_text: TextLike, job_text: TextLike, job_skills: Optional[JobSkills] = None, llm_budget_s: Optional[float] = None,
+) -> AnalyzeResult:
+    """Score a resume against a JD; pass `job_skills` to reuse a precomputed JD extraction.
+
+    LLM calls share `llm_budget_s` (default LLM_BUDGET_MS); when the LLM is unavailable the
+    result falls back to the baseline (and dictionary) with the reasons in `llm_fallback`.
+    """
+    resume, job = as_document(resume_text), as_document(job_text)
+    with use_budget(start_budget(llm_budget_s)) as budget:
+        if use_sections(resume):
+            base, kw_changed = baseline_compare_sections(resume, job)
+            llm_resume, src_resume, llm_changed = extract_skills_sections(resume)
+            llm_job, src_job = job_skills if job_skills is not None else extract_skills(job)
+            result = build_result(base, llm_resume, llm_job, {"resume": src_resume, "job": src_job}, budget)
+            result.explanations["sections"] = section_explanation(resume, kw_changed, llm_changed)
+            return result
+
+        base = baseline_compare(resume, job)
+
+        llm_resume, src_resume = extract_skills(resume)
+        llm_job, src_job = job_skills if job_skills is not None else extract_skills(job)
+        return build_result(base, llm_resume, llm_job, {"resume": src_resume, "job": src_job}, budget)
+
+async def analyze_async(
+    resume_text: TextLike, job_text: TextLike, job_skills: Optional[JobSkills] = None, llm_budget_s: Optional[float] = None,
+) -> AnalyzeResult:
+    """Async `analyze`: both skill extractions and the (thread-offloaded) baseline run concurrently."""
+    resume, job = as_document(resume_text), as_document(job_text)
+    with use_budget(start_budget(llm_budget_s)) as budget:
+        if use_sections(resume):
+            (base, kw_changed), (llm_resume, src_resume, llm_changed), (llm_job, src_job) = await asyncio.gather(
+                asyncio.to_thread(baseline_compare_sections, resume, job),
+                extract_skills_sections_async(resume),
+                _job_skills_async(job, job_skills),
+            )
+            result = build_result(base, llm_resume, llm_job, {"resume": src_resume, "job": src_job}, budget)
+            result.explanations["sections"] = section_explanation(resume, kw_changed, llm_changed)
+            return result
 
-    # recommended keywords: LLM job tools/skills not present in resume LLM outputs
-    resume_all = set(unique_preserve_order(s_resume["skills"] + s_resume["tools"] + s_resume["requirements"]))
-    job_all = unique_preserve_order(s_job["skills"] + s_job["tools"] + s_job["requirements"])
-    recommended = [k for k in job_all if k not in resume_all]
+        base, (llm_resume, src_resume), (llm_job, src_job) = await asyncio.gather(
+            asyncio.to_thread(baseline_compare, resume, job),
+            extract_skills_async(resume),
+            _job_skills_async(job, job_skills),
+        )
+        return build_result(base, llm_resume, llm_job, {"resume": src_resume, "job": src_job}, budget)
 
-    # blended score: baseline similarity + keyword coverage
-    match_score = 0.55 * base.tfidf_score + 0.45 * base.keyword_coverage
-    match_score = max(0.0, min(1.0, float(match_score)))
+def recommended_keywords(s_resume: Dict[str, list[str]], s_job: Dict[str, list[str]]) -> list[str]:
+    """Job tools/skills/requirements not present in the resume's extracted ones."""
+    # extractions are normalized on parse, so plain set/dict dedup is enough
+    resume_all = set(s_resume["skills"] + s_resume["tools"] + s_resume["requirements"])
+    job_all = dict.fromkeys(s_job["skills"] + s_job["tools"] + s_job["requirements"])
+    return [k for k in job_all if k not in resume_all]
 
-    explanations = {
-        "score_blend": {"tfidf_weight": 0.55, "coverage_weight": 0.45},
+def _explanations(
+    base: BaselineResult, llm_enabled: bool, sources: Optional[Dict[str, str]] = None, budget: Optional[LlmBudget] = None,
+) -> Dict[str, Any]:
+    out = {
+        "score_blend": {"tfidf_weight": TFIDF_WEIGHT, "coverage_weight": COVERAGE_WEIGHT},
         "tfidf_score": base.tfidf_score,
         "keyword_coverage": base.keyword_coverage,
-        "llm_enabled": bool(llm_job or llm_resume),
+        "llm_enabled": llm_enabled,
     }
+    if sources is not None:
+        out["skill_sources"] = sources
+    if budget is not None and budget.fallbacks:
+        # why LLM results are missing: circuit_open, deadline_exceeded, provider_error, bad_response
+        out["llm_fallback"] = list(dict.fromkeys(budget.fallbacks))
+    return out
+
+def _llm_used(sources: Dict[str, str]) -> bool:
+    return any("llm" in s for s in sources.values())
+
+def build_result(
+    base: BaselineResult, llm_resume: Optional[LlmExtraction], llm_job: Optional[LlmExtraction],
+    sources: Optional[Dict[str, str]] = None, budget: Optional[LlmBudget] = None,
+) -> AnalyzeResult:
+    """Combine a baseline result and optional skill extractions into an `AnalyzeResult`.
+
+    `sources` ({"resume": ..., "job": ...}, see `skill_extract.combine`) says whether the
+    extractions came from the LLM; without it any extraction counts as an LLM one. The
+    `budget`'s fallback reasons, if any, go to `explanations["llm_fallback"]`.
+    """
+    s_resume = _merge_skill_dict(llm_resume)
+    s_job = _merge_skill_dict(llm_job)
+    recommended = recommended_keywords(s_resume, s_job)
+    match_score = blend_score(base)
+    llm_enabled = _llm_used(sources) if sources is not None else bool(llm_job or llm_resume)
+    explanations = _explanations(base, llm_enabled, sources, budget)
 
     return AnalyzeResult(
         match_score=match_score,
@@ -59,3 +150,72 @@ def analyze(resume_text: str, job_text: str) -> AnalyzeResult:
         recommended_keywords=recommended[:25],
         explanations=explanations,
     )
+
+async def _in_budget(budget: LlmBudget, aw):
+    with use_budget(budget):
+        return await aw
+
+async def analyze_stream(
+    resume_text: TextLike, job_text: TextLike, job_skills: Optional[JobSkills] = None, llm_budget_s: Optional[float] = None,
+) -> AsyncIterator[tuple[str, Dict[str, Any]]]:
+    """Yield `analyze` results as (event, payload) pairs, as soon as each part is ready.
+
+    Order: `baseline` (with the blended `match_score`), then `skills_job` / `skills_resume`
+    in completion order, then `recommended_keywords` and finally `done` with the explanations.
+    Closing the generator early (e.g. on client disconnect) cancels the LLM calls still running.
+    """
+    resume, job = as_document(resume_text), as_document(job_text)
+    sectioned = use_sections(resume)
+    # the budget is bound inside each task: a generator must not hold a context var across yields
+    budget = start_budget(llm_budget_s)
+    if sectioned:
+        resume_task = asyncio.ensure_future(_in_budget(budget, extract_skills_sections_async(resume)))
+    else:
+        resume_task = asyncio.ensure_future(_in_budget(budget, extract_skills_async(resume)))
+    job_task = asyncio.ensure_future(_in_budget(budget, _job_skills_async(job, job_skills)))
+    names = {resume_task: "skills_resume", job_task: "skills_job"}
+    try:
+        if sectioned:
+            base, kw_changed = await asyncio.to_thread(baseline_compare_sections, resume, job)
+        else:
+            base, kw_changed = await asyncio.to_thread(baseline_compare, resume, job), []
+        yield "baseline", {
+            "match_score": blend_score(base),
+            "baseline": asdict(base),
+            "missing_keywords": base.missing_keywords[:25],
+        }
+
+        skills: Dict[str, Dict[str, list[str]]] = {}
+        sources: Dict[str, str] = {}
+        llm_changed: list[str] = []
+        pending = set(names)
+        while pending:
+            finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(finished, key=names.get):
+                if task is resume_task and sectioned:
+                    llm, source, llm_changed = task.result()
+                else:
+                    llm, source = task.result()
+                sources[names[task].removeprefix("skills_")] = source
+                skills[names[task]] = _merge_skill_dict(llm)
+                yield names[task], skills[names[task]]
+
+        yield "recommended_keywords", {"recommended_keywords": recommended_keywords(skills["skills_resume"], skills["skills_job"])[:25]}
+        explanations = _explanations(base, _llm_used(sources), {"resume": sources["resume"], "job": sources["job"]}, budget)
+        if sectioned:
+            explanations["sections"] = section_explanation(resume, kw_changed, llm_changed)
+        yield "done", {"explanations": explanations}
+    finally:
+        for t in (resume_task, job_task):
+            t.cancel()
+
+def analyze_many(resume_texts: list[TextLike], job_texts: list[TextLike], top_n: Optional[int] = 10) -> list[RankedResult]:
+    """Rank one resume against many JDs, or one JD against many resumes (baseline only).
+
+    `index` refers to the position in the multi-item list. Results are sorted by
+    `match_score` (descending) and truncated to `top_n` when given.
+    """
+    bases = baseline_compare_many(resume_texts, job_texts)
+    ranked = [RankedResult(index=i, match_score=blend_score(b), baseline=b) for i, b in enumerate(bases)]
+    ranked.sort(key=lambda r: r.match_score, reverse=True)
+    return ranked[:top_n] if top_n else ranked
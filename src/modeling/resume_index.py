@@ -0,0 +1,167 @@
+from __future__ import annotations
+import heapq
+import math
+import sqlite3
+import threading
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from ..features.keyword_extractor import STOPWORDS, extract_keywords
+from ..preprocessing.document import TextLike, as_document
+from ..utils.config import settings
+from ..utils.metrics import timed
+from .baseline_similarity import BaselineResult
+from .ranker import analyze_many
+
+@dataclass
+class SearchHit:
+    resume_id: str
+    match_score: float
+    baseline: BaselineResult
+
+def _term_weights(text: TextLike, min_len: int = 3) -> Dict[str, float]:
+    """Sublinear TF weights over the same tokens `extract_keywords` keeps."""
+    counts = as_document(text).token_counts()
+    return {t: 1.0 + math.log(c) for t, c in counts.items() if len(t) >= min_len and t not in STOPWORDS}
+
+class ResumeIndex:
+    """On-disk (SQLite) inverted index of resumes for "top-N resumes for this JD".
+
+    Postings are stored clustered by term with their length-normalized TF weight; document frequencies are
+    kept per term so IDF is computed at query time and resumes can be added/removed
+    incrementally without a rebuild. A query only reads the postings of its own terms,
+    rarest (most discriminative) first, each capped at its `postings_per_term` highest-weight
+    entries and all of them at `max_postings`; terms found in more than `max_df_ratio` of
+    resumes are skipped. Query cost is therefore bounded no matter how large the store gets.
+    The shortlist is then rescored exactly with `ranker.analyze_many`.
+    """
+
+    def __init__(self, path: str, postings_per_term: int = 1000, max_postings: int = 10000, max_df_ratio: float = 0.5):
+        self.postings_per_term = postings_per_term
+        self.max_postings = max_postings
+        self.max_df_ratio = max_df_ratio
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA cache_size=-65536;
+            CREATE TABLE IF NOT EXISTS resumes (id TEXT PRIMARY KEY, text TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS terms (term TEXT PRIMARY KEY, df INTEGER NOT NULL) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL, resume_id TEXT NOT NULL, weight REAL NOT NULL,
+                PRIMARY KEY (term, resume_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_postings_impact ON postings(term, weight DESC);
+            CREATE INDEX IF NOT EXISTS idx_postings_resume ON postings(resume_id);
+        """)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _remove_locked(self, resume_id: str) -> bool:
+        terms = [r[0] for r in self._db.execute("SELECT term FROM postings WHERE resume_id = ?", (resume_id,))]
+        self._db.executemany("UPDATE terms SET df = df - 1 WHERE term = ?", ((t,) for t in terms))
+        self._db.executemany("DELETE FROM terms WHERE term = ? AND df <= 0", ((t,) for t in terms))
+        self._db.execute("DELETE FROM postings WHERE resume_id = ?", (resume_id,))
+        return self._db.execute("DELETE FROM resumes WHERE id = ?", (resume_id,)).rowcount > 0
+
+    def _add_locked(self, text: str, resume_id: str) -> None:
+        weights = _term_weights(text)
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        self._remove_locked(resume_id)
+        self._db.execute("INSERT INTO resumes(id, text) VALUES (?, ?)", (resume_id, text))
+        # length-normalized TF, so scoring needs nothing beyond the postings themselves
+        self._db.executemany(
+            "INSERT INTO postings(term, resume_id, weight) VALUES (?, ?, ?)",
+            ((t, resume_id, w / norm) for t, w in weights.items()),
+        )
+        self._db.executemany(
+            "INSERT INTO terms(term, df) VALUES (?, 1) ON CONFLICT(term) DO UPDATE SET df = df + 1",
+            ((t,) for t in weights),
+        )
+
+    def add(self, text: str, resume_id: Optional[str] = None) -> str:
+        """Index (or re-index) one resume and return its id."""
+        resume_id = resume_id or uuid.uuid4().hex
+        with self._lock, self._db:
+            self._add_locked(text, resume_id)
+        return resume_id
+
+    def add_many(self, items: Iterable[tuple[Optional[str], str]]) -> list[str]:
+        """Index many (resume_id, text) pairs in a single transaction."""
+        ids = []
+        with self._lock, self._db:
+            for resume_id, text in items:
+                resume_id = resume_id or uuid.uuid4().hex
+                self._add_locked(text, resume_id)
+                ids.append(resume_id)
+        return ids
+
+    def remove(self, resume_id: str) -> bool:
+        with self._lock, self._db:
+            return self._remove_locked(resume_id)
+
+    def get_text(self, resume_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT text FROM resumes WHERE id = ?", (resume_id,)).fetchone()
+        return row[0] if row else None
+
+    @timed("index_shortlist")
+    def shortlist(self, job_text: TextLike, k: int = 200) -> list[tuple[str, float]]:
+        """Candidate resumes for a JD by accumulated TF-IDF dot product over postings."""
+        # every distinct JD keyword counts once
+        query = dict.fromkeys(extract_keywords(job_text), 1.0)
+        if not query:
+            return []
+        with self._lock:
+            n_docs = self._db.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+            if not n_docs:
+                return []
+            marks = ",".join("?" * len(query))
+            dfs = dict(self._db.execute(f"SELECT term, df FROM terms WHERE term IN ({marks})", list(query)))
+            scores: Dict[str, float] = {}
+            budget = self.max_postings
+            for term, df in sorted(dfs.items(), key=lambda x: x[1]):
+                # near-universal terms barely move the ranking but have the longest postings
+                if budget <= 0 or (n_docs > 10 and df / n_docs > self.max_df_ratio):
+                    break
+                idf = math.log((n_docs + 1) / (df + 1)) + 1.0
+                qw = query[term] * idf * idf
+                rows = self._db.execute(
+                    "SELECT resume_id, weight FROM postings WHERE term = ? ORDER BY weight DESC LIMIT ?",
+                    (term, min(self.postings_per_term, budget)),
+                ).fetchall()
+                budget -= len(rows)
+                for rid, w in rows:
+                    scores[rid] = scores.get(rid, 0.0) + qw * w
+        return heapq.nlargest(k, scores.items(), key=lambda x: x[1])
+
+    def search(self, job_text: TextLike, top_n: int = 10, shortlist: int = 200) -> list[SearchHit]:
+        """Shortlist via the index, then rescore exactly with the `ranker` blend."""
+        job_text = as_document(job_text)
+        ids = [rid for rid, _ in self.shortlist(job_text, k=max(shortlist, top_n))]
+        texts = [self.get_text(rid) for rid in ids]
+        pairs = [(rid, t) for rid, t in zip(ids, texts) if t]
+        if not pairs:
+            return []
+        ranked = analyze_many(resume_texts=[t for _, t in pairs], job_texts=[job_text], top_n=top_n)
+        return [SearchHit(resume_id=pairs[r.index][0], match_score=r.match_score, baseline=r.baseline) for r in ranked]
+
+_index: Optional[ResumeIndex] = None
+_index_lock = threading.Lock()
+
+def get_resume_index() -> ResumeIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = ResumeIndex(settings.resume_index_path)
+        return _index
@@ -0,0 +1,101 @@
+"""Skill/tool extraction for `skills_resume` / `skills_job`.
+
+SKILL_EXTRACTOR selects the source: "llm" (the original behaviour), "dictionary" (the
+Aho-Corasick taxonomy only, no LLM calls) or "hybrid" (the dictionary first, and the LLM
+only when it found fewer than SKILL_MIN_MATCHES distinct skills/tools). Requirements are
+free text, so they only ever come from the LLM.
+
+When the LLM is unavailable (`LlmUnavailable`: breaker open, budget spent, provider errors)
+the dictionary result is used alone and the reason is noted on the request's budget.
+"""
+from __future__ import annotations
+from typing import Optional
+
+from ..features.skill_taxonomy import get_skill_taxonomy
+from ..preprocessing.document import Document, TextLike
+from ..utils.config import settings
+from ..utils.metrics import timed
+from .incremental import extract_sections, extract_sections_async
+from .llm_extract import LlmExtraction, extract_with_llm, extract_with_llm_async, merge_extractions
+from .llm_resilience import LlmUnavailable, note_fallback
+
+EXTRACTORS = ("llm", "dictionary", "hybrid")
+
+def _mode(mode: Optional[str]) -> str:
+    mode = (mode or settings.skill_extractor).lower()
+    if mode not in EXTRACTORS:
+        raise ValueError(f"Unknown skill extractor {mode!r}; expected one of {', '.join(EXTRACTORS)}")
+    return mode
+
+@timed("skill_dictionary")
+def dictionary_extraction(text: TextLike) -> Optional[LlmExtraction]:
+    """Taxonomy matches as an extraction (no requirements); None without a taxonomy."""
+    taxonomy = get_skill_taxonomy()
+    if taxonomy is None:
+        return None
+    found = taxonomy.extract(text)
+    return LlmExtraction(skills=found["skills"], tools=found["tools"], requirements=[])
+
+def needs_llm(found: Optional[LlmExtraction], mode: Optional[str] = None) -> bool:
+    """Whether the LLM should be called given the dictionary result (hybrid: low coverage)."""
+    # no provider check here: the LLM functions return None when LLM_PROVIDER is unset
+    mode = _mode(mode)
+    if mode == "dictionary":
+        return False
+    return mode == "llm" or found is None or len(found.skills) + len(found.tools) < settings.skill_min_matches
+
+def combine(found: Optional[LlmExtraction], llm: Optional[LlmExtraction]) -> tuple[Optional[LlmExtraction], str]:
+    """LLM items first, then dictionary-only ones, plus which sources contributed."""
+    source = "+".join(name for name, r in (("dictionary", found), ("llm", llm)) if r is not None)
+    return merge_extractions([llm, found]), source or "none"
+
+def _dictionary(text: TextLike, mode: str) -> Optional[LlmExtraction]:
+    return None if mode == "llm" else dictionary_extraction(text)
+
+def _llm(text: TextLike) -> Optional[LlmExtraction]:
+    try:
+        return extract_with_llm(text)
+    except LlmUnavailable as e:
+        note_fallback(e.reason)
+        return None
+
+async def _llm_async(text: TextLike) -> Optional[LlmExtraction]:
+    try:
+        return await extract_with_llm_async(text)
+    except LlmUnavailable as e:
+        note_fallback(e.reason)
+        return None
+
+def extract_skills(text: TextLike, mode: Optional[str] = None) -> tuple[Optional[LlmExtraction], str]:
+    """(extraction, source) where source is "dictionary", "llm", "dictionary+llm" or "none"."""
+    mode = _mode(mode)
+    found = _dictionary(text, mode)
+    return combine(found, _llm(text) if needs_llm(found, mode) else None)
+
+async def extract_skills_async(text: TextLike, mode: Optional[str] = None) -> tuple[Optional[LlmExtraction], str]:
+    mode = _mode(mode)
+    found = _dictionary(text, mode)
+    return combine(found, await _llm_async(text) if needs_llm(found, mode) else None)
+
+def extract_skills_sections(resume: Document, mode: Optional[str] = None) -> tuple[Optional[LlmExtraction], str, list[str]]:
+    """`extract_skills` whose LLM part runs per section (see `incremental.extract_sections`)."""
+    mode = _mode(mode)
+    found = _dictionary(resume, mode)
+    llm, recomputed = None, []
+    if needs_llm(found, mode):
+        try:
+            llm, recomputed = extract_sections(resume)
+        except LlmUnavailable as e:
+            note_fallback(e.reason)
+    return (*combine(found, llm), recomputed)
+
+async def extract_skills_sections_async(resume: Document, mode: Optional[str] = None) -> tuple[Optional[LlmExtraction], str, list[str]]:
+    mode = _mode(mode)
+    found = _dictionary(resume, mode)
+    llm, recomputed = None, []
+    if needs_llm(found, mode):
+        try:
+            llm, recomputed = await extract_sections_async(resume)
+        except LlmUnavailable as e:
+            note_fallback(e.reason)
+    return (*combine(found, llm), recomputed)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+import math
+
+from .document import TextLike, as_document
+
+# Rough chars-per-token ratio for English prose with common tokenizers; only used to turn a
+# token budget into a character budget, so it errs on the small-chunk side.
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+def _split_long(text: str, budget: int) -> list[str]:
+    """Split one oversized span on line boundaries, and an oversized line on whitespace."""
+    pieces: list[str] = []
+    for line in text.splitlines():
+        while len(line) > budget:
+            cut = line.rfind(" ", 0, budget + 1)
+            if cut <= 0:
+                cut = budget
+            pieces.append(line[:cut])
+            line = line[cut:].lstrip()
+        pieces.append(line)
+    return pieces
+
+def chunk_text(text: TextLike, max_tokens: int) -> list[str]:
+    """Split a document into chunks of at most ~`max_tokens`, never dropping content.
+
+    Section spans (`Document.spans`: header line plus body) are packed greedily in order, so a
+    chunk boundary falls between sections whenever possible; a section larger than the budget
+    is split between lines. A text within budget comes back unchanged as a single chunk.
+    """
+    doc = as_document(text)
+    budget = max(1, max_tokens) * CHARS_PER_TOKEN
+    if len(doc.raw) <= budget:
+        return [doc.raw]
+
+    chunks: list[str] = []
+    buf: list[str] = []
+    size = 0
+    for _, span in doc.spans:
+        for piece in ([span] if len(span) <= budget else _split_long(span, budget)):
+            if buf and size + 1 + len(piece) > budget:
+                chunks.append("\n".join(buf))
+                buf, size = [], 0
+            size += len(piece) + (1 if buf else 0)
+            buf.append(piece)
+    if buf:
+        chunks.append("\n".join(buf))
+    return [c for c in chunks if c.strip()]
@@ -0,0 +1,141 @@
+from __future__ import annotations
+import sys
+from typing import Any, Callable, Dict, Optional, Union
+import numpy as np
+
+from ..utils.text import _WORD_RE, normalize_token
+from .clean_text import clean_text
+from .section_parser import parse_sections, section_spans
+
+class Document:
+    """One input text, preprocessed lazily and at most once per form.
+
+    Every stage of a request (TF-IDF, keyword extraction, fuzzy matching, the LLM call)
+    reads the form it needs from here instead of re-cleaning / re-tokenizing `raw`:
+
+    - `clean`: `clean_text(raw)`, the TF-IDF input
+    - `normalized`: `normalize_token(raw)`, the fuzzy-matching haystack
+    - `vocab` / `token_ids`: distinct lowercase tokens (interned, first-seen order) and the
+      int32 array of indices into `vocab`, one per token in `raw`
+    - `sections`: `parse_sections(raw)`; `spans`: `section_spans(raw)`
+    - `derived(key, compute)`: forms owned by other components (e.g. a TF-IDF row per model)
+
+    `prime` seeds forms computed earlier (see `modeling.job_profiles`), so a stored JD is
+    never re-cleaned, re-tokenized for keywords or re-vectorized.
+    """
+
+    __slots__ = (
+        "raw", "_clean", "_normalized", "_vocab", "_token_ids", "_sections", "_spans", "_keywords", "_derived",
+    )
+
+    def __init__(self, raw: str):
+        self.raw = raw or ""
+        self._clean: Optional[str] = None
+        self._normalized: Optional[str] = None
+        self._vocab: Optional[list[str]] = None
+        self._token_ids: Optional[np.ndarray] = None
+        self._sections: Optional[Dict[str, str]] = None
+        self._spans: Optional[list[tuple[str, str]]] = None
+        self._keywords: Optional[Dict[tuple, list[str]]] = None
+        self._derived: Optional[Dict[Any, Any]] = None
+
+    def __repr__(self) -> str:
+        return f"Document({len(self.raw)} chars)"
+
+    @property
+    def clean(self) -> str:
+        if self._clean is None:
+            self._clean = clean_text(self.raw)
+        return self._clean
+
+    @property
+    def normalized(self) -> str:
+        if self._normalized is None:
+            self._normalized = normalize_token(self.raw)
+        return self._normalized
+
+    def _tokenize(self) -> None:
+        index: Dict[str, int] = {}
+        ids = []
+        for m in _WORD_RE.finditer(self.raw):
+            t = m.group(0).lower()
+            i = index.get(t)
+            if i is None:
+                i = index[sys.intern(t)] = len(index)
+            ids.append(i)
+        self._vocab = list(index)
+        self._token_ids = np.fromiter(ids, dtype=np.int32, count=len(ids))
+
+    @property
+    def vocab(self) -> list[str]:
+        if self._vocab is None:
+            self._tokenize()
+        return self._vocab
+
+    @property
+    def token_ids(self) -> np.ndarray:
+        if self._token_ids is None:
+            self._tokenize()
+        return self._token_ids
+
+    @property
+    def tokens(self) -> list[str]:
+        """Same as `utils.text.tokens(raw)`, rebuilt from the id array."""
+        vocab = self.vocab
+        return [vocab[i] for i in self.token_ids.tolist()]
+
+    def token_counts(self) -> Dict[str, int]:
+        counts = np.bincount(self.token_ids, minlength=len(self.vocab))
+        return dict(zip(self.vocab, counts.tolist()))
+
+    @property
+    def sections(self) -> Dict[str, str]:
+        if self._sections is None:
+            self._sections = parse_sections(self.raw).sections
+        return self._sections
+
+    @property
+    def spans(self) -> list[tuple[str, str]]:
+        if self._spans is None:
+            self._spans = section_spans(self.raw)
+        return self._spans
+
+    def keywords(self, min_len: int = 3, stopwords: frozenset[str] = frozenset()) -> list[str]:
+        """Distinct tokens of at least `min_len` chars not in `stopwords`, in first-seen order."""
+        if self._keywords is None:
+            self._keywords = {}
+        key = (min_len, stopwords)
+        kw = self._keywords.get(key)
+        if kw is None:
+            # vocab is already lowercase, unique and whitespace-free: no re-normalization needed
+            kw = self._keywords[key] = [t for t in self.vocab if len(t) >= min_len and t not in stopwords]
+        return kw
+
+    def derived(self, key: Any, compute: Callable[[], Any]) -> Any:
+        """`compute()` once per `key` for this text, e.g. ("tfidf", model version) -> row."""
+        if self._derived is None:
+            self._derived = {}
+        if key not in self._derived:
+            self._derived[key] = compute()
+        return self._derived[key]
+
+    def prime(
+        self, clean: Optional[str] = None, keywords: Optional[Dict[tuple, list[str]]] = None,
+        derived: Optional[Dict[Any, Any]] = None,
+    ) -> "Document":
+        """Seed precomputed forms; `keywords` is keyed like `keywords()`: (min_len, stopwords)."""
+        if clean is not None:
+            self._clean = clean
+        if keywords:
+            self._keywords = {**(self._keywords or {}), **keywords}
+        if derived:
+            self._derived = {**(self._derived or {}), **derived}
+        return self
+
+TextLike = Union[str, Document]
+
+def as_document(text: TextLike) -> Document:
+    return text if isinstance(text, Document) else Document(text)
+
+def raw_text(text: TextLike) -> str:
+    return text.raw if isinstance(text, Document) else (text or "")
@@ -1,7 +1,7 @@
 from __future__ import annotations
 import re
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, List, Tuple
 
 SECTION_HEADERS = [
     "summary","professional summary","about",
@@ -38,3 +38,27 @@ def parse_sections(raw_text: str) -> Sections:
     if buf:
         sections[current] = "\n".join(buf).strip()
     return Sections(sections=sections)
+
+def section_spans(raw_text: str) -> List[Tuple[str, str]]:
+    """Ordered (name, text) spans that keep each header line with its body.
+
+    Unlike `parse_sections`, no line is dropped, so the spans cover the whole input;
+    repeated section names get a `#2`, `#3`, ... suffix. Empty spans are skipped.
+    """
+    spans: List[Tuple[str, str]] = []
+    seen: Dict[str, int] = {}
+    current, buf = "body", []
+
+    def flush():
+        text = "\n".join(buf).strip()
+        if text:
+            n = seen[current] = seen.get(current, 0) + 1
+            spans.append((current if n == 1 else f"{current}#{n}", text))
+
+    for ln in (raw_text or "").splitlines():
+        if _HEADER_RE.match(ln.strip().lower()):
+            flush()
+            current, buf = ln.strip().lower(), []
+        buf.append(ln)
+    flush()
+    return spans
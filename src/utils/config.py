@@ -5,6 +5,12 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+def _env_bool(name: str, default: bool) -> bool:
+    v = os.getenv(name)
+    if v is None or not v.strip():
+        return default
+    return v.strip().lower() in ("1", "true", "yes", "on")
+
 @dataclass(frozen=True)
 class Settings:
     app_log_level: str = os.getenv("APP_LOG_LEVEL", "INFO")
@@ -18,4 +24,103 @@ class Settings:
     ollama_base_url: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
     ollama_model: str = os.getenv("OLLAMA_MODEL", "llama3.1")
 
+    # Shared async HTTP client for LLM calls
+    llm_max_connections: int = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+    llm_keepalive_s: float = float(os.getenv("LLM_KEEPALIVE_S", "30"))
+
+    # Resilient LLM calls: latency budget for all LLM calls of one request (0 = none; overridden
+    # by AnalyzeRequest.llm_budget_ms), retries with full-jitter exponential backoff, a hedged
+    # duplicate once an attempt exceeds the provider's recent p95 latency, and a circuit breaker
+    # that opens after consecutive failures and lets a trial call through after the reset time
+    llm_budget_ms: float = float(os.getenv("LLM_BUDGET_MS", "20000"))
+    llm_retries: int = int(os.getenv("LLM_RETRIES", "2"))
+    llm_backoff_base_ms: float = float(os.getenv("LLM_BACKOFF_BASE_MS", "200"))
+    llm_backoff_max_ms: float = float(os.getenv("LLM_BACKOFF_MAX_MS", "2000"))
+    llm_hedge_enabled: bool = _env_bool("LLM_HEDGE_ENABLED", True)
+    llm_hedge_min_samples: int = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+    llm_breaker_failures: int = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+    llm_breaker_reset_s: float = float(os.getenv("LLM_BREAKER_RESET_S", "30"))
+
+    # Map-reduce extraction of long documents: chunks of at most this many (estimated) tokens,
+    # split between sections where possible; 0 disables chunking (truncate at 12000 chars).
+    # The default (~12000 chars) never splits a document that fits one untruncated prompt.
+    llm_chunk_tokens: int = int(os.getenv("LLM_CHUNK_TOKENS", "3000"))
+    llm_chunk_concurrency: int = int(os.getenv("LLM_CHUNK_CONCURRENCY", "4"))
+
+    # Micro-batching of concurrent async LLM extractions into one multi-document prompt
+    llm_batch_enabled: bool = _env_bool("LLM_BATCH_ENABLED", False)
+    llm_batch_window_ms: float = float(os.getenv("LLM_BATCH_WINDOW_MS", "20"))
+    llm_batch_max_items: int = int(os.getenv("LLM_BATCH_MAX_ITEMS", "8"))
+    llm_batch_max_chars: int = int(os.getenv("LLM_BATCH_MAX_CHARS", "24000"))
+    llm_batch_concurrency: int = int(os.getenv("LLM_BATCH_CONCURRENCY", "4"))
+
+    # LLM extraction cache (in-memory LRU + SQLite)
+    llm_cache_enabled: bool = _env_bool("LLM_CACHE_ENABLED", True)
+    llm_cache_path: str = os.getenv("LLM_CACHE_PATH", ".cache/llm_extractions.sqlite")
+    llm_cache_ttl_s: float = float(os.getenv("LLM_CACHE_TTL_S", str(7 * 24 * 3600)))
+    llm_cache_memory_items: int = int(os.getenv("LLM_CACHE_MEMORY_ITEMS", "512"))
+    llm_cache_max_items: int = int(os.getenv("LLM_CACHE_MAX_ITEMS", "50000"))
+
+    # Skill/tool extraction: "llm", "dictionary" (taxonomy only) or "hybrid" (taxonomy, plus the
+    # LLM when fewer than skill_min_matches distinct skills/tools were found; JDs the dictionary
+    # covers get no requirements)
+    skill_extractor: str = os.getenv("SKILL_EXTRACTOR", "llm").strip().lower()
+    skill_min_matches: int = int(os.getenv("SKILL_MIN_MATCHES", "5"))
+    skill_taxonomy_path: str = os.getenv("SKILL_TAXONOMY_PATH", "data/taxonomy/skills.json")
+
+    # Section-level incremental re-analysis of resumes (one LLM call per section on first analysis)
+    section_cache_enabled: bool = _env_bool("SECTION_CACHE_ENABLED", False)
+    section_cache_items: int = int(os.getenv("SECTION_CACHE_ITEMS", "4096"))
+
+    # Job posting fetcher
+    job_cache_dir: str = os.getenv("JOB_CACHE_DIR", ".cache/job_pages")
+    job_fetch_max_bytes: int = int(os.getenv("JOB_FETCH_MAX_BYTES", str(5_000_000)))
+    job_fetch_host_concurrency: int = int(os.getenv("JOB_FETCH_HOST_CONCURRENCY", "2"))
+    job_fetch_host_rps: float = float(os.getenv("JOB_FETCH_HOST_RPS", "1.0"))
+    job_fetch_fresh_s: float = float(os.getenv("JOB_FETCH_FRESH_S", "300"))
+    # Page text: "main" (streamed parse, JSON-LD JobPosting first, boilerplate dropped) or "full"
+    # (every visible text node); the streamed parse reads at most job_html_max_bytes of the page
+    job_html_extractor: str = os.getenv("JOB_HTML_EXTRACTOR", "main").strip().lower()
+    job_html_max_bytes: int = int(os.getenv("JOB_HTML_MAX_BYTES", str(2_000_000)))
+
+    # Resume ingestion
+    resume_pdf_workers: int = int(os.getenv("RESUME_PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+    resume_parallel_min_pages: int = int(os.getenv("RESUME_PARALLEL_MIN_PAGES", "8"))
+    resume_max_pages: int = int(os.getenv("RESUME_MAX_PAGES", "50"))
+    resume_max_bytes: int = int(os.getenv("RESUME_MAX_BYTES", str(20_000_000)))
+    resume_cache_enabled: bool = _env_bool("RESUME_CACHE_ENABLED", True)
+    resume_cache_path: str = os.getenv("RESUME_CACHE_PATH", ".cache/resume_text.sqlite")
+
+    # Resume store / inverted index behind /search
+    resume_index_path: str = os.getenv("RESUME_INDEX_PATH", "data/index/resume_index.sqlite")
+
+    # Background /jobs queue: SQLite store shared by all API processes, worker tasks per process,
+    # max queued jobs before 429, re-claim age for jobs left running, claims before such a job
+    # fails, retention of finished jobs
+    jobs_db_path: str = os.getenv("JOBS_DB_PATH", ".cache/jobs.sqlite")
+    jobs_workers: int = int(os.getenv("JOBS_WORKERS", "4"))
+    jobs_max_queued: int = int(os.getenv("JOBS_MAX_QUEUED", "100"))
+    jobs_stale_s: float = float(os.getenv("JOBS_STALE_S", "600"))
+    jobs_max_attempts: int = int(os.getenv("JOBS_MAX_ATTEMPTS", "3"))
+    jobs_ttl_s: float = float(os.getenv("JOBS_TTL_S", str(24 * 3600)))
+
+    # Precomputed JD profiles (POST /jobs-profiles, AnalyzeRequest.job_profile_id) and how many
+    # decoded profiles each process keeps in memory
+    job_profiles_path: str = os.getenv("JOB_PROFILES_PATH", "data/index/job_profiles.sqlite")
+    job_profiles_memory_items: int = int(os.getenv("JOB_PROFILES_MEMORY_ITEMS", "256"))
+
+    # Near-duplicate JDs (MinHash/LSH over clean_text shingles): a JD at or above this estimated
+    # Jaccard similarity to one analyzed before reuses its keyword list and skill extraction
+    jd_dedup_enabled: bool = _env_bool("JD_DEDUP_ENABLED", False)
+    jd_dedup_path: str = os.getenv("JD_DEDUP_PATH", "data/index/jd_signatures.sqlite")
+    jd_dedup_threshold: float = float(os.getenv("JD_DEDUP_THRESHOLD", "0.85"))
+    jd_dedup_num_perm: int = int(os.getenv("JD_DEDUP_NUM_PERM", "128"))
+
+    # TF-IDF engine for baseline_compare: "sklearn" (default, uses the artifact below) or "light"
+    # (NumPy only, fit per request; keeps sklearn/scipy out of baseline-only deployments)
+    tfidf_engine: str = os.getenv("TFIDF_ENGINE", "sklearn").strip().lower()
+
+    # Pre-fitted corpus TF-IDF model (see src/features/build_tfidf.py); per-request fit if missing.
+    tfidf_artifact_dir: str = os.getenv("TFIDF_ARTIFACT_DIR", "artifacts/tfidf")
+
 settings = Settings()
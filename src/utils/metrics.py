@@ -0,0 +1,185 @@
+from __future__ import annotations
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _fmt_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{str(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.doc = doc
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, doc: str, labels: Iterable[str] = ()):
+        super().__init__(name, doc, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, *label_values: str) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [f"{self.name}{_fmt_labels(self.labels, k)} {v}" for k, v in items]
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, *label_values: str) -> None:
+        self.inc(-amount, *label_values)
+
+    def set(self, value: float, *label_values: str) -> None:
+        with self._lock:
+            self._values[label_values] = value
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, doc: str, labels: Iterable[str] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(buckets)
+        self._values: Dict[Tuple[str, ...], list] = {}  # [bucket counts..., +Inf count, sum]
+
+    def observe(self, value: float, *label_values: str) -> None:
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(label_values)
+            if row is None:
+                row = self._values[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            row[i] += 1
+            row[-1] += value
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        out = self.header()
+        for k, row in items:
+            cum = 0
+            for le, n in zip(self.buckets, row):
+                cum += n
+                le_label = 'le="%s"' % le
+                out.append(f"{self.name}_bucket{_fmt_labels(self.labels, k, le_label)} {cum}")
+            cum += row[len(self.buckets)]
+            inf_label = 'le="+Inf"'
+            out.append(f"{self.name}_bucket{_fmt_labels(self.labels, k, inf_label)} {cum}")
+            out.append(f"{self.name}_sum{_fmt_labels(self.labels, k)} {row[-1]}")
+            out.append(f"{self.name}_count{_fmt_labels(self.labels, k)} {cum}")
+        return out
+
+STAGE_SECONDS = Histogram("jdra_stage_seconds", "Latency of pipeline stages.", ["stage"])
+REQUEST_SECONDS = Histogram("jdra_request_seconds", "HTTP request latency.", ["path"])
+REQUESTS_IN_FLIGHT = Gauge("jdra_requests_in_flight", "HTTP requests currently being served.")
+LLM_CALLS = Counter("jdra_llm_calls_total", "LLM extraction calls sent to a provider.", ["provider", "outcome"])
+LLM_TOKENS = Counter("jdra_llm_tokens_total", "Tokens reported by the LLM provider.", ["provider", "kind"])
+LLM_BATCH_SIZE = Histogram("jdra_llm_batch_size", "Documents per batched LLM call.", buckets=(1, 2, 4, 8, 16, 32))
+CACHE_LOOKUPS = Counter("jdra_cache_lookups_total", "Cache lookups by cache and result.", ["cache", "result"])
+FETCH_BYTES = Counter("jdra_fetch_bytes_total", "Job posting bytes downloaded.")
+ERRORS = Counter("jdra_errors_total", "Exceptions raised inside pipeline stages.", ["stage"])
+JOBS = Counter("jdra_jobs_total", "Background analyze jobs by outcome.", ["outcome"])
+LLM_RETRIES = Counter("jdra_llm_retries_total", "LLM call retries and hedged duplicates.", ["provider", "kind"])
+LLM_FALLBACKS = Counter("jdra_llm_fallbacks_total", "LLM extractions given up on, by reason.", ["reason"])
+LLM_BREAKER_OPEN = Gauge("jdra_llm_breaker_open", "1 while the provider's circuit breaker is open.", ["provider"])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REGISTRY = [
+    STAGE_SECONDS, REQUEST_SECONDS, REQUESTS_IN_FLIGHT, LLM_CALLS, LLM_TOKENS, LLM_BATCH_SIZE, CACHE_LOOKUPS, FETCH_BYTES, ERRORS, JOBS,
+    LLM_RETRIES, LLM_FALLBACKS, LLM_BREAKER_OPEN,
+]
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    for m in REGISTRY:
+        lines.extend(m.render())
+    return "\n".join(lines) + "\n"
+
+# Per-request stage durations (seconds), shared by reference with threads/tasks the request spawns.
+_timings: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar("jdra_timings", default=None)
+
+def start_request_timings() -> Dict[str, float]:
+    t: Dict[str, float] = {}
+    _timings.set(t)
+    return t
+
+def current_timings() -> Optional[Dict[str, float]]:
+    return _timings.get()
+
+def server_timing_header(timings: Dict[str, float]) -> str:
+    return ", ".join(f"{stage};dur={secs * 1000:.1f}" for stage, secs in timings.items())
+
+class timed:
+    """Time a pipeline stage as a context manager or a (sync/async) function decorator.
+
+    Records `jdra_stage_seconds{stage}`, counts exceptions in `jdra_errors_total{stage}`
+    and adds the duration to the current request's timings, if any.
+    """
+
+    __slots__ = ("stage", "_t0")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self) -> "timed":
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _record(self.stage, time.perf_counter() - self._t0, exc_type is not None)
+
+    def __call__(self, fn: Callable) -> Callable:
+        stage = self.stage
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                t0, failed = time.perf_counter(), True
+                try:
+                    result = await fn(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    _record(stage, time.perf_counter() - t0, failed)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0, failed = time.perf_counter(), True
+            try:
+                result = fn(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                _record(stage, time.perf_counter() - t0, failed)
+        return wrapper
+
+def _record(stage: str, elapsed: float, failed: bool) -> None:
+    STAGE_SECONDS.observe(elapsed, stage)
+    if failed:
+        ERRORS.inc(1.0, stage)
+    t = _timings.get()
+    if t is not None:
+        t[stage] = t.get(stage, 0.0) + elapsed
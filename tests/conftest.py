@@ -0,0 +1,23 @@
+import os
+import tempfile
+import pytest
+
+# Stores default to files in the working tree (.cache/, data/index/). Point them at a scratch
+# directory before `src` reads its settings, so tests that do not patch a path leave nothing behind.
+_STORES = tempfile.TemporaryDirectory(prefix="jdra-tests-")
+for _var, _name in (
+    ("LLM_CACHE_PATH", "llm_extractions.sqlite"), ("JOBS_DB_PATH", "jobs.sqlite"),
+    ("RESUME_CACHE_PATH", "resume_text.sqlite"), ("RESUME_INDEX_PATH", "resume_index.sqlite"),
+    ("JOB_PROFILES_PATH", "job_profiles.sqlite"), ("JD_DEDUP_PATH", "jd_signatures.sqlite"),
+    ("JOB_CACHE_DIR", "job_pages"),
+):
+    os.environ[_var] = os.path.join(_STORES.name, _name)
+
+from src.modeling.llm_resilience import reset_llm_resilience  # noqa: E402
+
+@pytest.fixture(autouse=True)
+def _fresh_llm_breakers():
+    # breakers and latency windows are per process; one test's failures must not open another's
+    reset_llm_resilience()
+    yield
+    reset_llm_resilience()
@@ -0,0 +1,76 @@
+import asyncio
+import dataclasses
+import json
+import time
+import httpx
+from fastapi.testclient import TestClient
+from src.api.main import app
+from src.modeling import incremental, llm_extract
+from src.features.tfidf_features import default_tfidf
+from src.modeling.ranker import analyze_stream
+
+RESUME = "Python SQL Docker"
+JD = "Looking for Python, MLOps and Docker"
+
+def _llm(monkeypatch, cancelled):
+    s = dataclasses.replace(llm_extract.settings, llm_provider="ollama", llm_cache_enabled=False)
+    for mod in (llm_extract, incremental):
+        monkeypatch.setattr(mod, "settings", s)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        text = json.loads(request.content)["messages"][1]["content"]
+        is_job = "Looking for" in text
+        try:
+            await asyncio.sleep(0.05 if is_job else 0.5)
+        except asyncio.CancelledError:
+            cancelled.append("job" if is_job else "resume")
+            raise
+        skills = ["python", "mlops"] if is_job else ["python"]
+        content = json.dumps({"skills": skills, "tools": ["docker"], "requirements": []})
+        return httpx.Response(200, json={"message": {"content": content}})
+    return httpx.MockTransport(handler)
+
+def test_stream_emits_baseline_first_then_llm_fields(monkeypatch):
+    transport = _llm(monkeypatch, [])
+    default_tfidf().score(RESUME, JD)  # the lifespan warm-up: keep the lazy sklearn import out of the timing
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport) as client:
+            monkeypatch.setattr(llm_extract, "get_async_client", lambda: client)
+            t0, events = time.perf_counter(), []
+            async for name, payload in analyze_stream(RESUME, JD):
+                events.append((name, payload, time.perf_counter() - t0))
+            return events
+
+    events = asyncio.run(run())
+    assert [e[0] for e in events] == ["baseline", "skills_job", "skills_resume", "recommended_keywords", "done"]
+    assert events[0][2] < 0.3  # baseline does not wait for the slow resume extraction
+    assert 0 <= events[0][1]["match_score"] <= 1
+    assert events[3][1] == {"recommended_keywords": ["mlops"]}
+    assert events[4][1]["explanations"]["llm_enabled"] is True
+
+def test_closing_stream_cancels_llm_calls(monkeypatch):
+    cancelled = []
+    transport = _llm(monkeypatch, cancelled)
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport) as client:
+            monkeypatch.setattr(llm_extract, "get_async_client", lambda: client)
+            stream = analyze_stream(RESUME, JD)
+            first = await stream.__anext__()
+            await stream.aclose()
+            await asyncio.sleep(0.01)
+            return first
+
+    assert asyncio.run(run())[0] == "baseline"
+    assert sorted(cancelled) == ["job", "resume"]
+
+def test_sse_endpoint():
+    client = TestClient(app)
+    with client.stream("POST", "/analyze/stream", json={"resume_text": RESUME, "job_text": JD}) as r:
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("text/event-stream")
+        body = "".join(r.iter_text())
+    names = [line.split(": ", 1)[1] for line in body.splitlines() if line.startswith("event: ")]
+    assert names[0] == "baseline" and names[-1] == "done"
+    assert set(names) == {"baseline", "skills_job", "skills_resume", "recommended_keywords", "done"}
@@ -1,13 +1,22 @@
+import dataclasses
 import pytest
 from fastapi.testclient import TestClient
+from src.api import main
 from src.api.main import app
+from src.modeling import llm_extract
 
 client = TestClient(app)
 
-def test_health():
+def test_health(monkeypatch, tmp_path):
+    path = tmp_path / "llm.sqlite"
+    s = dataclasses.replace(main.settings, llm_cache_path=str(path))
+    for mod in (main, llm_extract):
+        monkeypatch.setattr(mod, "settings", s)
+    monkeypatch.setattr(llm_extract, "_cache", None)
     r = client.get("/health")
     assert r.status_code == 200
     assert "status" in r.json()
+    assert r.json()["llm_cache"] is None and not path.exists()  # reporting does not open the cache
 
 def test_analyze_baseline_only():
     payload = {
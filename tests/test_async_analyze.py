@@ -0,0 +1,32 @@
+import asyncio
+import dataclasses
+import json
+import time
+import httpx
+from src.modeling import llm_extract
+from src.modeling.ranker import analyze_async
+
+def _fake_ollama(delay_s: float):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(delay_s)
+        text = json.loads(request.content)["messages"][1]["content"]
+        skills = ["python"] if "Python SQL" in text else ["python", "mlops"]
+        content = json.dumps({"skills": skills, "tools": ["docker"], "requirements": []})
+        return httpx.Response(200, json={"message": {"content": content}})
+    return httpx.MockTransport(handler)
+
+def test_analyze_async_runs_extractions_concurrently(monkeypatch):
+    monkeypatch.setattr(llm_extract, "settings", dataclasses.replace(llm_extract.settings, llm_provider="ollama", llm_cache_enabled=False))
+
+    async def run():
+        async with httpx.AsyncClient(transport=_fake_ollama(0.3)) as client:
+            monkeypatch.setattr(llm_extract, "get_async_client", lambda: client)
+            t0 = time.perf_counter()
+            result = await analyze_async("Python SQL Docker", "Looking for Python, MLOps and Docker")
+            return result, time.perf_counter() - t0
+
+    result, elapsed = asyncio.run(run())
+    assert elapsed < 0.55  # two 0.3 s calls overlapped rather than back to back
+    assert result.explanations["llm_enabled"] is True
+    assert result.skills_job["skills"] == ["python", "mlops"]
+    assert result.recommended_keywords == ["mlops"]
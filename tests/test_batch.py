@@ -0,0 +1,58 @@
+import asyncio
+import dataclasses
+import json
+from src.modeling import llm_extract, llm_resilience, skill_extract
+from src.modeling.batch import run_batch
+
+def _write_requests(path, start, n, mode="w"):
+    with path.open(mode, encoding="utf-8") as fh:
+        for i in range(start, start + n):
+            fh.write(json.dumps({"id": f"r{i}", "resume_text": "Python SQL Docker", "job_text": f"Python Docker role {i}"}) + "\n")
+
+def test_batch_writes_in_order_and_resumes_from_checkpoint(tmp_path):
+    inp, out, ckpt = tmp_path / "in.jsonl", tmp_path / "out.ndjson", tmp_path / "out.ckpt"
+    _write_requests(inp, 0, 5)
+    done = asyncio.run(run_batch(inp, out, ckpt, workers=1, window=2, checkpoint_every=2))
+    assert done.lines_done == 5
+
+    # simulate a crash that left a partial line after the last checkpoint, then more input
+    with out.open("a", encoding="utf-8") as fh:
+        fh.write('{"id": "partial')
+    _write_requests(inp, 5, 3, mode="a")
+    done = asyncio.run(run_batch(inp, out, ckpt, resume=True, workers=1, window=2))
+
+    records = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert done.lines_done == 8
+    assert [r["id"] for r in records] == [f"r{i}" for i in range(8)]
+    assert all(0.0 <= r["result"]["match_score"] <= 1.0 for r in records)
+
+def test_batch_reports_llm_fallback(tmp_path, monkeypatch):
+    s = dataclasses.replace(
+        llm_extract.settings, llm_provider="ollama", llm_cache_enabled=False, skill_extractor="llm", llm_breaker_failures=1,
+    )
+    for mod in (llm_extract, llm_resilience, skill_extract):
+        monkeypatch.setattr(mod, "settings", s)
+    llm_resilience.get_breaker("ollama").record_failure()
+    inp, out = tmp_path / "in.jsonl", tmp_path / "out.ndjson"
+    _write_requests(inp, 0, 2)
+    asyncio.run(run_batch(inp, out, tmp_path / "out.ckpt", workers=1))
+    records = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [r["result"]["explanations"]["llm_fallback"] for r in records] == [["circuit_open"]] * 2
+
+def test_batch_records_non_object_lines_and_restarts_without_output(tmp_path):
+    inp, out, ckpt = tmp_path / "in.jsonl", tmp_path / "out.ndjson", tmp_path / "out.ckpt"
+    _write_requests(inp, 0, 2)
+    with inp.open("a", encoding="utf-8") as fh:
+        fh.write('[]\n"x"\n3\nnot json\n')
+    asyncio.run(run_batch(inp, out, ckpt, workers=1))
+    records = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [r["id"] for r in records] == ["r0", "r1", 2, 3, 4, 5]
+    assert [r["error"].split(":")[0] for r in records[2:]] == [
+        "expected a JSON object, got list", "expected a JSON object, got str", "expected a JSON object, got int",
+        "invalid JSON",
+    ]
+
+    out.unlink()  # the checkpoint points past the end of an output that is gone
+    done = asyncio.run(run_batch(inp, out, ckpt, resume=True, workers=1))
+    assert done.lines_done == 6 and out.read_bytes().count(b"\0") == 0
+    assert [json.loads(line)["id"] for line in out.read_text(encoding="utf-8").splitlines()] == ["r0", "r1", 2, 3, 4, 5]
@@ -0,0 +1,21 @@
+from benchmarks.run import Case, compare, time_case
+from benchmarks.synthetic import make_jd, make_job_html, make_resume
+from src.preprocessing.section_parser import parse_sections
+
+def test_synthetic_generator_is_seeded_and_sized():
+    assert make_resume(10_000, seed=1) == make_resume(10_000, seed=1)
+    assert make_resume(10_000, seed=1) != make_resume(10_000, seed=2)
+    assert 9_000 <= len(make_jd(10_000).encode("utf-8")) <= 10_000
+    assert "skills" in parse_sections(make_resume(5_000)).sections
+    assert "<nav>" in make_job_html(5_000)
+
+def test_compare_flags_only_regressions_past_threshold():
+    baseline = {"a[1KB]": {"per_call_s": 1.0}, "b[1KB]": {"per_call_s": 1.0}}
+    results = {"a[1KB]": {"per_call_s": 1.2}, "b[1KB]": {"per_call_s": 1.3}, "new[1KB]": {"per_call_s": 9.0}}
+    assert compare(results, baseline, threshold=0.25) == ["b[1KB]"]
+    tiny = {"a[1KB]": {"per_call_s": 1e-6}}
+    assert compare({"a[1KB]": {"per_call_s": 2e-6}}, tiny, threshold=0.25, min_delta_s=5e-5) == []
+
+def test_time_case_reports_per_call_time():
+    out = time_case(Case("noop", "1KB", lambda: None), repeat=2, min_time_s=0.001)
+    assert out["loops"] >= 1 and out["per_call_s"] >= 0.0
@@ -0,0 +1,80 @@
+import asyncio
+import dataclasses
+import json
+import re
+import time
+import httpx
+from src.modeling import llm_extract
+from src.preprocessing.chunking import CHARS_PER_TOKEN, chunk_text
+
+def _resume(n_lines):
+    body = "\n".join(f"- Delivered project {i} on time with the platform team" for i in range(n_lines))
+    return f"Jane Doe\nSummary\nBackend engineer.\nExperience\n{body}\nSkills\nPython, Terraform, Kafka"
+
+def test_short_text_is_one_unchanged_chunk():
+    assert chunk_text("Python\nSQL", 100) == ["Python\nSQL"]
+
+def test_chunks_respect_budget_and_keep_every_word():
+    text = _resume(200)
+    chunks = chunk_text(text, 300)
+    assert len(chunks) > 1
+    assert all(len(c) <= 300 * CHARS_PER_TOKEN for c in chunks)
+    assert " ".join(chunks).split() == text.split()
+    assert "Skills\nPython, Terraform, Kafka" in chunks[-1]  # a section is not cut between lines it fits in
+
+def test_oversized_line_is_split_on_whitespace():
+    line = " ".join(f"word{i}" for i in range(500))
+    chunks = chunk_text(line, 100)
+    assert all(len(c) <= 400 for c in chunks)
+    assert " ".join(chunks).split() == line.split()
+
+def test_long_document_is_extracted_in_parallel_chunks(monkeypatch):
+    monkeypatch.setattr(llm_extract, "settings", dataclasses.replace(
+        llm_extract.settings, llm_provider="ollama", llm_cache_enabled=False, llm_chunk_tokens=1000))
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        text = json.loads(request.content)["messages"][1]["content"]
+        calls.append(text)
+        await asyncio.sleep(0.2)
+        tools = [t.lower() for t in re.findall(r"Terraform|Kafka", text)]
+        content = json.dumps({"skills": ["delivery"], "tools": tools, "requirements": []})
+        return httpx.Response(200, json={"message": {"content": content}, "prompt_eval_count": 10, "eval_count": 5})
+
+    async def run(text):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await llm_extract.extract_with_usage_async(text, client=client)
+
+    text = _resume(400)  # ~22 KB: far beyond the old 12000-char cut-off
+    t0 = time.perf_counter()
+    result, usage = asyncio.run(run(text))
+    assert len(calls) == len(chunk_text(text, 1000)) > 1
+    assert time.perf_counter() - t0 < 0.2 * len(calls) / 2  # chunks overlapped
+    assert result.tools == ["terraform", "kafka"]  # from the last section
+    assert result.skills == ["delivery"]
+    assert usage.completion_tokens == 5 * len(calls)
+
+def test_async_chunks_respect_concurrency_limit(monkeypatch):
+    monkeypatch.setattr(llm_extract, "settings", dataclasses.replace(
+        llm_extract.settings, llm_provider="ollama", llm_cache_enabled=False, llm_chunk_tokens=1000,
+        llm_chunk_concurrency=2))
+    inflight, peak = 0, 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal inflight, peak
+        inflight += 1
+        peak = max(peak, inflight)
+        await asyncio.sleep(0.02)
+        inflight -= 1
+        return httpx.Response(200, json={"message": {"content": '{"skills": [], "tools": [], "requirements": []}'}})
+
+    async def run(text):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await llm_extract.extract_with_usage_async(text, client=client)
+
+    asyncio.run(run(_resume(400)))
+    assert peak == 2
+
+def test_default_chunk_size_keeps_one_prompt_documents_whole():
+    assert llm_extract.settings.llm_chunk_tokens * CHARS_PER_TOKEN >= llm_extract.MAX_INPUT_CHARS
+    assert llm_extract.llm_chunks(_resume(180)) == [_resume(180)]  # ~10 KB: one call, as before chunking
@@ -0,0 +1,30 @@
+import json
+import os
+import subprocess
+import sys
+
+from src.features.light_tfidf import LightTfidf
+
+def test_api_import_with_light_engine_skips_heavy_modules():
+    code = (
+        "import json, sys\n"
+        "import src.api.main\n"
+        "before = sorted(m for m in ('sklearn', 'scipy', 'bs4', 'PyPDF2', 'rapidfuzz', 'httpx') if m in sys.modules)\n"
+        "from src.modeling.baseline_similarity import baseline_compare\n"
+        "r = baseline_compare('Python developer with FastAPI and Docker', 'We need Python, FastAPI and Kubernetes')\n"
+        "print(json.dumps({'before': before, 'sklearn': 'sklearn' in sys.modules, 'score': r.tfidf_score}))\n"
+    )
+    env = {**os.environ, "TFIDF_ENGINE": "light", "LLM_PROVIDER": ""}
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    res = json.loads(out.stdout.strip().splitlines()[-1])
+    assert res["before"] == []
+    assert res["sklearn"] is False
+    assert 0.0 < res["score"] < 1.0
+
+def test_light_tfidf_scores():
+    t = LightTfidf()
+    assert abs(t.score("python fastapi docker", "python fastapi docker") - 1.0) < 1e-9
+    assert t.score("python fastapi", "kubernetes terraform") == 0.0
+    assert t.score_many("python fastapi", []) == []
+    sims = t.score_many("python fastapi docker", ["python fastapi", "java spring"])
+    assert sims[0] > sims[1] == 0.0
@@ -0,0 +1,30 @@
+import pytest
+from src.features.keyword_extractor import STOPWORDS, KeywordMatcher, extract_keywords, fuzzy_contains
+from src.modeling.baseline_similarity import baseline_compare
+from src.preprocessing.clean_text import clean_text
+from src.preprocessing.document import Document
+from src.preprocessing.section_parser import parse_sections
+from src.utils.text import normalize_token, tokens, unique_preserve_order
+
+RESUME = "Summary\nData engineer • Python, SQL\n\nSkills\nPython  Docker Kubernetes python C++ CI/CD\nExperience\nBuilt ETL pipelines with Airflow."
+JD = "We need a Python engineer with Docker, Kubernetes and Terraform; experience with Airflow is preferred."
+
+def test_document_forms_match_string_helpers():
+    doc = Document(RESUME)
+    assert doc.clean == clean_text(RESUME)
+    assert doc.normalized == normalize_token(RESUME)
+    assert doc.tokens == tokens(RESUME)
+    assert doc.vocab == unique_preserve_order(tokens(RESUME))
+    assert doc.token_counts()["python"] == 3
+    assert doc.sections == parse_sections(RESUME).sections
+    with pytest.raises(AttributeError):
+        doc.extra = 1  # __slots__, no per-instance __dict__
+
+def test_keywords_and_matcher_unchanged():
+    legacy = unique_preserve_order(t for t in tokens(JD) if len(t) >= 3 and t not in STOPWORDS)
+    assert extract_keywords(Document(JD)) == extract_keywords(JD) == legacy
+    hits = KeywordMatcher(Document(RESUME)).contains_many(legacy)
+    assert hits == [fuzzy_contains(RESUME, k) for k in legacy]
+
+def test_baseline_accepts_documents():
+    assert baseline_compare(Document(RESUME), Document(JD)) == baseline_compare(RESUME, JD)
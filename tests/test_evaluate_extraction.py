@@ -0,0 +1,64 @@
+import asyncio
+import dataclasses
+import json
+import time
+import httpx
+from src.evaluation import evaluate_extraction as ev
+from src.modeling import llm_extract
+
+def _samples(n):
+    return [
+        ev.Sample(id=f"s{i}", text=f"job {i}: Python Docker", gold={"skills": {"python"}, "tools": {"docker", "aws"}, "requirements": set()})
+        for i in range(n)
+    ]
+
+def _fake_openai(calls, delay_s=0.2):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(json.loads(request.content)["messages"][1]["content"])
+        await asyncio.sleep(delay_s)
+        content = json.dumps({"skills": ["python", "sql"], "tools": ["docker"], "requirements": []})
+        return httpx.Response(200, json={
+            "choices": [{"message": {"content": content}}],
+            "usage": {"prompt_tokens": 100, "completion_tokens": 20},
+        })
+    return httpx.MockTransport(handler)
+
+def test_predict_once_concurrently_and_replay(monkeypatch, tmp_path):
+    monkeypatch.setattr(llm_extract, "settings", dataclasses.replace(
+        llm_extract.settings, llm_provider="openai", openai_api_key="x", llm_cache_enabled=False))
+    monkeypatch.setattr(ev, "settings", llm_extract.settings)
+    samples, calls = _samples(8), []
+
+    async def run():
+        async with httpx.AsyncClient(transport=_fake_openai(calls)) as client:
+            return await ev.predict(samples, concurrency=4, client=client)
+
+    t0 = time.perf_counter()
+    run = asyncio.run(run())
+    assert time.perf_counter() - t0 < 0.7  # 8 x 0.2 s in two waves of 4
+    assert len(calls) == len(samples)
+
+    report = ev.score(samples, run)
+    assert report["micro"]["skills"] == {"precision": 0.5, "recall": 1.0, "f1": 2 / 3, "tp": 8, "fp": 8, "fn": 0}
+    assert report["macro"]["tools"]["recall"] == 0.5
+    assert report["perf"]["completion_tokens"] == 160
+    assert report["perf"]["latency_p50_s"] >= 0.2
+
+    path = tmp_path / "run.json"
+    run.save(path)
+    replayed = ev.score(samples, ev.EvalRun.load(path))
+    assert replayed == report
+
+def test_failed_calls_are_reported_not_scored(monkeypatch):
+    monkeypatch.setattr(llm_extract, "settings", dataclasses.replace(
+        llm_extract.settings, llm_provider="ollama", llm_cache_enabled=False))
+    monkeypatch.setattr(ev, "settings", llm_extract.settings)
+
+    async def run():
+        transport = httpx.MockTransport(lambda r: httpx.Response(500))
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await ev.predict(_samples(2), client=client)
+
+    report = ev.score(_samples(2), asyncio.run(run()))
+    assert report["per_sample"] == []
+    assert [e["id"] for e in report["errors"]] == ["s0", "s1"]
@@ -0,0 +1,50 @@
+import json
+import pytest
+from benchmarks.bench_html_extract import load_fixtures
+from src.ingestion.html_extract import extract_job_text
+from src.ingestion.job_fetcher import JobFetcher
+
+PARAGRAPH = "We are hiring a platform engineer to run Kubernetes clusters and Terraform modules for our data teams."
+DUTIES = "You will own CI/CD, observability and the on-call rotation for the platform."
+
+def test_fixture_pages_keep_the_posting_and_drop_boilerplate():
+    pages, expected = load_fixtures()
+    assert set(expected) <= set(pages)
+    for name, exp in expected.items():
+        text = extract_job_text(pages[name])
+        assert [p for p in exp["must"] if p not in text] == [], name
+        assert [p for p in exp["must_not"] if p in text] == [], name
+
+def test_jsonld_posting_wins_and_stops_the_parse():
+    posting = {"@type": "JobPosting", "title": "Platform Engineer", "description": f"&lt;p&gt;{PARAGRAPH}&lt;/p&gt;&lt;ul&gt;&lt;li&gt;{DUTIES}&lt;/li&gt;&lt;/ul&gt;"}
+    body = "<p>Body copy that only appears after the JSON-LD script in the page source.</p>" * 5000
+    html = f'<html><head><script type="application/ld+json">{json.dumps(posting)}</script></head><body>{body}</body></html>'
+    assert extract_job_text(html) == f"Platform Engineer\n{PARAGRAPH}\n{DUTIES}"
+
+    stub = {"@type": "JobPosting", "title": "Platform Engineer", "description": "See below."}
+    html = f'<html><head><script type="application/ld+json">{json.dumps(stub)}</script></head><body><p>{PARAGRAPH}</p></body></html>'
+    assert extract_job_text(html) == PARAGRAPH  # too short to trust: the page text is used
+
+def test_link_dense_blocks_and_byte_cap():
+    links = "".join(f'<a href="/{i}">Open role number {i}</a> ' for i in range(20))
+    html = f"<html><body><div>{links}</div><h2>About the role</h2><p>{PARAGRAPH}</p><p>{PARAGRAPH.upper()}</p></body></html>"
+    assert extract_job_text(html) == f"About the role\n{PARAGRAPH}\n{PARAGRAPH.upper()}"
+    assert PARAGRAPH.upper() not in extract_job_text(html, max_bytes=html.index(PARAGRAPH.upper()))
+
+def test_fetcher_rejects_unknown_extractor():
+    with pytest.raises(ValueError):
+        JobFetcher(html_extractor="readability")
+
+@pytest.mark.parametrize("wrapper", [
+    '<body class="page has-sidebar"><div>{}</div></body>',
+    '<body class="cookie-consent-pending"><div>{}</div></body>',
+    '<body><main class="sidebar-layout">{}</main></body>',
+    '<body><div class="container shared-layout">{}</div></body>',
+    '<body><div role="dialog" class="posting">{}</div></body>',  # misjudged: the unfiltered page is used
+])
+def test_boilerplate_words_on_a_wrapper_do_not_hide_the_posting(wrapper):
+    posting = f"<h2>About the role</h2><p>{PARAGRAPH}</p><p>{DUTIES}</p>"
+    text = extract_job_text(f"<html>{wrapper.format(posting)}</html>")
+    assert text == f"About the role\n{PARAGRAPH}\n{DUTIES}"
+    html = f'<html><body><div class="container">{posting}<div class="site-footer">{PARAGRAPH.upper()}</div></div></body></html>'
+    assert PARAGRAPH.upper() not in extract_job_text(html)
@@ -0,0 +1,62 @@
+import asyncio
+import dataclasses
+import json
+import httpx
+from src.modeling import incremental, llm_extract, skill_extract
+from src.modeling.baseline_similarity import baseline_compare
+from src.modeling.llm_cache import ExtractionCache
+from src.modeling.ranker import analyze, analyze_async
+
+RESUME = """Jane Doe
+Summary
+Backend engineer focused on data platforms.
+Skills
+Python, SQL, Docker, Kubernetes
+Experience
+Built ETL pipelines with Airflow and Spark.
+Education
+BSc Computer Science"""
+EDITED = RESUME.replace("Airflow and Spark", "Airflow, Spark and Terraform")
+JD = "Looking for a Python engineer with Docker, Kubernetes, Terraform and Airflow experience."
+
+def _fresh_caches(monkeypatch, **overrides):
+    s = dataclasses.replace(llm_extract.settings, section_cache_enabled=True, **overrides)
+    for mod in (llm_extract, incremental, skill_extract):
+        monkeypatch.setattr(mod, "settings", s)
+    monkeypatch.setattr(incremental, "_cache", None)
+    monkeypatch.setattr(llm_extract, "_cache", ExtractionCache(None))
+
+def test_only_edited_section_is_recomputed(monkeypatch):
+    _fresh_caches(monkeypatch, llm_provider=None)
+    first = analyze(RESUME, JD)
+    assert first.explanations["sections"]["recomputed"] == ["body", "summary", "skills", "experience", "education"]
+    assert first.baseline == baseline_compare(RESUME, JD)
+
+    second = analyze(EDITED, JD)
+    assert second.explanations["sections"]["recomputed"] == ["experience"]
+    assert second.baseline == baseline_compare(EDITED, JD)
+    assert "terraform" in second.baseline.matched_keywords
+
+def test_llm_called_only_for_changed_sections(monkeypatch):
+    _fresh_caches(monkeypatch, llm_provider="ollama", llm_cache_enabled=True, skill_extractor="llm")
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        text = json.loads(request.content)["messages"][1]["content"]
+        calls.append(text)
+        tools = ["terraform"] if "Terraform" in text else (["docker"] if "Docker" in text else [])
+        content = json.dumps({"skills": [], "tools": tools, "requirements": []})
+        return httpx.Response(200, json={"message": {"content": content}})
+
+    async def run(resume):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            monkeypatch.setattr(llm_extract, "get_async_client", lambda: client)
+            return await analyze_async(resume, JD)
+
+    first = asyncio.run(run(RESUME))
+    assert len(calls) == 6  # five resume sections + the JD
+    second = asyncio.run(run(EDITED))
+    assert len(calls) == 7
+    assert second.explanations["sections"]["recomputed"] == ["experience"]
+    assert second.skills_resume["tools"] == ["docker", "terraform"]
+    assert "terraform" not in second.recommended_keywords and "terraform" in first.recommended_keywords
@@ -0,0 +1,113 @@
+import dataclasses
+import json
+import httpx
+from fastapi.testclient import TestClient
+from benchmarks.synthetic import make_jd
+from src.api import job_queue, main
+from src.features.keyword_extractor import STOPWORDS
+from src.features.minhash import MinHasher, MinHashLSH, jaccard, shingles
+from src.modeling import incremental, jd_dedup, job_profiles, llm_extract, llm_resilience, ranker, skill_extract
+from src.modeling.jd_dedup import JdDedupIndex
+from src.modeling.job_profiles import content_hash
+from src.modeling.llm_extract import LlmExtraction
+
+RESUME = "Python developer with SQL and Docker experience, built REST APIs with FastAPI."
+JD = make_jd(2500, seed=3)
+REPOST = "Posted 2026-10-12 - Berlin (hybrid)\n" + JD + "\nApply now: ref=board&utm_source=feed"
+
+def test_minhash_estimates_jaccard_and_lsh_finds_near_duplicates():
+    hasher = MinHasher(128)
+    a, b = shingles(JD), shingles(REPOST)
+    true = len(a & b) / len(a | b)
+    sig_a, sig_b = hasher.signature(JD), hasher.signature(REPOST)
+    assert abs(jaccard(sig_a, sig_b) - true) < 0.08 and true > 0.9
+    assert (hasher.signature(JD) == MinHasher(128).signature(a)).all()  # stable across instances
+
+    lsh = MinHashLSH(128, threshold=0.85)
+    others = [hasher.signature(make_jd(2500, seed=100 + i)) for i in range(50)]
+    for i, sig in enumerate(others):
+        lsh.insert(i, sig)
+    lsh.insert(99, sig_a)
+    assert lsh.candidates(sig_b) == {99} and len(lsh) == 51
+    lsh.remove(99, sig_a)
+    assert lsh.candidates(sig_b) == set() and len(lsh) == 50
+
+def test_index_reuses_results_and_persists(tmp_path):
+    path = str(tmp_path / "jd.sqlite")
+    index = JdDedupIndex(path, threshold=0.85)
+    jd_id = index.add(JD, LlmExtraction(skills=["python"], tools=["docker"], requirements=[]), "dictionary+llm")
+    assert index.lookup(make_jd(2500, seed=4)) is None
+    index.close()
+
+    reopened = JdDedupIndex(path, threshold=0.85)
+    match = reopened.lookup(REPOST)
+    assert match.id == jd_id and 0.85 <= match.similarity < 1.0
+    assert match.skill_extraction() == (LlmExtraction(skills=["python"], tools=["docker"], requirements=[]), "dictionary+llm")
+    assert match.document(REPOST).keywords(3, STOPWORDS) == match.keywords
+    reopened.close()
+    assert len(JdDedupIndex(path, num_perm=64)) == 0  # other hash parameters: signatures dropped
+
+def test_analyze_api_reuses_near_duplicate_jd(monkeypatch, tmp_path):
+    s = dataclasses.replace(
+        main.settings, jobs_workers=0, jobs_db_path=str(tmp_path / "jobs.sqlite"), skill_extractor="dictionary",
+        jd_dedup_enabled=True, jd_dedup_path=str(tmp_path / "jd.sqlite"),
+    )
+    for mod in (main, job_queue, jd_dedup):
+        monkeypatch.setattr(mod, "settings", s)
+    monkeypatch.setattr(job_queue, "_store", None)
+    monkeypatch.setattr(jd_dedup, "_index", None)
+    extracted = []
+    original = ranker.extract_skills_async
+
+    async def counting(text, mode=None):
+        extracted.append(text)
+        return await original(text, mode)
+    monkeypatch.setattr(ranker, "extract_skills_async", counting)
+
+    with TestClient(main.app) as client:
+        first = client.post("/analyze", json={"resume_text": RESUME, "job_text": JD}).json()
+        jd_calls = len(extracted) - 1
+        again = client.post("/analyze", json={"resume_text": RESUME, "job_text": REPOST}).json()
+    assert "job_duplicate" not in first["explanations"]
+    dup = again["explanations"]["job_duplicate"]
+    assert dup["id"] == content_hash(JD)[:16] and 0.85 <= dup["similarity"] < 1.0
+    assert jd_calls == 1 and len(extracted) == 3  # the repost only extracted the resume
+    assert again["skills_job"] == first["skills_job"] and len(jd_dedup.get_jd_dedup_index()) == 1
+
+def test_near_duplicate_made_by_other_extractor_or_prompt_is_re_extracted(monkeypatch, tmp_path):
+    base = dataclasses.replace(
+        main.settings, jobs_workers=0, jobs_db_path=str(tmp_path / "jobs.sqlite"), llm_provider="ollama",
+        llm_cache_enabled=False, jd_dedup_enabled=True, jd_dedup_path=str(tmp_path / "jd.sqlite"),
+    )
+    def use(**overrides):
+        s = dataclasses.replace(base, **overrides)
+        for mod in (main, job_queue, jd_dedup, job_profiles, llm_extract, llm_resilience, skill_extract, incremental):
+            monkeypatch.setattr(mod, "settings", s)
+    monkeypatch.setattr(job_queue, "_store", None)
+    monkeypatch.setattr(jd_dedup, "_index", None)
+    jd_calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        jd_calls.extend([] if "REST APIs" in request.content.decode() else ["jd"])
+        content = json.dumps({"skills": ["python"], "tools": ["docker"], "requirements": ["on-call"]})
+        return httpx.Response(200, json={"message": {"content": content}})
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(llm_extract, "get_async_client", lambda: client)
+    llm_resilience.get_breaker("ollama").record_success()
+
+    use(skill_extractor="dictionary")
+    with TestClient(main.app) as api:
+        first = api.post("/analyze", json={"resume_text": RESUME, "job_text": JD}).json()
+        assert not first["skills_job"]["requirements"] and jd_calls == []
+
+        use(skill_extractor="llm")  # the LLM is enabled: the dictionary-only skills are stale
+        again = api.post("/analyze", json={"resume_text": RESUME, "job_text": REPOST}).json()
+        assert "job_duplicate" in again["explanations"] and again["skills_job"]["requirements"] == ["on-call"]
+        assert len(jd_calls) == 1
+        api.post("/analyze", json={"resume_text": RESUME, "job_text": REPOST})
+        assert len(jd_calls) == 1  # overwritten, now reused
+
+        monkeypatch.setattr(job_profiles, "PROMPT_FINGERPRINT", "edited-prompt")
+        api.post("/analyze", json={"resume_text": RESUME, "job_text": REPOST})
+        assert len(jd_calls) == 2
+    assert len(jd_dedup.get_jd_dedup_index()) == 1
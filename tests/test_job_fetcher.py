@@ -0,0 +1,85 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from src.ingestion.job_fetcher import HostLimiter, JobFetcher, ResponseTooLarge
+
+PAGE = b"<html><body><script>var x=1;</script><h1>ML Engineer</h1><p>Python, Docker</p></body></html>"
+
+class _Handler(BaseHTTPRequestHandler):
+    hits = []
+
+    def do_GET(self):
+        _Handler.hits.append((self.path, self.headers.get("If-None-Match")))
+        if self.path == "/big":
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(b"x" * 10_000)
+            return
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture()
+def server():
+    _Handler.hits = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+def test_fetch_caches_and_revalidates(server, tmp_path):
+    fetcher = JobFetcher(cache_dir=str(tmp_path), fresh_s=0, host_rps=0)
+    first = fetcher.fetch(server + "/job")
+    assert first.status == 200 and not first.from_cache
+    assert first.text == "ML Engineer\nPython, Docker"
+
+    second = fetcher.fetch(server + "/job")
+    assert second.status == 304 and second.from_cache
+    assert second.text == first.text
+    assert _Handler.hits[-1] == ("/job", '"v1"')
+
+    fresh = JobFetcher(cache_dir=str(tmp_path), fresh_s=60, host_rps=0).fetch(server + "/job")
+    assert fresh.from_cache and fresh.status == 0
+    assert len(_Handler.hits) == 2
+
+def test_fetch_enforces_size_cap(server):
+    fetcher = JobFetcher(cache_dir=None, max_bytes=1_000, host_rps=0)
+    with pytest.raises(ResponseTooLarge):
+        fetcher.fetch(server + "/big")
+
+def test_host_limiter_spaces_requests():
+    limiter = HostLimiter(concurrency=1, rps=20)
+    t0 = time.monotonic()
+    for _ in range(3):
+        limiter.acquire("example.com")
+        limiter.release("example.com")
+    assert time.monotonic() - t0 >= 0.09
+
+def test_cached_text_from_another_extractor_is_re_extracted(server, tmp_path):
+    url = server + "/job"
+    fetcher = JobFetcher(cache_dir=str(tmp_path), fresh_s=60, host_rps=0)
+    first = fetcher.fetch(url)
+    meta_p, _, text_p = fetcher._paths(url)
+    meta = json.loads(meta_p.read_text(encoding="utf-8"))
+    assert meta["extractor"] == "main"
+    meta.pop("extractor")  # as cached before the extractor was recorded
+    meta_p.write_text(json.dumps(meta), encoding="utf-8")
+    text_p.write_text("old whole-page text", encoding="utf-8")
+
+    again = fetcher.fetch(url)
+    assert again.from_cache and again.text == first.text and len(_Handler.hits) == 1
+    assert text_p.read_text(encoding="utf-8") == first.text
+    full = JobFetcher(cache_dir=str(tmp_path), fresh_s=60, host_rps=0, html_extractor="full").fetch(url)
+    assert full.from_cache and json.loads(meta_p.read_text(encoding="utf-8"))["extractor"] == "full"
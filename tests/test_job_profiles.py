@@ -0,0 +1,107 @@
+import asyncio
+import dataclasses
+import json
+import httpx
+from fastapi.testclient import TestClient
+from src.api import job_queue, main
+from src.features import tfidf_features
+from src.modeling import incremental, job_profiles, llm_extract, llm_resilience, ranker, skill_extract
+from src.modeling.job_profiles import JobProfileStore, build_profile
+
+RESUME = "Python developer with SQL and Docker experience, built REST APIs with FastAPI."
+JD = "We need a Python engineer: Kubernetes, Docker, SQL, FastAPI and AWS. Experience with Kafka is a plus."
+
+def test_store_round_trip_and_lru(tmp_path):
+    path = str(tmp_path / "profiles.sqlite")
+    store = JobProfileStore(path, max_memory_items=1)
+    a = asyncio.run(build_profile(JD))
+    b = asyncio.run(build_profile("Data analyst, SQL and Tableau", profile_id="analyst"))
+    store.put(a)
+    store.put(b)
+    assert a.id == a.content_hash[:16] and len(store) == 2
+    assert store.get("analyst") is b  # still in memory
+    store.close()
+
+    reopened = JobProfileStore(path)
+    loaded = reopened.get(a.id)
+    assert loaded == a and loaded.document().clean == a.clean_text
+    assert reopened.remove(a.id) and reopened.get(a.id) is None
+
+def test_analyze_with_profile_matches_raw_text(monkeypatch, tmp_path):
+    vec = tfidf_features._new_vectorizer().fit([RESUME, JD, "Java Spring developer", "Data analyst, SQL and Tableau"])
+    tfidf_features.save_tfidf_artifact(vec, str(tmp_path), "test", 4)
+    monkeypatch.setattr(tfidf_features, "settings", dataclasses.replace(
+        tfidf_features.settings, tfidf_engine="sklearn", tfidf_artifact_dir=str(tmp_path)))
+    tfidf_features.load_default_tfidf.cache_clear()
+    try:
+        stored = asyncio.run(build_profile(JD))
+        assert stored.tfidf["model"] == "test"
+        profile = job_profiles.JobProfile.from_json(stored.to_json())
+        doc = profile.document()
+        assert ("tfidf", "test") in doc._derived  # primed, not re-vectorized
+
+        with_profile = ranker.analyze(RESUME, doc, profile.skill_extraction())
+        raw = ranker.analyze(RESUME, JD)
+        assert with_profile.match_score == raw.match_score
+        assert with_profile.baseline == raw.baseline
+        assert with_profile.skills_job == raw.skills_job
+    finally:
+        tfidf_features.load_default_tfidf.cache_clear()
+
+def test_job_profiles_api(monkeypatch, tmp_path):
+    s = dataclasses.replace(
+        main.settings, jobs_workers=0, jobs_db_path=str(tmp_path / "jobs.sqlite"),
+        job_profiles_path=str(tmp_path / "profiles.sqlite"),
+    )
+    for mod in (main, job_queue, job_profiles):
+        monkeypatch.setattr(mod, "settings", s)
+    monkeypatch.setattr(job_queue, "_store", None)
+    monkeypatch.setattr(job_profiles, "_store", None)
+    with TestClient(main.app) as client:
+        r = client.post("/jobs-profiles", json={"id": "backend", "job_text": JD})
+        assert r.status_code == 200
+        body = r.json()
+        assert body["id"] == "backend" and "kubernetes" in body["keywords"]
+        assert client.get("/jobs-profiles/backend").json()["content_hash"] == body["content_hash"]
+
+        by_id = client.post("/analyze", json={"resume_text": RESUME, "job_profile_id": "backend"}).json()
+        by_text = client.post("/analyze", json={"resume_text": RESUME, "job_text": JD}).json()
+        assert by_id["match_score"] == by_text["match_score"]
+        assert by_id["skills_job"] == by_text["skills_job"]
+
+        assert client.post("/analyze", json={"resume_text": RESUME, "job_profile_id": "nope"}).status_code == 404
+        assert client.get("/jobs-profiles/nope").status_code == 404
+        assert client.post("/jobs-profiles", json={}).status_code == 400
+        assert client.post("/jobs", json={"resume_text": RESUME, "job_profile_id": "backend"}).status_code == 202
+
+def test_profile_that_fell_back_is_refreshed_on_use(monkeypatch, tmp_path):
+    s = dataclasses.replace(
+        main.settings, jobs_workers=0, jobs_db_path=str(tmp_path / "jobs.sqlite"),
+        job_profiles_path=str(tmp_path / "profiles.sqlite"), llm_provider="ollama", llm_cache_enabled=False,
+        skill_extractor="llm", llm_breaker_failures=1,
+    )
+    for mod in (main, job_queue, job_profiles, llm_extract, llm_resilience, skill_extract, incremental):
+        monkeypatch.setattr(mod, "settings", s)
+    monkeypatch.setattr(job_queue, "_store", None)
+    monkeypatch.setattr(job_profiles, "_store", None)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        content = json.dumps({"skills": ["python"], "tools": ["docker"], "requirements": ["on-call"]})
+        return httpx.Response(200, json={"message": {"content": content}})
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(llm_extract, "get_async_client", lambda: client)
+
+    breaker = llm_resilience.get_breaker("ollama")
+    breaker.record_failure()
+    with TestClient(main.app) as api:
+        created = api.post("/jobs-profiles", json={"id": "backend", "job_text": JD}).json()
+        assert created["llm_fallback"] == ["circuit_open"] and not created["skills"].get("requirements")
+        breaker.record_success()  # the provider is back
+        r = api.post("/analyze", json={"resume_text": RESUME, "job_profile_id": "backend"}).json()
+        assert "llm_fallback" not in r["explanations"] and r["skills_job"]["requirements"] == ["on-call"]
+        refreshed = api.get("/jobs-profiles/backend").json()
+    assert refreshed["llm_fallback"] == [] and refreshed["skills"]["requirements"] == ["on-call"]
+    profile = job_profiles.get_job_profile_store().get("backend")
+    assert not profile.skills_stale() and profile.llm_model == "ollama:" + s.ollama_model
+    monkeypatch.setattr(job_profiles, "PROMPT_FINGERPRINT", "edited-prompt")
+    assert profile.skills_stale()
@@ -0,0 +1,79 @@
+import dataclasses
+import time
+import pytest
+from fastapi.testclient import TestClient
+from src.api import job_queue, main
+from src.api.job_queue import JobStore, QueueFull
+
+PAYLOAD = {"resume_text": "Python SQL Docker", "job_text": "Looking for Python, Kubernetes and Docker"}
+
+def test_store_capacity_claim_and_persistence(tmp_path):
+    path = str(tmp_path / "jobs.sqlite")
+    store = JobStore(path, stale_s=60)
+    a = store.submit({"n": 1}, max_queued=2)
+    b = store.submit({"n": 2}, max_queued=2)
+    with pytest.raises(QueueFull) as e:
+        store.submit({"n": 3}, max_queued=2)
+    assert 1 <= e.value.retry_after_s <= 60
+
+    assert store.claim("w1") == (a, {"n": 1})
+    store.finish(a, {"ok": True})
+    store.close()
+
+    reopened = JobStore(path, stale_s=60)  # e.g. after a restart, or from another process
+    assert reopened.get(a)["status"] == "done" and reopened.get(a)["result"] == {"ok": True}
+    assert reopened.claim("w2") == (b, {"n": 2})
+    assert reopened.claim("w2") is None
+    reopened.fail(b, "boom")
+    assert reopened.counts() == {"done": 1, "failed": 1}
+
+def test_stale_running_job_is_reclaimed(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite"), stale_s=0.05)
+    job = store.submit({}, max_queued=10)
+    assert store.claim("dead-worker")[0] == job
+    assert store.claim("w") is None
+    time.sleep(0.1)
+    assert store.claim("w")[0] == job
+
+def test_job_that_keeps_dying_fails_after_max_attempts(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite"), stale_s=0.05, max_attempts=2)
+    job = store.submit({}, max_queued=10)
+    store.claim("w1")
+    store.requeue(job)  # shutdown, not a crash: not counted
+    for w in ("w2", "w3"):
+        assert store.claim(w)[0] == job
+        time.sleep(0.1)
+    assert store.claim("w4") is None
+    assert store.get(job)["status"] == "failed" and store.get(job)["attempts"] == 2
+    assert "2 attempts" in store.get(job)["error"]
+
+def _app_settings(monkeypatch, tmp_path, **overrides):
+    s = dataclasses.replace(main.settings, jobs_db_path=str(tmp_path / "jobs.sqlite"), **overrides)
+    for mod in (main, job_queue):
+        monkeypatch.setattr(mod, "settings", s)
+    monkeypatch.setattr(job_queue, "_store", None)
+
+def test_jobs_api_runs_analyze_in_background(monkeypatch, tmp_path):
+    _app_settings(monkeypatch, tmp_path, jobs_workers=2, jobs_max_queued=10)
+    with TestClient(main.app) as client:
+        r = client.post("/jobs", json=PAYLOAD)
+        assert r.status_code == 202 and r.json()["status"] == "queued"
+        job_id = r.json()["id"]
+        for _ in range(100):
+            job = client.get(f"/jobs/{job_id}").json()
+            if job["status"] in ("done", "failed"):
+                break
+            time.sleep(0.05)
+    assert job["status"] == "done", job
+    assert 0.0 <= job["result"]["match_score"] <= 1.0
+    assert "kubernetes" in job["result"]["missing_keywords"]
+    assert client.get("/jobs/nope").status_code == 404
+
+def test_full_queue_returns_429_with_retry_after(monkeypatch, tmp_path):
+    _app_settings(monkeypatch, tmp_path, jobs_workers=0, jobs_max_queued=1)
+    with TestClient(main.app) as client:
+        assert client.post("/jobs", json=PAYLOAD).status_code == 202
+        r = client.post("/jobs", json=PAYLOAD)
+        assert r.status_code == 429
+        assert int(r.headers["retry-after"]) >= 1
+        assert client.post("/jobs", json={"resume_text": "x"}).status_code == 400
@@ -0,0 +1,25 @@
+import random
+import string
+from src.features.keyword_extractor import KeywordMatcher, fuzzy_contains
+
+WORDS = ["python", "pyspark", "scikit-learn", "node.js", "nodejs", "kubernetes", "k8s", "docker",
+         "postgresql", "postgres", "sql", "ci/cd", "c++", "machine", "learning", "kube", "a"]
+
+def _mutate(rng: random.Random, w: str) -> str:
+    if len(w) < 3 or rng.random() < 0.5:
+        return w
+    i, c = rng.randrange(len(w)), rng.choice(string.ascii_lowercase)
+    return rng.choice([w[:i] + c + w[i+1:], w[:i] + w[i+1:], w[:i] + c + w[i:]])
+
+def test_matcher_is_equivalent_to_fuzzy_contains():
+    rng = random.Random(7)
+    for _ in range(200):
+        resume = ", ".join(_mutate(rng, rng.choice(WORDS)) for _ in range(rng.randint(0, 30)))
+        keywords = [_mutate(rng, rng.choice(WORDS)) for _ in range(10)] + [""]
+        expected = [fuzzy_contains(resume, kw, threshold=90) for kw in keywords]
+        assert KeywordMatcher(resume).contains_many(keywords, threshold=90) == expected
+
+def test_split_preserves_order():
+    matched, missing = KeywordMatcher("Built ML pipelines with Python and Docker").split(["docker", "rust", "python"])
+    assert matched == ["docker", "python"]
+    assert missing == ["rust"]
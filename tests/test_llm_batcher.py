@@ -0,0 +1,74 @@
+import asyncio
+import dataclasses
+import json
+import re
+import httpx
+from src.modeling import llm_batcher, llm_extract
+from src.modeling.llm_batcher import LlmBatcher
+from src.modeling.llm_cache import ExtractionCache
+
+def _settings(monkeypatch):
+    s = dataclasses.replace(llm_extract.settings, llm_provider="ollama", llm_cache_enabled=False)
+    monkeypatch.setattr(llm_extract, "settings", s)
+    monkeypatch.setattr(llm_batcher, "settings", s)
+
+def _provider(calls, broken=False):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        prompt = json.loads(request.content)["messages"][1]["content"]
+        calls.append(prompt)
+        docs = re.findall(r'DOCUMENT id=(\d+):\n"""(.*?)"""', prompt, re.S)
+        if docs:
+            content = "not json" if broken else json.dumps({"results": {i: {"skills": [t], "tools": [], "requirements": []} for i, t in docs}})
+        else:
+            text = re.search(r'TEXT:\n"""(.*?)"""', prompt, re.S).group(1)
+            content = json.dumps({"skills": [text], "tools": [], "requirements": []})
+        return httpx.Response(200, json={"message": {"content": content}})
+    return httpx.MockTransport(handler)
+
+def _run(batcher_kwargs, transport, texts):
+    async def go():
+        async with httpx.AsyncClient(transport=transport) as client:
+            b = LlmBatcher(client=client, **batcher_kwargs)
+            return await asyncio.gather(*(b.submit(t) for t in texts)), b.stats
+    return asyncio.run(go())
+
+def test_concurrent_requests_share_one_call(monkeypatch):
+    _settings(monkeypatch)
+    calls = []
+    texts = [f"doc{i}" for i in range(5)]
+    results, stats = _run({"window_s": 0.05, "max_items": 8}, _provider(calls), texts)
+    assert len(calls) == 1
+    assert [r.skills for r in results] == [[t] for t in texts]
+    assert stats == {"batches": 1, "items": 5, "fallbacks": 0}
+
+def test_max_items_splits_batches(monkeypatch):
+    _settings(monkeypatch)
+    calls = []
+    results, stats = _run({"window_s": 1.0, "max_items": 2}, _provider(calls), ["a", "b", "c", "d"])
+    assert len(calls) == 2 and stats["batches"] == 2
+    assert [r.skills for r in results] == [["a"], ["b"], ["c"], ["d"]]
+
+def test_unparseable_batch_falls_back_per_item(monkeypatch):
+    _settings(monkeypatch)
+    calls = []
+    results, stats = _run({"window_s": 0.05}, _provider(calls, broken=True), ["x", "y", "z"])
+    assert len(calls) == 4  # one failed batch + three single calls
+    assert [r.skills for r in results] == [["x"], ["y"], ["z"]]
+    assert stats["fallbacks"] == 3
+
+def test_batched_answers_are_cached_apart_from_single_prompt_ones(monkeypatch):
+    _settings(monkeypatch)
+    s = dataclasses.replace(llm_extract.settings, llm_cache_enabled=True)
+    monkeypatch.setattr(llm_extract, "settings", s)
+    monkeypatch.setattr(llm_batcher, "settings", s)
+    monkeypatch.setattr(llm_extract, "_cache", ExtractionCache(None))
+    calls = []
+    _run({"window_s": 0.05}, _provider(calls), ["a", "b"])
+    results, _ = _run({"window_s": 0.05}, _provider(calls), ["a", "b"])
+    assert len(calls) == 1 and [r.skills for r in results] == [["a"], ["b"]]  # served from the batch keys
+    assert llm_extract.cache_lookup("a", "ollama")[2] is None
+
+    async def single():
+        async with httpx.AsyncClient(transport=_provider(calls)) as client:
+            return await llm_extract.extract_with_llm_async("a", client=client)
+    assert asyncio.run(single()).skills == ["a"] and 'TEXT:\n"""a"""' in calls[-1]
@@ -0,0 +1,67 @@
+import dataclasses
+import time
+from src.modeling import llm_extract
+from src.modeling.llm_cache import ExtractionCache
+from src.modeling.llm_extract import LlmExtraction, LlmUsage, extract_with_llm
+
+VALUE = {"skills": ["python"], "tools": ["docker"], "requirements": []}
+
+def test_two_tier_hits_and_persistence(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ExtractionCache(path, max_memory_items=1)
+    assert cache.get("a") is None
+    cache.set("a", VALUE)
+    cache.set("b", VALUE)  # evicts "a" from the in-memory tier only
+    assert cache.get("b") == VALUE
+    assert cache.get("a") == VALUE
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["disk_hits"], stats["misses"]) == (1, 1, 1)
+
+    reopened = ExtractionCache(path)
+    assert reopened.get("b") == VALUE
+    assert reopened.stats()["disk_hits"] == 1
+
+def test_ttl_and_disk_size_bound(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache.sqlite"), max_disk_items=2, ttl_s=0.05)
+    for k in ("a", "b", "c"):
+        cache.set(k, VALUE)
+    assert cache.stats()["disk_items"] == 2
+    time.sleep(0.1)
+    assert cache.get("c") is None
+
+def test_disk_cap_is_enforced_without_counting_rows_on_every_insert(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ExtractionCache(path, max_memory_items=1, max_disk_items=50)
+    counts = []
+    cache._db.set_trace_callback(lambda sql: counts.append(sql) if "COUNT(*)" in sql else None)
+    for i in range(200):
+        cache.set(f"k{i}", VALUE)
+        cache.set(f"k{i}", VALUE)  # a replaced key is not a new row
+    assert len(counts) <= 200 // 5
+    assert 45 <= cache.stats()["disk_items"] <= 50 and cache.get("k199") == VALUE and cache.get("k0") is None
+    cache._db.set_trace_callback(None)
+    assert ExtractionCache(path, max_disk_items=50)._disk_rows == cache.stats()["disk_items"]
+
+def test_extract_with_llm_uses_cache_and_prompt_fingerprint(monkeypatch):
+    calls = []
+    def fake_extract(text, provider):
+        calls.append(text)
+        return LlmExtraction(**VALUE), LlmUsage()
+
+    monkeypatch.setattr(llm_extract, "settings", dataclasses.replace(llm_extract.settings, llm_provider="ollama"))
+    monkeypatch.setattr(llm_extract, "_cache", ExtractionCache(None))
+    monkeypatch.setattr(llm_extract, "_extract_uncached", fake_extract)
+
+    assert extract_with_llm("same text") == extract_with_llm("same text")
+    assert len(calls) == 1
+
+    monkeypatch.setattr(llm_extract, "PROMPT_FINGERPRINT", "edited-prompt")
+    extract_with_llm("same text")
+    assert len(calls) == 2
+
+def test_cache_hits_are_copies(monkeypatch):
+    monkeypatch.setattr(llm_extract, "_cache", ExtractionCache(None))
+    _, key, _ = llm_extract.cache_lookup("text", "ollama")
+    llm_extract.get_extraction_cache().set(key, dict(VALUE))
+    llm_extract.cache_lookup("text", "ollama")[2].skills.append("mutated")
+    assert llm_extract.cache_lookup("text", "ollama")[2].skills == ["python"]
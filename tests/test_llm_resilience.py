@@ -0,0 +1,123 @@
+import asyncio
+import dataclasses
+import time
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from benchmarks.mock_llm import MockConfig, create_app
+from src.api import job_queue, main
+from src.modeling import incremental, llm_extract, llm_resilience, ranker, skill_extract
+from src.modeling.llm_resilience import LlmUnavailable, get_breaker
+from src.utils.metrics import LLM_RETRIES
+
+RESUME = "Python developer, Docker and AWS."
+JD = "Looking for Python, Kubernetes and Docker."
+
+def _settings(monkeypatch, **overrides):
+    s = dataclasses.replace(
+        llm_extract.settings, llm_provider="ollama", ollama_base_url="http://mock", llm_cache_enabled=False,
+        skill_extractor="llm", llm_backoff_base_ms=1, llm_backoff_max_ms=5, **overrides,
+    )
+    for mod in (llm_extract, llm_resilience, skill_extract, incremental, main):
+        monkeypatch.setattr(mod, "settings", s)
+    return s
+
+def _run(monkeypatch, config: MockConfig, fn):
+    """Run `fn()` (a coroutine function) with the LLM client pointed at a fault-injecting mock."""
+    app = create_app(config)
+
+    async def go():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app)) as client:
+            monkeypatch.setattr(llm_extract, "get_async_client", lambda: client)
+            return await fn()
+    result = asyncio.run(go())
+    return result, TestClient(app).get("/stats").json()
+
+def test_retries_with_backoff_recover_from_transient_errors(monkeypatch):
+    _settings(monkeypatch, llm_retries=2)
+    before = LLM_RETRIES.value("ollama", "retry")
+    (result, _), stats = _run(
+        monkeypatch, MockConfig(latency_ms=1, per_kchar_ms=0, fail_first=2, error_status=503),
+        lambda: llm_extract.extract_with_usage_async(RESUME, use_cache=False),
+    )
+    assert stats["calls"] == 3 and "docker" in result.tools
+    assert LLM_RETRIES.value("ollama", "retry") - before == 2
+
+    with pytest.raises(LlmUnavailable) as e:  # 4xx is not retried
+        _run(monkeypatch, MockConfig(latency_ms=1, per_kchar_ms=0, fail_first=1, error_status=400),
+             lambda: llm_extract.extract_with_usage_async(RESUME, use_cache=False))
+    assert e.value.reason == "provider_error"
+
+def test_client_errors_do_not_open_the_breaker(monkeypatch):
+    _settings(monkeypatch, llm_retries=0, llm_breaker_failures=1)
+    for _ in range(3):
+        with pytest.raises(LlmUnavailable) as e:
+            _run(monkeypatch, MockConfig(latency_ms=1, per_kchar_ms=0, fail_first=1, error_status=400),
+                 lambda: llm_extract.extract_with_usage_async(RESUME, use_cache=False))
+        assert e.value.reason == "provider_error"
+    assert get_breaker("ollama").state == "closed"
+
+def test_breaker_opens_and_analyze_falls_back_to_baseline(monkeypatch):
+    _settings(monkeypatch, llm_retries=0, llm_breaker_failures=2, llm_breaker_reset_s=30)
+    config = MockConfig(latency_ms=1, per_kchar_ms=0, error_rate=1.0)
+    app = create_app(config)
+
+    async def go():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app)) as client:
+            monkeypatch.setattr(llm_extract, "get_async_client", lambda: client)
+            failed = await ranker.analyze_async(RESUME, JD)
+            short_circuited = await ranker.analyze_async(RESUME, JD)
+            calls = TestClient(app).get("/stats").json()["calls"]
+            config.error_rate = 0.0
+            get_breaker("ollama")._opened_at -= 30  # reset period over: half-open
+            await llm_extract.extract_with_usage_async(RESUME, use_cache=False)  # half-open trial
+            return failed, short_circuited, calls, await ranker.analyze_async(RESUME, JD)
+
+    failed, short_circuited, calls, recovered = asyncio.run(go())
+    assert failed.explanations["llm_enabled"] is False
+    assert failed.explanations["llm_fallback"] == ["provider_error"]
+    assert failed.match_score == ranker.blend_score(failed.baseline)
+    assert short_circuited.explanations["llm_fallback"] == ["circuit_open"] and calls == 2
+    assert get_breaker("ollama").state == "closed"
+    assert recovered.explanations["llm_enabled"] is True and "llm_fallback" not in recovered.explanations
+
+def test_budget_bounds_llm_latency(monkeypatch):
+    _settings(monkeypatch)
+    t0 = time.perf_counter()
+    result, _ = _run(
+        monkeypatch, MockConfig(latency_ms=500, jitter=0, per_kchar_ms=0),
+        lambda: ranker.analyze_async(RESUME, JD, llm_budget_s=0.05),
+    )
+    assert time.perf_counter() - t0 < 0.4
+    assert result.explanations["llm_fallback"] == ["deadline_exceeded"]
+    assert result.skills_resume == {"skills": [], "tools": [], "requirements": []}
+    assert get_breaker("ollama").state == "closed"  # the caller's deadline is not a provider failure
+
+def test_slow_call_is_hedged_after_p95(monkeypatch):
+    _settings(monkeypatch, llm_hedge_min_samples=20)
+    window = llm_resilience._provider_state("ollama")[1]
+    for _ in range(20):
+        window.observe(0.02)
+    before = LLM_RETRIES.value("ollama", "hedge")
+    t0 = time.perf_counter()
+    (result, _), stats = _run(
+        monkeypatch, MockConfig(latency_ms=5, jitter=0, per_kchar_ms=0, slow_first=1, slow_ms=3000),
+        lambda: llm_extract.extract_with_usage_async(RESUME, use_cache=False),
+    )
+    assert time.perf_counter() - t0 < 1.0 and "docker" in result.tools
+    assert stats["calls"] == 2 and LLM_RETRIES.value("ollama", "hedge") - before == 1
+
+def test_api_reports_open_breaker_and_still_answers(monkeypatch, tmp_path):
+    s = _settings(monkeypatch, llm_breaker_failures=1, jobs_workers=0, jobs_db_path=str(tmp_path / "jobs.sqlite"))
+    monkeypatch.setattr(job_queue, "settings", s)
+    monkeypatch.setattr(job_queue, "_store", None)
+    breaker = get_breaker(s.llm_provider)
+    breaker.record_failure()
+    with TestClient(main.app) as client:
+        assert client.get("/health").json()["llm_breaker"] == "open"
+        r = client.post("/analyze", json={"resume_text": RESUME, "job_text": JD, "llm_budget_ms": 1000})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["explanations"]["llm_enabled"] is False
+    assert body["explanations"]["llm_fallback"] == ["circuit_open"]
+    assert "kubernetes" in body["missing_keywords"]
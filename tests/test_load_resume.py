@@ -0,0 +1,70 @@
+import dataclasses
+import pytest
+from src.ingestion import load_resume
+from src.ingestion.load_resume import load_many, load_text_from_file
+from src.modeling.llm_cache import ExtractionCache
+
+def _make_pdf(pages: list[str]) -> bytes:
+    """Minimal valid PDF with one line of Helvetica text per page."""
+    objs = ["<< /Type /Catalog /Pages 2 0 R >>", "", "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objs.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objs.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {len(objs)} 0 R "
+                    "/Resources << /Font << /F1 3 0 R >> >> >>")
+        kids.append(len(objs))
+    objs[1] = f"<< /Type /Pages /Kids [{' '.join(f'{k} 0 R' for k in kids)}] /Count {len(kids)} >>"
+    out, offsets = bytearray(b"%PDF-1.4\n"), []
+    for i, obj in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{obj}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets).encode()
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+@pytest.fixture()
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(load_resume, "settings", dataclasses.replace(
+        load_resume.settings, resume_pdf_workers=2, resume_parallel_min_pages=2))
+    monkeypatch.setattr(load_resume, "_cache", ExtractionCache(None))
+    yield
+    load_resume.shutdown_resume_pool()
+
+def test_pdf_page_parallel_extraction_cache_and_limits(tmp_path, fresh_state):
+    pdf = tmp_path / "cv.pdf"
+    pdf.write_bytes(_make_pdf([f"Page {i} python" for i in range(5)]))
+
+    text = load_text_from_file(str(pdf))
+    assert text.splitlines() == [f"Page {i} python" for i in range(5)]
+    assert load_text_from_file(str(pdf)) == text
+    assert load_resume._cache.stats()["memory_hits"] == 1
+
+    assert load_text_from_file(str(pdf), max_pages=2) == "Page 0 python\nPage 1 python"
+    with pytest.raises(ValueError):
+        load_text_from_file(str(pdf), max_bytes=10)
+
+def test_load_many_reports_progress_and_failures(tmp_path, fresh_state):
+    (tmp_path / "a.txt").write_text("Python SQL", encoding="utf-8")
+    (tmp_path / "b.pdf").write_bytes(_make_pdf(["Docker"]))
+    (tmp_path / "broken.pdf").write_bytes(b"not a pdf")
+    seen = []
+
+    report = load_many([str(tmp_path)], workers=2, progress=lambda done, total, path: seen.append((done, total)))
+    assert report.n_files == 3 and seen[-1] == (3, 3)
+    assert report.texts[str(tmp_path / "a.txt")] == "Python SQL"
+    assert report.texts[str(tmp_path / "b.pdf")] == "Docker"
+    assert list(report.failed) == [str(tmp_path / "broken.pdf")]
+
+    again = load_many([str(tmp_path / "b.pdf")], workers=1)
+    assert again.cache_hits == 1
+
+def test_text_resumes_get_universal_newlines(tmp_path, fresh_state):
+    crlf, cr = tmp_path / "crlf.txt", tmp_path / "cr.md"
+    crlf.write_bytes(b"SUMMARY\r\nPython engineer\r\n\r\nSKILLS\r\nSQL, Docker\r\n")
+    cr.write_bytes(b"SUMMARY\rPython engineer\r\rSKILLS\rSQL, Docker\r")
+    expected = "SUMMARY\nPython engineer\n\nSKILLS\nSQL, Docker\n"
+    assert load_text_from_file(str(crlf)) == load_text_from_file(str(cr)) == expected
+    assert load_many([str(crlf)], workers=1).texts[str(crlf)] == expected
@@ -0,0 +1,59 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.utils import metrics
+from src.utils.metrics import Histogram, current_timings, start_request_timings, timed
+
+def test_timed_records_stage_and_errors():
+    start_request_timings()
+
+    @timed("unit_sync")
+    def ok():
+        return 1
+
+    @timed("unit_async")
+    async def boom():
+        raise ValueError("x")
+
+    assert ok() == 1
+    try:
+        asyncio.run(boom())
+    except ValueError:
+        pass
+    with timed("unit_block"):
+        pass
+    t = current_timings()
+    assert {"unit_sync", "unit_block"} <= set(t)
+    text = metrics.render_metrics()
+    assert 'jdra_stage_seconds_count{stage="unit_sync"} 1' in text
+    assert 'jdra_errors_total{stage="unit_async"} 1' in text
+
+def test_histogram_buckets_are_cumulative():
+    h = Histogram("h_test", "t", buckets=(0.1, 1.0))
+    for v in (0.05, 0.5, 5.0):
+        h.observe(v)
+    text = "\n".join(h.render())
+    assert 'h_test_bucket{le="0.1"} 1' in text
+    assert 'h_test_bucket{le="1.0"} 2' in text
+    assert 'h_test_bucket{le="+Inf"} 3' in text
+    assert "h_test_count 3" in text
+
+def test_metrics_endpoint_and_server_timing():
+    client = TestClient(app)
+    r = client.post("/analyze", json={
+        "resume_text": "Python FastAPI Docker engineer",
+        "job_text": "Looking for Python and Docker experience",
+        "include_timings": True,
+    })
+    assert r.status_code == 200
+    assert "baseline;dur=" in r.headers["server-timing"]
+    assert "total;dur=" in r.headers["server-timing"]
+    assert r.json()["explanations"]["timings"]["baseline"] >= 0
+
+    m = client.get("/metrics")
+    assert m.status_code == 200
+    assert m.headers["content-type"].startswith("text/plain")
+    assert 'jdra_request_seconds_count{path="/analyze"}' in m.text
+    assert "jdra_requests_in_flight" in m.text
@@ -0,0 +1,57 @@
+import asyncio
+import dataclasses
+import httpx
+from fastapi.testclient import TestClient
+from benchmarks.loadtest import Sample, make_workload, parse_server_timing, percentile, summarize
+from benchmarks.mock_llm import MockConfig, create_app
+from src.modeling import llm_extract
+from src.modeling.llm_batcher import build_batch_prompt
+
+TEXT = "Built FastAPI services in Python, deployed with Docker on AWS."
+
+def _chat(prompt: str) -> dict:
+    return {"model": "m", "messages": [{"role": "system", "content": "x"}, {"role": "user", "content": prompt}]}
+
+def test_mock_speaks_both_shapes_deterministically():
+    client = TestClient(create_app(MockConfig(latency_ms=0, per_kchar_ms=0)))
+    prompt = llm_extract._request_spec(TEXT, "ollama")[2]["messages"][1]["content"]
+    ollama = client.post("/api/chat", json=_chat(prompt)).json()
+    openai = client.post("/v1/chat/completions", json=_chat(prompt)).json()
+    assert ollama["message"]["content"] == openai["choices"][0]["message"]["content"]
+    assert openai["usage"]["prompt_tokens"] > 0 and ollama["eval_count"] > 0
+    assert {"docker", "aws"} <= set(llm_extract._parse_extraction(ollama["message"]["content"]).tools)
+
+    batch = client.post("/api/chat", json=_chat(build_batch_prompt([TEXT, "SQL and Tableau"]))).json()
+    assert set(llm_extract.parse_json(batch["message"]["content"])["results"]) == {"0", "1"}
+
+def test_mock_errors_and_rejections():
+    client = TestClient(create_app(MockConfig(latency_ms=0, per_kchar_ms=0, error_rate=1.0)))
+    assert client.post("/api/chat", json=_chat("x")).status_code == 500
+    assert client.get("/stats").json()["errors"] == 1
+
+    async def burst():
+        app = create_app(MockConfig(latency_ms=50, jitter=0, per_kchar_ms=0, max_concurrency=1, reject=True))
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://mock") as c:
+            rs = await asyncio.gather(*(c.post("/api/chat", json=_chat(str(i))) for i in range(3)))
+        return sorted(r.status_code for r in rs)
+    assert asyncio.run(burst()) == [200, 429, 429]
+
+def test_llm_extract_against_mock(monkeypatch):
+    monkeypatch.setattr(llm_extract, "settings", dataclasses.replace(
+        llm_extract.settings, llm_provider="ollama", ollama_base_url="http://mock", llm_cache_enabled=False))
+
+    async def run():
+        app = create_app(MockConfig(latency_ms=0, per_kchar_ms=0))
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app)) as client:
+            return await llm_extract.extract_with_usage_async(TEXT, client=client, use_cache=False)
+    result, usage = asyncio.run(run())
+    assert {"docker", "aws"} <= set(result.tools) and usage.prompt_tokens > 0
+
+def test_loadtest_workload_and_report():
+    a, b = make_workload(30, seed=3), make_workload(30, seed=3)
+    assert a == b and len({x["job_text"] for x in a}) < 30
+    assert parse_server_timing("tfidf;dur=1.5, total;dur=10.0") == {"tfidf": 1.5, "total": 10.0}
+    assert percentile([float(i) for i in range(1, 101)], 95) == 95.0
+    report = summarize(2.0, [Sample(200, 0.1, {"tfidf": 1.0}), Sample(200, 0.3), Sample(500, 0.2)])
+    assert report["throughput_rps"] == 1.0 and report["status"] == {"200": 2, "500": 1}
+    assert report["stages_ms"]["client"]["p99"] == 300.0 and report["stages_ms"]["tfidf"]["n"] == 1
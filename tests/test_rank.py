@@ -0,0 +1,32 @@
+from fastapi.testclient import TestClient
+from src.api.main import app
+from src.modeling.ranker import analyze_many
+
+client = TestClient(app)
+
+RESUME = "Python SQL scikit-learn FastAPI Docker"
+JOBS = [
+    "Looking for a pastry chef with croissant and baking experience",
+    "Looking for Python, scikit-learn, MLOps, Docker and APIs",
+    "Java Spring Kubernetes backend engineer",
+]
+
+def test_analyze_many_ranks_best_job_first():
+    ranked = analyze_many([RESUME], JOBS, top_n=2)
+    assert len(ranked) == 2
+    assert ranked[0].index == 1
+    assert ranked[0].match_score >= ranked[1].match_score
+    assert "docker" in ranked[0].baseline.matched_keywords
+
+def test_rank_endpoint_resumes_for_job():
+    payload = {"job_text": JOBS[1], "resume_texts": ["Chef, pastry, baking", RESUME], "top_n": 5}
+    r = client.post("/rank", json=payload)
+    assert r.status_code == 200
+    data = r.json()
+    assert data["mode"] == "resumes_for_job"
+    assert data["total"] == 2
+    assert [item["index"] for item in data["results"]] == [1, 0]
+
+def test_rank_endpoint_rejects_ambiguous_request():
+    r = client.post("/rank", json={"resume_text": RESUME, "job_text": JOBS[0]})
+    assert r.status_code == 400
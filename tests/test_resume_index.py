@@ -0,0 +1,31 @@
+from fastapi.testclient import TestClient
+from src.api import main
+from src.modeling.resume_index import ResumeIndex
+
+JOB = "Looking for Python, scikit-learn, MLOps, Docker and APIs"
+
+def test_index_shortlist_and_incremental_updates(tmp_path):
+    index = ResumeIndex(str(tmp_path / "idx.sqlite"))
+    index.add("Pastry chef, baking, croissants", resume_id="chef")
+    index.add("Python SQL scikit-learn FastAPI Docker", resume_id="ml")
+    index.add("Java Spring Kubernetes", resume_id="java")
+
+    assert [rid for rid, _ in index.shortlist(JOB)] == ["ml"]
+    hits = index.search(JOB, top_n=5)
+    assert hits[0].resume_id == "ml" and "docker" in hits[0].baseline.matched_keywords
+
+    index.add("Go and Rust engineer", resume_id="ml")  # re-adding replaces the postings
+    assert index.shortlist(JOB) == []
+    assert index.remove("java") and not index.remove("java")
+    assert len(ResumeIndex(str(tmp_path / "idx.sqlite"))) == 2
+
+def test_search_endpoint(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "get_resume_index", lambda idx=ResumeIndex(str(tmp_path / "api.sqlite")): idx)
+    client = TestClient(main.app)
+    assert client.post("/resumes", json={"id": "ml", "resume_text": "Python scikit-learn Docker"}).json()["total"] == 1
+    client.post("/resumes", json={"id": "chef", "resume_text": "Pastry chef"})
+
+    data = client.post("/search", json={"job_text": JOB, "top_n": 3}).json()
+    assert data["total"] == 2
+    assert [h["resume_id"] for h in data["results"]] == ["ml"]
+    assert client.delete("/resumes/nope").status_code == 404
@@ -0,0 +1,70 @@
+import asyncio
+import dataclasses
+import json
+import httpx
+from src.evaluation import evaluate_extraction as ev
+from src.features.skill_taxonomy import Skill, SkillTaxonomy
+from src.modeling import llm_extract, skill_extract
+from src.modeling.ranker import analyze, analyze_async
+
+TAXONOMY = SkillTaxonomy([
+    Skill("machine learning", "skill", ("ml",)),
+    Skill("java", "skill"),
+    Skill("javascript", "skill", ("js",)),
+    Skill("c++", "skill"),
+    Skill("kubernetes", "tool", ("k8s",)),
+    Skill("scikit-learn", "tool", ("sklearn", "scikit learn")),
+])
+
+def test_multiword_aliases_and_word_boundaries():
+    text = "Machine\n  Learning engineer: ML, K8s, Scikit Learn, JavaScript and C++ (not Java)."
+    names = [m.skill.name for m in TAXONOMY.find(text)]
+    assert names == ["machine learning", "machine learning", "kubernetes", "scikit-learn", "javascript", "c++", "java"]
+    assert TAXONOMY.extract("javascript, k8s, ml") == {"skills": ["javascript", "machine learning"], "tools": ["kubernetes"]}
+    assert TAXONOMY.extract("html5 mlops k8sx") == {"skills": [], "tools": []}
+
+def test_bundled_taxonomy_matches_labeled_example():
+    taxonomy = SkillTaxonomy.load("data/taxonomy/skills.json")
+    found = taxonomy.extract("Looking for Python, scikit-learn, MLOps/deployment, Docker, FastAPI, AWS.")
+    assert found == {"skills": ["python", "mlops"], "tools": ["scikit-learn", "docker", "fastapi", "aws"]}
+
+def _settings(monkeypatch, **overrides):
+    s = dataclasses.replace(llm_extract.settings, llm_cache_enabled=False, **overrides)
+    for mod in (llm_extract, skill_extract):
+        monkeypatch.setattr(mod, "settings", s)
+
+def test_dictionary_fills_skills_without_llm(monkeypatch):
+    _settings(monkeypatch, llm_provider=None, skill_extractor="hybrid")
+    result = analyze("Python, SQL and Docker", "Looking for Python, Kubernetes and Docker")
+    assert result.skills_job == {"skills": ["python"], "tools": ["kubernetes", "docker"], "requirements": []}
+    assert result.recommended_keywords == ["kubernetes"]
+    assert result.explanations["skill_sources"] == {"resume": "dictionary", "job": "dictionary"}
+    assert result.explanations["llm_enabled"] is False
+
+def test_hybrid_calls_llm_only_on_low_coverage(monkeypatch):
+    _settings(monkeypatch, llm_provider="ollama", skill_extractor="hybrid", skill_min_matches=3)
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(json.loads(request.content)["messages"][1]["content"])
+        content = json.dumps({"skills": ["communication"], "tools": [], "requirements": ["on-call"]})
+        return httpx.Response(200, json={"message": {"content": content}})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            monkeypatch.setattr(llm_extract, "get_async_client", lambda: client)
+            return await analyze_async("Python, SQL, Docker and Kubernetes", "Python engineer, on-call rotation")
+
+    result = asyncio.run(run())
+    assert len(calls) == 1 and "on-call" in calls[0]  # only the JD had too few matches
+    assert result.skills_job["skills"] == ["communication", "python"]
+    assert result.explanations["skill_sources"] == {"resume": "dictionary", "job": "dictionary+llm"}
+
+def test_eval_harness_scores_dictionary_extractor(monkeypatch):
+    monkeypatch.setattr(ev, "settings", dataclasses.replace(ev.settings, llm_provider=None))
+    samples = [ev.Sample(id="s0", text="Python, Docker and AWS", gold={"skills": {"python"}, "tools": {"docker", "aws"}, "requirements": set()})]
+    run = asyncio.run(ev.predict(samples, extractor="dictionary"))
+    report = ev.score(samples, run)
+    assert report["extractor"] == "dictionary"
+    assert report["micro"]["tools"]["f1"] == 1.0
+    assert report["perf"]["n_calls"] == 0 and report["perf"]["n_dictionary_only"] == 1
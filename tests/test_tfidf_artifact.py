@@ -0,0 +1,41 @@
+from src.features import tfidf_features
+from src.features.tfidf_features import (
+    TermVocabulary, _new_vectorizer, default_tfidf, load_tfidf_artifact, save_tfidf_artifact,
+)
+
+CORPUS = [
+    "Looking for Python, scikit-learn, MLOps, Docker and APIs",
+    "Python SQL scikit-learn FastAPI Docker",
+    "Java Spring Kubernetes backend engineer",
+    "Pastry chef with baking experience",
+]
+
+def test_artifact_roundtrip_matches_fitted_vectorizer(tmp_path):
+    vec = _new_vectorizer()
+    vec.fit(CORPUS)
+    save_tfidf_artifact(vec, str(tmp_path), version="v-test", n_docs=len(CORPUS))
+
+    model = load_tfidf_artifact(str(tmp_path))  # resolved through LATEST
+    assert model.prefitted and model.version == "v-test"
+    assert (model.vectorizer.transform(CORPUS[:2]) != vec.transform(CORPUS[:2])).nnz == 0
+    assert 0.0 < model.score(CORPUS[0], CORPUS[1]) <= 1.0
+
+def test_default_tfidf_falls_back_without_artifact(monkeypatch):
+    monkeypatch.setattr(tfidf_features, "load_default_tfidf", lambda: None)
+    model = default_tfidf()
+    assert not model.prefitted
+    assert 0.0 < model.score(CORPUS[0], CORPUS[1]) <= 1.0
+
+def test_vocabulary_is_read_lazily_from_the_artifact(tmp_path):
+    vec = _new_vectorizer()
+    vec.fit(CORPUS)
+    target = save_tfidf_artifact(vec, str(tmp_path), version="v-test", n_docs=len(CORPUS))
+    vocab = load_tfidf_artifact(str(target)).vectorizer.vocabulary_
+    assert isinstance(vocab, TermVocabulary)  # not copied into a dict of every term
+    assert dict(vocab) == vec.vocabulary_ and len(vocab) == len(vec.vocabulary_)
+    assert vocab["scikit learn"] == vec.vocabulary_["scikit learn"] and "pastry" in vocab and "missing" not in vocab
+
+    for f in ("terms_hash.npy", "terms_order.npy"):  # an artifact saved before the lookup index
+        (target / f).unlink()
+    model = load_tfidf_artifact(str(target))
+    assert (model.vectorizer.transform(CORPUS) != vec.transform(CORPUS)).nnz == 0